@@ -19,14 +19,23 @@ from __future__ import annotations
 
 import argparse
 import json
+import math
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+# Shared array-based metrics core lives in FTMO_Challenge/.
+FTMO_ROOT = Path(__file__).resolve().parents[3]
+if str(FTMO_ROOT) not in sys.path:
+    sys.path.insert(0, str(FTMO_ROOT))
+
+from metrics_core import DAY_ID_COLUMN, EXIT_DAY_COLUMN, compute_metrics_frame, encode_day_ids  # noqa: E402
+
 
 @dataclass
 class Params:
@@ -43,9 +52,22 @@ def load_data(csv_path: Path) -> pd.DataFrame:
     df[first_col] = pd.to_datetime(df[first_col])
     df = df.rename(columns={first_col: "timestamp"})
     df = df.sort_values("timestamp").reset_index(drop=True)
+    df[DAY_ID_COLUMN] = encode_day_ids(df["timestamp"])
     return df
 
 
+@dataclass
+class BreachLimits:
+    """Hard FTMO limits that stop a backtest early (early-abort mode)."""
+
+    max_drawdown_pct: float = 10.0
+    daily_loss_pct: float = 5.0
+
+
+# Subtracted from the score of early-aborted candidates so they rank below every completed run.
+BREACH_PENALTY = 1e6
+
+
 def build_signals(df: pd.DataFrame, fast: int, slow: int) -> pd.DataFrame:
     out = df.copy()
     out["fast_ema"] = out["Close"].ewm(span=fast, adjust=False).mean()
@@ -59,7 +81,13 @@ def run_segment_backtest(
     df: pd.DataFrame,
     params: Params,
     initial_capital: float,
+    breach_limits: Optional[BreachLimits] = None,
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Simulate one segment. With breach_limits set, stop at the first trade that
+    breaches max drawdown or daily loss; the truncated trades frame then carries
+    trades_df.attrs["breached_at"] (exit timestamp) and attrs["breach_reason"].
+    """
     data = build_signals(df, params.fast, params.slow)
 
     trades: List[Dict] = []
@@ -75,6 +103,11 @@ def run_segment_backtest(
 
     equity_points.append({"timestamp": data["timestamp"].iloc[0], "equity": capital, "peak": peak})
 
+    breached_at = None
+    breach_reason = None
+    current_day = None
+    day_pnl = 0.0
+
     for i in range(1, len(data)):
         row = data.iloc[i]
         price = float(row["Close"])
@@ -115,6 +148,7 @@ def run_segment_backtest(
                     {
                         "entry_ts": entry_ts,
                         "exit_ts": ts,
+                        EXIT_DAY_COLUMN: int(row[DAY_ID_COLUMN]),
                         "entry_price": entry_price,
                         "exit_price": exit_price,
                         "pnl": pnl,
@@ -127,56 +161,41 @@ def run_segment_backtest(
                 in_pos = False
                 equity_points.append({"timestamp": ts, "equity": capital, "peak": peak})
 
+                if breach_limits is not None:
+                    # Same daily-loss definition as compute_metrics: exit-date P&L vs initial capital.
+                    if row[DAY_ID_COLUMN] != current_day:
+                        current_day = row[DAY_ID_COLUMN]
+                        day_pnl = 0.0
+                    day_pnl += pnl
+                    if dd_pct > breach_limits.max_drawdown_pct:
+                        breach_reason = "max_drawdown"
+                    elif (day_pnl / initial_capital) * 100.0 < -breach_limits.daily_loss_pct:
+                        breach_reason = "daily_loss"
+                    if breach_reason is not None:
+                        breached_at = ts
+                        break
+
     trades_df = pd.DataFrame(trades)
     equity_df = pd.DataFrame(equity_points)
+    if breached_at is not None:
+        trades_df.attrs["breached_at"] = breached_at
+        trades_df.attrs["breach_reason"] = breach_reason
     return trades_df, equity_df
 
 
 def compute_metrics(trades_df: pd.DataFrame, initial_capital: float) -> Dict:
-    if trades_df.empty:
-        return {
-            "total_trades": 0,
-            "win_rate": 0.0,
-            "total_pnl": 0.0,
-            "return_pct": 0.0,
-            "max_drawdown_pct": 0.0,
-            "worst_daily_loss_pct": 0.0,
-            "profit_factor": 0.0,
-            "ftmo_pass": True,
-        }
-
-    pnl = trades_df["pnl"]
-    total_pnl = float(pnl.sum())
-    wins = pnl[pnl > 0]
-    losses = pnl[pnl < 0]
-
-    win_rate = float((len(wins) / len(trades_df)) * 100.0)
-    return_pct = (total_pnl / initial_capital) * 100.0
-
-    max_drawdown_pct = float(trades_df["drawdown_pct"].max())
-
-    temp = trades_df.copy()
-    temp["exit_ts"] = pd.to_datetime(temp["exit_ts"])
-    temp["date"] = temp["exit_ts"].dt.date
-    daily = temp.groupby("date", as_index=False)["pnl"].sum()
-    daily["daily_loss_pct"] = (daily["pnl"] / initial_capital) * 100.0
-    worst_daily_loss_pct = float(daily["daily_loss_pct"].min()) if not daily.empty else 0.0
-
-    gross_win = float(wins.sum()) if not wins.empty else 0.0
-    gross_loss = abs(float(losses.sum())) if not losses.empty else 0.0
-    profit_factor = (gross_win / gross_loss) if gross_loss > 0 else 0.0
-
-    ftmo_pass = (max_drawdown_pct <= 10.0) and (worst_daily_loss_pct >= -5.0)
-
+    m = compute_metrics_frame(trades_df, initial_capital)
+    breached = trades_df.attrs.get("breached_at") is not None
     return {
-        "total_trades": int(len(trades_df)),
-        "win_rate": win_rate,
-        "total_pnl": total_pnl,
-        "return_pct": return_pct,
-        "max_drawdown_pct": max_drawdown_pct,
-        "worst_daily_loss_pct": worst_daily_loss_pct,
-        "profit_factor": profit_factor,
-        "ftmo_pass": ftmo_pass,
+        "total_trades": int(m["total_trades"]),
+        "win_rate": m["win_rate"],
+        "total_pnl": m["total_pnl"],
+        "return_pct": m["return_pct"],
+        "max_drawdown_pct": m["max_drawdown_pct"],
+        "worst_daily_loss_pct": m["worst_daily_loss_pct"],
+        "profit_factor": m["profit_factor"],
+        "ftmo_pass": bool(m["ftmo_pass"]) and not breached,
+        "breached": breached,
     }
 
 
@@ -191,6 +210,10 @@ def score_train(metrics: Dict) -> float:
 
     score += min(metrics["profit_factor"], 3.0) * 5.0
     score += min(metrics["win_rate"], 60.0) * 0.1
+
+    # Early-aborted runs stopped on a hard FTMO breach: treat as failed.
+    if metrics.get("breached"):
+        score -= BREACH_PENALTY
     return score
 
 
@@ -213,6 +236,176 @@ def param_grid() -> List[Params]:
     return grid
 
 
+@dataclass
+class SurrogateState:
+    """Evaluated grid points and fitted kernel carried from one fold to the next."""
+
+    indices: np.ndarray
+    scores: np.ndarray  # surrogate scale: breached points already replaced (see surrogate_scores)
+    length_scale: float
+
+
+GP_LENGTH_SCALES = (0.2, 0.35, 0.5, 0.75, 1.0)
+GP_FRESH_NOISE = 1e-4
+GP_PRIOR_NOISE = 0.25
+
+
+def surrogate_scores(scores: np.ndarray, breached: np.ndarray) -> np.ndarray:
+    """
+    GP targets for evaluated points.
+
+    A breached run's score carries -BREACH_PENALTY, which would dominate the
+    standardization and turn EI into pure variance sampling. Breached points
+    enter the surrogate just below the worst completed run instead (their
+    unpenalized score if lower); the raw score is kept for final selection.
+    """
+    y = scores.astype(float).copy()
+    if not breached.any():
+        return y
+    unpenalized = y[breached] + BREACH_PENALTY
+    if (~breached).any():
+        feasible = y[~breached]
+        floor = float(feasible.min()) - max(1.0, float(feasible.std()))
+        y[breached] = np.minimum(unpenalized, floor)
+    else:
+        y[breached] = unpenalized
+    return y
+
+
+def encode_grid(grid: List[Params]) -> np.ndarray:
+    raw = np.array(
+        [[p.fast, p.slow, p.stop_loss_pct, p.take_profit_pct, p.risk_pct] for p in grid],
+        dtype=float,
+    )
+    lo = raw.min(axis=0)
+    span = raw.max(axis=0) - lo
+    span[span == 0] = 1.0
+    return (raw - lo) / span
+
+
+def _rbf(a: np.ndarray, b: np.ndarray, length_scale: float) -> np.ndarray:
+    d2 = ((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=-1)
+    return np.exp(-0.5 * d2 / (length_scale**2))
+
+
+def fit_gp(X: np.ndarray, y: np.ndarray, noise: np.ndarray, length_scales=GP_LENGTH_SCALES) -> Dict:
+    # Zero-mean GP on standardized scores; length scale picked by marginal likelihood.
+    mu = float(y.mean())
+    sd = float(y.std()) or 1.0
+    z = (y - mu) / sd
+
+    best: Optional[Dict] = None
+    for ls in length_scales:
+        K = _rbf(X, X, ls) + np.diag(noise)
+        try:
+            L = np.linalg.cholesky(K)
+        except np.linalg.LinAlgError:
+            continue
+        alpha = np.linalg.solve(L.T, np.linalg.solve(L, z))
+        lml = -0.5 * float(z @ alpha) - float(np.log(np.diag(L)).sum())
+        if best is None or lml > best["lml"]:
+            best = {"X": X, "L": L, "alpha": alpha, "mu": mu, "sd": sd, "length_scale": ls, "lml": lml}
+    if best is None:
+        raise RuntimeError("Surrogate fit failed for every length scale.")
+    return best
+
+
+def gp_predict(model: Dict, Xs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    k = _rbf(Xs, model["X"], model["length_scale"])
+    mean = k @ model["alpha"]
+    v = np.linalg.solve(model["L"], k.T)
+    var = np.clip(1.0 - (v**2).sum(axis=0), 1e-12, None)
+    return mean * model["sd"] + model["mu"], np.sqrt(var) * model["sd"]
+
+
+def expected_improvement(mean: np.ndarray, std: np.ndarray, best: float, xi: float = 0.01) -> np.ndarray:
+    imp = mean - best - xi
+    z = imp / std
+    cdf = 0.5 * (1.0 + np.array([math.erf(v / math.sqrt(2.0)) for v in z]))
+    pdf = np.exp(-0.5 * z**2) / math.sqrt(2.0 * math.pi)
+    return imp * cdf + std * pdf
+
+
+def bayes_search_fold(
+    train_df: pd.DataFrame,
+    grid: List[Params],
+    X_grid: np.ndarray,
+    initial_capital: float,
+    prior: Optional[SurrogateState] = None,
+    n_calls: int = 8,
+    n_initial: int = 4,
+    n_rescore: int = 3,
+    ei_tol: float = 1e-3,
+    seed: int = 42,
+    breach_limits: Optional[BreachLimits] = None,
+) -> Tuple[Params, float, Dict, SurrogateState, int]:
+    """
+    Bayesian search over the walk-forward grid for one training window.
+
+    Warm start: the previous fold's best `n_rescore` points are re-scored on
+    this window; its remaining points enter the surrogate with inflated noise
+    (down-weighted, never selectable), and its fitted length scale is tried
+    first. Selection only considers points evaluated on this window.
+    """
+    evaluated: Dict[int, Tuple[float, Dict]] = {}
+
+    def evaluate(i: int) -> None:
+        trades, _ = run_segment_backtest(train_df, grid[i], initial_capital, breach_limits=breach_limits)
+        m = compute_metrics(trades, initial_capital)
+        evaluated[i] = (score_train(m), m)
+
+    stale: Dict[int, float] = {}
+    length_scales = GP_LENGTH_SCALES
+    if prior is not None and prior.indices.size > 0:
+        order = np.argsort(-prior.scores, kind="stable")
+        for j in order[:n_rescore]:
+            evaluate(int(prior.indices[j]))
+        stale = {int(i): float(sc) for i, sc in zip(prior.indices, prior.scores) if int(i) not in evaluated}
+        length_scales = (prior.length_scale,) + tuple(ls for ls in GP_LENGTH_SCALES if ls != prior.length_scale)
+    else:
+        rng = np.random.default_rng(seed)
+        for i in rng.choice(len(grid), size=min(n_initial, len(grid)), replace=False):
+            evaluate(int(i))
+
+    budget = min(max(n_calls, len(evaluated)), len(grid))
+    model = None
+    def fresh_targets(fresh: List[int]) -> np.ndarray:
+        return surrogate_scores(
+            np.array([evaluated[i][0] for i in fresh], dtype=float),
+            np.array([bool(evaluated[i][1].get("breached")) for i in fresh], dtype=bool),
+        )
+
+    while len(evaluated) < budget:
+        fresh = sorted(evaluated)
+        idx = fresh + sorted(stale)
+        y_fresh = fresh_targets(fresh)
+        y = np.concatenate([y_fresh, np.array([stale[i] for i in sorted(stale)], dtype=float)])
+        noise = np.array([GP_FRESH_NOISE] * len(fresh) + [GP_PRIOR_NOISE] * len(stale), dtype=float)
+        model = fit_gp(X_grid[idx], y, noise, length_scales)
+
+        candidates = np.array([i for i in range(len(grid)) if i not in evaluated])
+        mean, std = gp_predict(model, X_grid[candidates])
+        ei = expected_improvement(mean, std, best=float(y_fresh.max()))
+        if ei.max() < ei_tol * (model["sd"] or 1.0):
+            break
+        evaluate(int(candidates[int(np.argmax(ei))]))
+
+    # Same tie-breaking as the grid loop: first grid index wins on equal scores.
+    best_i = None
+    for i in sorted(evaluated):
+        if best_i is None or evaluated[i][0] > evaluated[best_i][0]:
+            best_i = i
+    best_score, best_metrics = evaluated[best_i]
+
+    fresh = sorted(evaluated)
+    state = SurrogateState(
+        indices=np.array(fresh, dtype=int),
+        scores=fresh_targets(fresh),
+        length_scale=model["length_scale"] if model is not None else (prior.length_scale if prior else 0.5),
+    )
+    return grid[best_i], best_score, best_metrics, state, len(evaluated)
+
+
 def run_walk_forward(
     df: pd.DataFrame,
     initial_capital: float = 10000.0,
@@ -220,8 +413,16 @@ def run_walk_forward(
     test_bars: int = 24 * 120,
     step_bars: int = 24 * 120,
     max_folds: int = 12,
+    optimizer: str = "grid",
+    bayes_calls: int = 8,
+    breach_limits: Optional[BreachLimits] = None,
 ) -> Tuple[pd.DataFrame, pd.DataFrame, Dict]:
+    if optimizer not in {"grid", "bayes"}:
+        raise ValueError(f"Unknown optimizer: {optimizer}")
+
     grid = param_grid()
+    X_grid = encode_grid(grid)
+    surrogate: Optional[SurrogateState] = None
 
     fold_rows: List[Dict] = []
     oos_trades_all: List[pd.DataFrame] = []
@@ -242,18 +443,30 @@ def run_walk_forward(
         train_df = df.iloc[train_start:train_end].copy()
         test_df = df.iloc[train_end:test_end].copy()
 
-        best_score = -1e18
-        best_params = None
-        best_train_metrics = None
-
-        for p in grid:
-            train_trades, _ = run_segment_backtest(train_df, p, initial_capital)
-            m = compute_metrics(train_trades, initial_capital)
-            s = score_train(m)
-            if s > best_score:
-                best_score = s
-                best_params = p
-                best_train_metrics = m
+        if optimizer == "bayes":
+            best_params, best_score, best_train_metrics, surrogate, train_evals = bayes_search_fold(
+                train_df,
+                grid,
+                X_grid,
+                initial_capital,
+                prior=surrogate,
+                n_calls=bayes_calls,
+                breach_limits=breach_limits,
+            )
+        else:
+            best_score = -1e18
+            best_params = None
+            best_train_metrics = None
+
+            for p in grid:
+                train_trades, _ = run_segment_backtest(train_df, p, initial_capital, breach_limits=breach_limits)
+                m = compute_metrics(train_trades, initial_capital)
+                s = score_train(m)
+                if s > best_score:
+                    best_score = s
+                    best_params = p
+                    best_train_metrics = m
+            train_evals = len(grid)
 
         test_trades, _ = run_segment_backtest(test_df, best_params, initial_capital)
         test_metrics = compute_metrics(test_trades, initial_capital)
@@ -281,8 +494,10 @@ def run_walk_forward(
                 "best_tp_pct": best_params.take_profit_pct,
                 "best_risk_pct": best_params.risk_pct,
                 "train_score": best_score,
+                "train_evaluations": train_evals,
                 "train_return_pct": best_train_metrics["return_pct"],
                 "train_max_dd_pct": best_train_metrics["max_drawdown_pct"],
+                "train_breached": best_train_metrics.get("breached", False),
                 "test_return_pct": test_metrics["return_pct"],
                 "test_max_dd_pct": test_metrics["max_drawdown_pct"],
                 "test_worst_daily_loss_pct": test_metrics["worst_daily_loss_pct"],
@@ -300,6 +515,8 @@ def run_walk_forward(
     oos_metrics = compute_metrics(oos_trades_df, initial_capital)
     summary = {
         "folds": int(len(folds_df)),
+        "optimizer": optimizer,
+        "early_abort": breach_limits is not None,
         "oos_total_trades": int(oos_metrics["total_trades"]),
         "oos_total_pnl": float(oos_metrics["total_pnl"]),
         "oos_return_pct": float(oos_metrics["return_pct"]),
@@ -475,6 +692,25 @@ def parse_args() -> argparse.Namespace:
         default=4,
         help="Maximum OOS folds to evaluate. Increase to backtest beyond 1 year.",
     )
+    parser.add_argument(
+        "--optimizer",
+        choices=["grid", "bayes"],
+        default="grid",
+        help="Training-window search: full grid scan, or warm-started Bayesian search.",
+    )
+    parser.add_argument(
+        "--bayes-calls",
+        type=int,
+        default=8,
+        help="Maximum backtests per fold in --optimizer bayes mode.",
+    )
+    parser.add_argument(
+        "--early-abort",
+        action="store_true",
+        help="Stop training backtests at the first hard FTMO breach and score them as failed.",
+    )
+    parser.add_argument("--abort-max-dd-pct", type=float, default=10.0, help="Max drawdown limit for --early-abort.")
+    parser.add_argument("--abort-daily-loss-pct", type=float, default=5.0, help="Daily loss limit for --early-abort.")
     return parser.parse_args()
 
 
@@ -505,6 +741,11 @@ def main() -> None:
         test_bars=test_bars,
         step_bars=step_bars,
         max_folds=max_folds,
+        optimizer=args.optimizer,
+        bayes_calls=args.bayes_calls,
+        breach_limits=(
+            BreachLimits(args.abort_max_dd_pct, args.abort_daily_loss_pct) if args.early_abort else None
+        ),
     )
 
     folds_path = reports_dir / "wfv_fold_results.csv"
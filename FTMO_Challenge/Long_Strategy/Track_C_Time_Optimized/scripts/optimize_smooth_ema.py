@@ -17,6 +17,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Tuple
@@ -24,6 +25,13 @@ from typing import Dict, List, Tuple
 import numpy as np
 import pandas as pd
 
+# Shared array-based metrics core lives in FTMO_Challenge/.
+FTMO_ROOT = Path(__file__).resolve().parents[3]
+if str(FTMO_ROOT) not in sys.path:
+    sys.path.insert(0, str(FTMO_ROOT))
+
+from metrics_core import DAY_ID_COLUMN, EXIT_DAY_COLUMN, compute_metrics_frame, encode_day_ids, trade_day_ids  # noqa: E402
+
 
 @dataclass
 class Params:
@@ -40,6 +48,7 @@ def load_data(csv_path: Path) -> pd.DataFrame:
     df[first_col] = pd.to_datetime(df[first_col])
     df = df.rename(columns={first_col: "timestamp"})
     df = df.sort_values("timestamp").reset_index(drop=True)
+    df[DAY_ID_COLUMN] = encode_day_ids(df["timestamp"])
     return df
 
 
@@ -104,6 +113,7 @@ def run_backtest(df: pd.DataFrame, params: Params, initial_capital: float = 1000
                     {
                         "entry_ts": entry_ts,
                         "exit_ts": ts,
+                        EXIT_DAY_COLUMN: int(row[DAY_ID_COLUMN]),
                         "entry_price": entry_price,
                         "exit_price": exit_price,
                         "pnl": pnl,
@@ -129,36 +139,18 @@ def run_backtest(df: pd.DataFrame, params: Params, initial_capital: float = 1000
             "trades_per_day": 0.0,
         }
     else:
-        pnl = trades_df["pnl"]
-        total_pnl = float(pnl.sum())
-        wins = pnl[pnl > 0]
-        losses = pnl[pnl < 0]
-
-        win_rate = float((len(wins) / len(trades_df)) * 100.0)
-        return_pct = (total_pnl / initial_capital) * 100.0
-        max_dd = float(trades_df["drawdown_pct"].max())
-
-        temp = trades_df.copy()
-        temp["exit_ts"] = pd.to_datetime(temp["exit_ts"])
-        temp["date"] = temp["exit_ts"].dt.date
-        daily = temp.groupby("date", as_index=False)["pnl"].sum()
-        daily["daily_loss_pct"] = (daily["pnl"] / initial_capital) * 100.0
-        worst_daily = float(daily["daily_loss_pct"].min()) if not daily.empty else 0.0
-
-        gross_win = float(wins.sum()) if not wins.empty else 0.0
-        gross_loss = abs(float(losses.sum())) if not losses.empty else 0.0
-        pf = (gross_win / gross_loss) if gross_loss > 0 else 0.0
-
-        num_days = (temp["date"].max() - temp["date"].min()).days + 1 if not temp.empty else 1
+        day_ids = trade_day_ids(trades_df)
+        m = compute_metrics_frame(trades_df, initial_capital, day_ids=day_ids)
+        num_days = int(day_ids.max() - day_ids.min()) + 1
         trades_per_day = len(trades_df) / max(num_days, 1)
 
         metrics = {
-            "total_trades": int(len(trades_df)),
-            "win_rate": win_rate,
-            "return_pct": return_pct,
-            "max_drawdown_pct": max_dd,
-            "worst_daily_loss_pct": worst_daily,
-            "profit_factor": pf,
+            "total_trades": int(m["total_trades"]),
+            "win_rate": m["win_rate"],
+            "return_pct": m["return_pct"],
+            "max_drawdown_pct": m["max_drawdown_pct"],
+            "worst_daily_loss_pct": m["worst_daily_loss_pct"],
+            "profit_factor": m["profit_factor"],
             "trades_per_day": trades_per_day,
         }
 
@@ -227,16 +219,16 @@ def run_optimization(df: pd.DataFrame, initial_capital: float = 10000.0) -> Tupl
     grid = smooth_ema_grid()
     print(f"[Smooth EMA Optimizer] Testing {len(grid)} smooth parameter combinations...")
 
-        candidates = []
-        sample_size = 0.3  # Default sample size for recent data
+    candidates = []
+    sample_size = 0.3  # Default sample size for recent data
 
-        # Use recent data only (faster testing, but still representative)
-        sample_idx = int(len(df) * (1.0 - sample_size))
-        df_sample = df.iloc[sample_idx:].copy()
-        print(f"[Optimization] Using {len(df_sample):,} recent bars ({sample_size*100:.0f}% of data) for testing...\n")
+    # Use recent data only (faster testing, but still representative)
+    sample_idx = int(len(df) * (1.0 - sample_size))
+    df_sample = df.iloc[sample_idx:].copy()
+    print(f"[Optimization] Using {len(df_sample):,} recent bars ({sample_size*100:.0f}% of data) for testing...\n")
 
     for idx, params in enumerate(grid):
-            trades_df, metrics = run_backtest(df_sample, params, initial_capital)
+        trades_df, metrics = run_backtest(df_sample, params, initial_capital)
         score = score_smooth(metrics)
 
         candidates.append(
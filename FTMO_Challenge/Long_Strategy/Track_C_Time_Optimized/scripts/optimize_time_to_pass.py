@@ -26,6 +26,8 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import matplotlib.pyplot as plt
@@ -312,6 +314,121 @@ def candidate_seed(p: Params, salt: int = 0) -> int:
     ) % (2**32 - 1)
 
 
+def evaluate_candidate(
+    df: pd.DataFrame,
+    windows,
+    p: Params,
+    mc_constraint_pct: float,
+) -> dict:
+    started = time.perf_counter()
+    comb_df, fold_passes, fold_count = build_candidate_trades(df, windows, p, initial_capital=INITIAL_CAPITAL)
+    metrics = compute_metrics(comb_df, initial_capital=INITIAL_CAPITAL)
+    np.random.seed(candidate_seed(p, salt=0))
+    paths, mc_pass_prob = monte_carlo_paths(comb_df, initial_capital=INITIAL_CAPITAL, runs=1000)
+    tpd = compute_trades_per_day(comb_df)
+    timing = step_timing_stats(
+        paths,
+        initial_capital=INITIAL_CAPITAL,
+        trades_per_day=tpd,
+        step1_target_pct=STEP1_TARGET_PCT,
+        step2_target_pct=STEP2_TARGET_PCT,
+    )
+
+    feasible = (
+        mc_pass_prob >= mc_constraint_pct
+        and timing["step1_avg_trades"] is not None
+        and timing["step2_avg_trades"] is not None
+    )
+
+    return {
+        "fast": p.fast,
+        "slow": p.slow,
+        "sl_pct": p.stop_loss_pct,
+        "tp_pct": p.take_profit_pct,
+        "risk_pct": p.risk_pct,
+        "fold_passes": fold_passes,
+        "fold_count": fold_count,
+        "fold_pass_rate_pct": (fold_passes / fold_count) * 100.0 if fold_count else 0.0,
+        "oos_trades": metrics["total_trades"],
+        "oos_return_pct": metrics["return_pct"],
+        "oos_max_dd_pct": metrics["max_drawdown_pct"],
+        "oos_worst_daily_loss_pct": metrics["worst_daily_loss_pct"],
+        "oos_profit_factor": metrics["profit_factor"],
+        "mc_pass_probability_pct": mc_pass_prob,
+        "trades_per_day_estimate": tpd,
+        "step1_pass_probability_pct": timing["step1_pass_probability_pct"],
+        "step2_pass_probability_pct": timing["step2_pass_probability_pct"],
+        "step1_avg_trades": timing["step1_avg_trades"],
+        "step2_avg_trades": timing["step2_avg_trades"],
+        "step1_avg_days": timing["step1_avg_days"],
+        "step2_avg_days": timing["step2_avg_days"],
+        "feasible_constraint": feasible,
+        "sort_step2_avg_trades": to_sortable(timing["step2_avg_trades"]),
+        "sort_step1_avg_trades": to_sortable(timing["step1_avg_trades"]),
+        "eval_seconds": time.perf_counter() - started,
+    }
+
+
+def print_candidate_timing(row: dict) -> None:
+    print(
+        f"Candidate EMA({row['fast']}/{row['slow']}) SL {row['sl_pct']}% TP {row['tp_pct']}% "
+        f"Risk {row['risk_pct']}%: {row['eval_seconds']:.2f}s"
+    )
+
+
+# Per-process state for --workers > 1. Each worker loads the dataset once in
+# its initializer and reuses it (and the shared OOS windows) for every candidate.
+_WORKER_DF: pd.DataFrame | None = None
+_WORKER_WINDOWS: list = []
+
+
+def _init_worker(data_csv: Path, windows: list) -> None:
+    global _WORKER_DF, _WORKER_WINDOWS
+    _WORKER_DF = load_data(data_csv)
+    _WORKER_WINDOWS = windows
+
+
+def _evaluate_in_worker(task: tuple[Params, float]) -> dict:
+    p, mc_constraint_pct = task
+    return evaluate_candidate(_WORKER_DF, _WORKER_WINDOWS, p, mc_constraint_pct)
+
+
+def evaluate_candidates(
+    df: pd.DataFrame,
+    data_csv: Path,
+    windows,
+    candidates: list,
+    mc_constraint_pct: float,
+    workers: int = 1,
+) -> list:
+    """
+    Evaluate every candidate, serially or in a process pool.
+
+    Results are returned in candidate order either way. Each candidate seeds
+    its own Monte Carlo RNG via candidate_seed, so rows (and hence rankings)
+    are identical to the serial run regardless of worker count.
+    """
+    if workers <= 1:
+        rows = []
+        for p in candidates:
+            row = evaluate_candidate(df, windows, p, mc_constraint_pct)
+            print_candidate_timing(row)
+            rows.append(row)
+        return rows
+
+    tasks = [(p, mc_constraint_pct) for p in candidates]
+    rows = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(data_csv, list(windows)),
+    ) as pool:
+        for row in pool.map(_evaluate_in_worker, tasks):
+            print_candidate_timing(row)
+            rows.append(row)
+    return rows
+
+
 def track_c_param_grid() -> list:
     """
     Superset of the shared param_grid, extended with fine-grained intermediate
@@ -363,6 +480,12 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="If set, pick the best feasible candidate that matches this risk percentage.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for candidate evaluation (1 = serial).",
+    )
     return parser.parse_args()
 
 
@@ -394,56 +517,20 @@ def main() -> None:
         raise RuntimeError("No OOS windows generated. Reduce train/test sizes or increase data length.")
     candidates = track_c_param_grid()
 
-    rows = []
-
-    for p in candidates:
-        comb_df, fold_passes, fold_count = build_candidate_trades(df, windows, p, initial_capital=INITIAL_CAPITAL)
-        metrics = compute_metrics(comb_df, initial_capital=INITIAL_CAPITAL)
-        np.random.seed(candidate_seed(p, salt=0))
-        paths, mc_pass_prob = monte_carlo_paths(comb_df, initial_capital=INITIAL_CAPITAL, runs=1000)
-        tpd = compute_trades_per_day(comb_df)
-        timing = step_timing_stats(
-            paths,
-            initial_capital=INITIAL_CAPITAL,
-            trades_per_day=tpd,
-            step1_target_pct=STEP1_TARGET_PCT,
-            step2_target_pct=STEP2_TARGET_PCT,
-        )
-
-        feasible = (
-            mc_pass_prob >= mc_constraint_pct
-            and timing["step1_avg_trades"] is not None
-            and timing["step2_avg_trades"] is not None
-        )
-
-        rows.append(
-            {
-                "fast": p.fast,
-                "slow": p.slow,
-                "sl_pct": p.stop_loss_pct,
-                "tp_pct": p.take_profit_pct,
-                "risk_pct": p.risk_pct,
-                "fold_passes": fold_passes,
-                "fold_count": fold_count,
-                "fold_pass_rate_pct": (fold_passes / fold_count) * 100.0 if fold_count else 0.0,
-                "oos_trades": metrics["total_trades"],
-                "oos_return_pct": metrics["return_pct"],
-                "oos_max_dd_pct": metrics["max_drawdown_pct"],
-                "oos_worst_daily_loss_pct": metrics["worst_daily_loss_pct"],
-                "oos_profit_factor": metrics["profit_factor"],
-                "mc_pass_probability_pct": mc_pass_prob,
-                "trades_per_day_estimate": tpd,
-                "step1_pass_probability_pct": timing["step1_pass_probability_pct"],
-                "step2_pass_probability_pct": timing["step2_pass_probability_pct"],
-                "step1_avg_trades": timing["step1_avg_trades"],
-                "step2_avg_trades": timing["step2_avg_trades"],
-                "step1_avg_days": timing["step1_avg_days"],
-                "step2_avg_days": timing["step2_avg_days"],
-                "feasible_constraint": feasible,
-                "sort_step2_avg_trades": to_sortable(timing["step2_avg_trades"]),
-                "sort_step1_avg_trades": to_sortable(timing["step1_avg_trades"]),
-            }
-        )
+    eval_started = time.perf_counter()
+    rows = evaluate_candidates(
+        df,
+        data_csv,
+        windows,
+        candidates,
+        mc_constraint_pct=mc_constraint_pct,
+        workers=args.workers,
+    )
+    print(
+        f"Evaluated {len(rows)} candidates in {time.perf_counter() - eval_started:.2f}s "
+        f"(workers={max(args.workers, 1)}, "
+        f"sum of per-candidate time={sum(r['eval_seconds'] for r in rows):.2f}s)"
+    )
 
     res = pd.DataFrame(rows)
     res = res.sort_values(
@@ -18,6 +18,13 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+# Shared array-based metrics core lives in FTMO_Challenge/.
+FTMO_ROOT = Path(__file__).resolve().parents[3]
+if str(FTMO_ROOT) not in sys.path:
+    sys.path.insert(0, str(FTMO_ROOT))
+
+from metrics_core import DAY_ID_COLUMN, EXIT_DAY_COLUMN, compute_metrics_frame, encode_day_ids  # noqa: E402
+
 
 @dataclass
 class Params:
@@ -34,6 +41,7 @@ def load_data(csv_path: Path) -> pd.DataFrame:
     df[first_col] = pd.to_datetime(df[first_col])
     df = df.rename(columns={first_col: "timestamp"})
     df = df.sort_values("timestamp").reset_index(drop=True)
+    df[DAY_ID_COLUMN] = encode_day_ids(df["timestamp"])
     return df
 
 
@@ -105,6 +113,7 @@ def run_segment_backtest(
                     {
                         "entry_ts": entry_ts,
                         "exit_ts": ts,
+                        EXIT_DAY_COLUMN: int(row[DAY_ID_COLUMN]),
                         "entry_price": entry_price,
                         "exit_price": exit_price,
                         "pnl": pnl,
@@ -124,50 +133,16 @@ def run_segment_backtest(
 
 def compute_metrics(trades_df: pd.DataFrame, initial_capital: float = 10000.0) -> Dict:
     """Compute FTMO compliance and performance metrics."""
-    if trades_df.empty:
-        return {
-            "total_trades": 0,
-            "win_rate": 0.0,
-            "total_pnl": 0.0,
-            "return_pct": 0.0,
-            "max_drawdown_pct": 0.0,
-            "worst_daily_loss_pct": 0.0,
-            "profit_factor": 0.0,
-            "ftmo_pass": True,
-        }
-
-    pnl = trades_df["pnl"]
-    total_pnl = float(pnl.sum())
-    wins = pnl[pnl > 0]
-    losses = pnl[pnl < 0]
-
-    win_rate = float((len(wins) / len(trades_df)) * 100.0) if len(trades_df) > 0 else 0.0
-    return_pct = (total_pnl / initial_capital) * 100.0
-
-    max_drawdown_pct = float(trades_df["drawdown_pct"].max())
-
-    temp = trades_df.copy()
-    temp["exit_ts"] = pd.to_datetime(temp["exit_ts"])
-    temp["date"] = temp["exit_ts"].dt.date
-    daily = temp.groupby("date", as_index=False)["pnl"].sum()
-    daily["daily_loss_pct"] = (daily["pnl"] / initial_capital) * 100.0
-    worst_daily_loss_pct = float(daily["daily_loss_pct"].min()) if not daily.empty else 0.0
-
-    gross_win = float(wins.sum()) if not wins.empty else 0.0
-    gross_loss = abs(float(losses.sum())) if not losses.empty else 0.0
-    profit_factor = (gross_win / gross_loss) if gross_loss > 0 else 0.0
-
-    ftmo_pass = (max_drawdown_pct <= 10.0) and (worst_daily_loss_pct >= -5.0)
-
+    m = compute_metrics_frame(trades_df, initial_capital)
     return {
-        "total_trades": int(len(trades_df)),
-        "win_rate": win_rate,
-        "total_pnl": total_pnl,
-        "return_pct": return_pct,
-        "max_drawdown_pct": max_drawdown_pct,
-        "worst_daily_loss_pct": worst_daily_loss_pct,
-        "profit_factor": profit_factor,
-        "ftmo_pass": ftmo_pass,
+        "total_trades": int(m["total_trades"]),
+        "win_rate": m["win_rate"],
+        "total_pnl": m["total_pnl"],
+        "return_pct": m["return_pct"],
+        "max_drawdown_pct": m["max_drawdown_pct"],
+        "worst_daily_loss_pct": m["worst_daily_loss_pct"],
+        "profit_factor": m["profit_factor"],
+        "ftmo_pass": bool(m["ftmo_pass"]),
     }
 
 
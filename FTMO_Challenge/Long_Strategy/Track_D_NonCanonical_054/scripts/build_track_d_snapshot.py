@@ -390,9 +390,9 @@ def main() -> None:
     np.random.seed(MC_SEED)
 
     script_dir = Path(__file__).resolve().parent
-    repo_root = script_dir.parents[2]
-    track_d_root = repo_root / "FTMO_Challenge" / "Track_D_NonCanonical_054"
-    track_c_root = repo_root / "FTMO_Challenge" / "Track_C_Time_Optimized"
+    long_root = script_dir.parents[1]
+    track_d_root = long_root / "Track_D_NonCanonical_054"
+    track_c_root = long_root / "Track_C_Time_Optimized"
     reports_dir = track_d_root / "reports"
     images_dir = track_d_root / "images"
 
@@ -61,16 +61,14 @@ def load_track_a(repo_root: Path) -> pd.DataFrame:
     return trades
 
 
-def load_track_b(repo_root: Path) -> pd.DataFrame:
+def load_track_b(long_root: Path) -> pd.DataFrame:
     trades_path = first_existing_path(
         [
-            repo_root
-            / "FTMO_Challenge"
+            long_root
             / "Track_B_WalkForward_Robust"
             / "reports"
             / "wfv_extended_oos_trades.csv",
-            repo_root
-            / "FTMO_Challenge"
+            long_root
             / "Track_B_WalkForward_Robust"
             / "reports"
             / "wfv_best_candidate_oos_trades.csv",
@@ -82,18 +80,16 @@ def load_track_b(repo_root: Path) -> pd.DataFrame:
     return trades
 
 
-def load_track_c(repo_root: Path) -> pd.DataFrame:
+def load_track_c(long_root: Path) -> pd.DataFrame:
     trades_path = first_existing_path(
         [
             # Prefer the optimized fixed-param candidate (primary Track C output).
-            repo_root
-            / "FTMO_Challenge"
+            long_root
             / "Track_C_Time_Optimized"
             / "reports"
             / "track_c_best_candidate_oos_trades.csv",
             # Fallback: extended WFV (separate analysis, different param set).
-            repo_root
-            / "FTMO_Challenge"
+            long_root
             / "Track_C_Time_Optimized"
             / "reports"
             / "wfv_extended_oos_trades.csv",
@@ -105,10 +101,9 @@ def load_track_c(repo_root: Path) -> pd.DataFrame:
     return trades
 
 
-def load_track_d(repo_root: Path) -> pd.DataFrame:
+def load_track_d(long_root: Path) -> pd.DataFrame:
     trades = pd.read_csv(
-        repo_root
-        / "FTMO_Challenge"
+        long_root
         / "Track_D_NonCanonical_054"
         / "reports"
         / "track_d_best_candidate_oos_trades.csv"
@@ -254,15 +249,13 @@ def profit_factor_from_trades(trades: pd.DataFrame) -> float:
     return (gross_win / gross_loss) if gross_loss > 0 else 0.0
 
 
-def wfv_period(repo_root: Path) -> Tuple[str | None, str | None]:
+def wfv_period(long_root: Path) -> Tuple[str | None, str | None]:
     fold_candidates = [
-        repo_root
-        / "FTMO_Challenge"
+        long_root
         / "Track_B_WalkForward_Robust"
         / "reports"
         / "wfv_extended_fold_results.csv",
-        repo_root
-        / "FTMO_Challenge"
+        long_root
         / "Track_B_WalkForward_Robust"
         / "reports"
         / "wfv_fold_results.csv",
@@ -456,15 +449,17 @@ def create_dashboard(rows: pd.DataFrame, out_path: Path) -> None:
 def main() -> None:
     np.random.seed(MC_SEED)
 
-    repo_root = Path(__file__).resolve().parent.parent
-    out_dir = repo_root / "FTMO_Challenge"
+    # Tracks live under FTMO_Challenge/Long_Strategy; data/ and backtest/ at the repo root.
+    long_root = Path(__file__).resolve().parent
+    repo_root = long_root.parents[1]
+    out_dir = long_root
 
     track_a = load_track_a(repo_root)
-    track_b = load_track_b(repo_root)
-    track_c = load_track_c(repo_root)
-    track_d = load_track_d(repo_root)
+    track_b = load_track_b(long_root)
+    track_c = load_track_c(long_root)
+    track_d = load_track_d(long_root)
 
-    wfv_start, wfv_end = wfv_period(repo_root)
+    wfv_start, wfv_end = wfv_period(long_root)
 
     rows = [
         compute_strategy_row(
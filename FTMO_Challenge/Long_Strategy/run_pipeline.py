@@ -0,0 +1,305 @@
+"""
+DAG-based refresh pipeline for the long-strategy reports.
+
+Python replacement for run_refresh.sh. Each stage declares the files it reads
+(data CSV, upstream reports, its own script) and the files it writes. The
+runner then:
+1) Derives stage dependencies from those declarations (a stage depends on any
+   stage that writes one of its inputs).
+2) Skips a stage when the hashes of its inputs match the last successful run
+   and all of its outputs still exist.
+3) Runs independent stages in parallel processes, so a full refresh takes as
+   long as the longest branch instead of the sum of all stages.
+
+Usage (from repo root):
+    python FTMO_Challenge/Long_Strategy/run_pipeline.py [all|track-b|track-c|track-d|compare-only]
+    python FTMO_Challenge/Long_Strategy/run_pipeline.py all --force --jobs 3
+
+Outputs:
+- FTMO_Challenge/Long_Strategy/.refresh_cache.json (input hashes per stage)
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+LONG_ROOT = Path("FTMO_Challenge") / "Long_Strategy"
+TRACK_B_ROOT = LONG_ROOT / "Track_B_WalkForward_Robust"
+TRACK_C_ROOT = LONG_ROOT / "Track_C_Time_Optimized"
+TRACK_D_ROOT = LONG_ROOT / "Track_D_NonCanonical_054"
+DATA_CSV = Path("data") / "XAUUSD_1h_sample.csv"
+CACHE_PATH = LONG_ROOT / ".refresh_cache.json"
+
+
+@dataclass
+class Stage:
+    name: str
+    script: Path
+    args: List[str] = field(default_factory=list)
+    inputs: List[Path] = field(default_factory=list)
+    outputs: List[Path] = field(default_factory=list)
+
+    def command(self) -> List[str]:
+        return [sys.executable, str(self.script), *self.args]
+
+    def all_inputs(self) -> List[Path]:
+        # The stage's own script is always an input: editing it must trigger a rebuild.
+        return [self.script, *self.inputs]
+
+
+def build_stages() -> List[Stage]:
+    b_reports = TRACK_B_ROOT / "reports"
+    c_reports = TRACK_C_ROOT / "reports"
+    d_reports = TRACK_D_ROOT / "reports"
+
+    return [
+        Stage(
+            name="track-b",
+            script=TRACK_B_ROOT / "scripts" / "walk_forward_extended_1y_2y.py",
+            args=["--data", str(DATA_CSV), "--output-dir", str(b_reports)],
+            inputs=[DATA_CSV],
+            outputs=[
+                b_reports / "wfv_extended_fold_results.csv",
+                b_reports / "wfv_extended_oos_trades.csv",
+                b_reports / "wfv_extended_summary.json",
+            ],
+        ),
+        Stage(
+            name="track-c",
+            script=TRACK_C_ROOT / "scripts" / "walk_forward_extended_1y_2y.py",
+            args=["--data", str(DATA_CSV), "--output-dir", str(c_reports)],
+            inputs=[DATA_CSV],
+            outputs=[
+                c_reports / "wfv_extended_fold_results.csv",
+                c_reports / "wfv_extended_oos_trades.csv",
+                c_reports / "wfv_extended_summary.json",
+            ],
+        ),
+        Stage(
+            name="track-d",
+            script=TRACK_D_ROOT / "scripts" / "build_track_d_snapshot.py",
+            # load_source reads the frozen Track D snapshot (all three files), else the current Track C candidate.
+            inputs=[
+                c_reports / "track_c_best_candidate.json",
+                c_reports / "track_c_best_candidate_oos_trades.csv",
+                c_reports / "track_c_candidate_rankings.csv",
+                d_reports / "track_d_source_track_c_best_candidate.json",
+                d_reports / "track_d_best_candidate_oos_trades.csv",
+                d_reports / "track_d_source_candidate_rankings.csv",
+            ],
+            outputs=[
+                d_reports / "track_d_best_candidate.json",
+                d_reports / "track_d_best_candidate.txt",
+                d_reports / "track_d_best_candidate_oos_trades.csv",
+                d_reports / "track_d_daily_activity.csv",
+                d_reports / "track_d_source_candidate_rankings.csv",
+            ],
+        ),
+        Stage(
+            name="compare",
+            script=LONG_ROOT / "compare_all_strategies.py",
+            inputs=[
+                DATA_CSV,
+                Path("backtest") / "backtest_results_ml_optimized_fixed.csv",
+                b_reports / "wfv_extended_oos_trades.csv",
+                b_reports / "wfv_extended_fold_results.csv",
+                c_reports / "track_c_best_candidate_oos_trades.csv",
+                c_reports / "wfv_extended_oos_trades.csv",
+                d_reports / "track_d_best_candidate_oos_trades.csv",
+            ],
+            outputs=[
+                LONG_ROOT / "strategy_comparison_summary.csv",
+                LONG_ROOT / "strategy_comparison_summary.json",
+                LONG_ROOT / "strategy_comparison_summary.txt",
+                LONG_ROOT / "strategy_comparison_dashboard.png",
+            ],
+        ),
+    ]
+
+
+MODES = {
+    "all": ["track-b", "track-c", "track-d", "compare"],
+    "track-b": ["track-b", "compare"],
+    "track-c": ["track-c", "compare"],
+    "track-d": ["track-d", "compare"],
+    "compare-only": ["compare"],
+}
+
+
+def stage_dependencies(stages: List[Stage]) -> Dict[str, List[str]]:
+    producers: Dict[Path, str] = {}
+    for stage in stages:
+        for out in stage.outputs:
+            producers[out] = stage.name
+
+    deps: Dict[str, List[str]] = {}
+    for stage in stages:
+        upstream = {producers[p] for p in stage.inputs if p in producers and producers[p] != stage.name}
+        deps[stage.name] = sorted(upstream)
+    return deps
+
+
+def file_hash(path: Path) -> str | None:
+    if not path.exists():
+        return None
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def input_hashes(stage: Stage) -> Dict[str, str | None]:
+    hashes = {str(p): file_hash(REPO_ROOT / p) for p in stage.all_inputs()}
+    hashes["<command>"] = hashlib.sha256(" ".join(stage.command()[1:]).encode()).hexdigest()
+    return hashes
+
+
+def load_cache() -> Dict:
+    path = REPO_ROOT / CACHE_PATH
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except json.JSONDecodeError:
+        return {}
+
+
+def save_cache(cache: Dict) -> None:
+    path = REPO_ROOT / CACHE_PATH
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(cache, indent=2, sort_keys=True))
+    tmp.replace(path)
+
+
+def is_up_to_date(stage: Stage, hashes: Dict[str, str | None], cache: Dict) -> bool:
+    record = cache.get(stage.name)
+    if not record or record.get("inputs") != hashes:
+        return False
+    return all((REPO_ROOT / p).exists() for p in stage.outputs)
+
+
+def run_stage(stage: Stage) -> tuple[int, float, str]:
+    started = time.perf_counter()
+    proc = subprocess.run(
+        stage.command(),
+        cwd=REPO_ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    return proc.returncode, time.perf_counter() - started, proc.stdout
+
+
+def run_pipeline(targets: List[str], force: bool, jobs: int, dry_run: bool, verbose: bool) -> List[Dict]:
+    all_stages = build_stages()
+    stages = {s.name: s for s in all_stages if s.name in targets}
+    deps = {name: [d for d in upstream if d in stages] for name, upstream in stage_dependencies(all_stages).items()}
+    cache = load_cache()
+
+    results: Dict[str, Dict] = {}
+    pending = set(stages)
+    running: Dict[Future, tuple[str, Dict]] = {}
+
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as pool:
+        while pending or running:
+            for name in sorted(pending):
+                upstream = deps.get(name, [])
+                if any(results.get(d, {}).get("status") in {"failed", "blocked"} for d in upstream):
+                    results[name] = {"stage": name, "status": "blocked", "seconds": 0.0}
+                    pending.discard(name)
+                    continue
+                if not all(d in results for d in upstream):
+                    continue
+
+                pending.discard(name)
+                stage = stages[name]
+                # Hash only once upstream stages have finished writing their outputs.
+                hashes = input_hashes(stage)
+                if not force and is_up_to_date(stage, hashes, cache):
+                    results[name] = {"stage": name, "status": "cached", "seconds": 0.0}
+                    print(f"[{name}] up to date, skipped")
+                    continue
+                if dry_run:
+                    results[name] = {"stage": name, "status": "would-run", "seconds": 0.0}
+                    print(f"[{name}] would run: {' '.join(stage.command())}")
+                    continue
+
+                print(f"[{name}] started")
+                running[pool.submit(run_stage, stage)] = (name, hashes)
+
+            if not running:
+                continue
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                name, hashes = running.pop(future)
+                code, seconds, output = future.result()
+                ok = code == 0
+                results[name] = {"stage": name, "status": "rebuilt" if ok else "failed", "seconds": seconds}
+                if verbose or not ok:
+                    print(output.rstrip())
+                print(f"[{name}] {'finished' if ok else f'FAILED (exit {code})'} in {seconds:.1f}s")
+                if ok:
+                    # A stage that rewrites one of its own inputs (the Track D snapshot) is
+                    # cached against what it wrote, or it would never be up to date.
+                    for p in stages[name].inputs:
+                        if p in stages[name].outputs:
+                            hashes[str(p)] = file_hash(REPO_ROOT / p)
+                    cache[name] = {"inputs": hashes, "seconds": seconds}
+                    save_cache(cache)
+
+    order = [s.name for s in all_stages if s.name in results]
+    return [results[name] for name in order]
+
+
+def print_summary(results: List[Dict], wall_seconds: float) -> None:
+    print("")
+    print("REFRESH PIPELINE SUMMARY")
+    print("=" * 60)
+    for r in results:
+        print(f"- {r['stage']:<10} {r['status']:<10} {r['seconds']:8.1f}s")
+    stage_total = sum(r["seconds"] for r in results)
+    print(f"Wall time: {wall_seconds:.1f}s (sum of stage times: {stage_total:.1f}s)")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Refresh long-strategy reports as a cached, parallel DAG.")
+    parser.add_argument("mode", nargs="?", default="all", choices=sorted(MODES), help="Which stages to refresh.")
+    parser.add_argument("--force", action="store_true", help="Rebuild stages even if their inputs are unchanged.")
+    parser.add_argument("--jobs", type=int, default=4, help="Maximum stages to run in parallel.")
+    parser.add_argument("--dry-run", action="store_true", help="Show which stages would run without running them.")
+    parser.add_argument("--verbose", action="store_true", help="Print each stage's output when it finishes.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    started = time.perf_counter()
+    results = run_pipeline(
+        MODES[args.mode],
+        force=args.force,
+        jobs=args.jobs,
+        dry_run=args.dry_run,
+        verbose=args.verbose,
+    )
+    print_summary(results, time.perf_counter() - started)
+
+    if any(r["status"] in {"failed", "blocked"} for r in results):
+        sys.exit(1)
+    print(f"Refresh complete: {args.mode}")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Tuple
@@ -29,6 +30,13 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+# Shared array-based metrics core lives in FTMO_Challenge/.
+FTMO_ROOT = Path(__file__).resolve().parents[3]
+if str(FTMO_ROOT) not in sys.path:
+    sys.path.insert(0, str(FTMO_ROOT))
+
+from metrics_core import DAY_ID_COLUMN, EXIT_DAY_COLUMN, compute_metrics_frame, encode_day_ids  # noqa: E402
+
 
 @dataclass
 class Params:
@@ -63,6 +71,7 @@ def load_data(csv_path: Path) -> pd.DataFrame:
             out[col] = pd.to_numeric(out[col], errors="coerce")
 
     out = out.dropna(subset=["timestamp", "Close"]).sort_values("timestamp").reset_index(drop=True)
+    out[DAY_ID_COLUMN] = encode_day_ids(out["timestamp"])
     return out
 
 
@@ -91,6 +100,7 @@ def run_segment_backtest(df: pd.DataFrame, params: Params, initial_capital: floa
     closes = data["Close"].to_numpy(dtype=float)
     signal_diffs = data["signal_diff"].to_numpy(dtype=float)
     timestamps = data["timestamp"].to_numpy()
+    day_ids = data[DAY_ID_COLUMN].to_numpy()
 
     for i in range(1, len(data)):
         price = closes[i]
@@ -133,6 +143,7 @@ def run_segment_backtest(df: pd.DataFrame, params: Params, initial_capital: floa
                     {
                         "entry_ts": entry_ts,
                         "exit_ts": ts,
+                        EXIT_DAY_COLUMN: int(day_ids[i]),
                         "entry_price": entry_price,
                         "exit_price": exit_price,
                         "pnl": pnl,
@@ -148,59 +159,7 @@ def run_segment_backtest(df: pd.DataFrame, params: Params, initial_capital: floa
 
 
 def compute_metrics(trades_df: pd.DataFrame, initial_capital: float) -> Dict[str, float]:
-    if trades_df.empty:
-        return {
-            "total_trades": 0.0,
-            "win_rate": 0.0,
-            "total_pnl": 0.0,
-            "return_pct": 0.0,
-            "max_drawdown_pct": 0.0,
-            "worst_daily_loss_pct": 0.0,
-            "profit_factor": 0.0,
-            "sharpe_daily_annualized": 0.0,
-            "ftmo_pass": 1.0,
-        }
-
-    pnl = trades_df["pnl"].astype(float)
-    total_pnl = float(pnl.sum())
-    wins = pnl[pnl > 0]
-    losses = pnl[pnl < 0]
-
-    win_rate = float((len(wins) / len(trades_df)) * 100.0)
-    return_pct = (total_pnl / initial_capital) * 100.0
-    max_drawdown_pct = float(trades_df["drawdown_pct"].max())
-
-    temp = trades_df.copy()
-    temp["exit_ts"] = pd.to_datetime(temp["exit_ts"])
-    temp["date"] = temp["exit_ts"].dt.date
-    daily = temp.groupby("date", as_index=False)["pnl"].sum().sort_values("date")
-    daily["daily_loss_pct"] = (daily["pnl"] / initial_capital) * 100.0
-    worst_daily_loss_pct = float(daily["daily_loss_pct"].min()) if not daily.empty else 0.0
-
-    gross_win = float(wins.sum()) if not wins.empty else 0.0
-    gross_loss = abs(float(losses.sum())) if not losses.empty else 0.0
-    profit_factor = (gross_win / gross_loss) if gross_loss > 0 else 0.0
-
-    equity_daily = initial_capital + daily["pnl"].cumsum()
-    daily_returns = equity_daily.pct_change().dropna()
-    if daily_returns.empty or daily_returns.std() == 0:
-        sharpe = 0.0
-    else:
-        sharpe = float((daily_returns.mean() / daily_returns.std()) * np.sqrt(252))
-
-    ftmo_pass = 1.0 if (max_drawdown_pct <= 10.0 and worst_daily_loss_pct >= -5.0) else 0.0
-
-    return {
-        "total_trades": float(len(trades_df)),
-        "win_rate": win_rate,
-        "total_pnl": total_pnl,
-        "return_pct": return_pct,
-        "max_drawdown_pct": max_drawdown_pct,
-        "worst_daily_loss_pct": worst_daily_loss_pct,
-        "profit_factor": profit_factor,
-        "sharpe_daily_annualized": sharpe,
-        "ftmo_pass": ftmo_pass,
-    }
+    return compute_metrics_frame(trades_df, initial_capital)
 
 
 def score_train(metrics: Dict[str, float]) -> float:
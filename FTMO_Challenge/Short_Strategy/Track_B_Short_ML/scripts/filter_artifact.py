@@ -0,0 +1,277 @@
+"""
+Persisted Track B Short ML filter and a low-latency scorer for live use.
+
+The walk-forward keeps its selected classifier only in memory. This module
+saves the deployment model (latest fold) together with everything needed to
+score a new short candidate without retraining:
+- model (pickle) and filter backend name
+- feature column order
+- probability threshold and filter mode
+- EMA/SL/TP/risk params and training window
+
+FilterScorer.score(features_row) returns the win probability for one
+candidate. It copies the row into pre-allocated buffers and evaluates the
+tree ensembles (gbc, shallow_gb, hist_gb) and the logistic pipeline from
+flattened numpy arrays, so no pandas or per-call sklearn validation runs on
+the hot path. Anything else falls back to predict_proba on the buffer.
+
+Outputs (written by walk_forward_short_ml.py):
+- models/track_b_short_ml_filter.pkl
+- models/track_b_short_ml_filter.json
+"""
+
+from __future__ import annotations
+
+import json
+import pickle
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
+
+
+ARTIFACT_VERSION = 1
+
+
+@dataclass
+class FilterArtifact:
+    model: object | None
+    feature_columns: List[str]
+    threshold: float
+    mode: str
+    filter_model: str
+    params: Dict[str, float]
+    fold: int
+    train_start: str
+    train_end: str
+
+    def metadata(self) -> Dict:
+        meta = asdict(self)
+        meta.pop("model")
+        meta["version"] = ARTIFACT_VERSION
+        meta["has_model"] = self.model is not None
+        return meta
+
+
+def save_filter_artifact(artifact: FilterArtifact, pkl_path: Path) -> Path:
+    """Write the pickle plus a JSON sidecar with the same name; returns the JSON path."""
+    pkl_path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"model": artifact.model, **artifact.metadata()}
+    with open(pkl_path, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    json_path = pkl_path.with_suffix(".json")
+    json_path.write_text(json.dumps(artifact.metadata(), indent=2))
+    return json_path
+
+
+def load_filter_artifact(pkl_path: Path) -> FilterArtifact:
+    with open(pkl_path, "rb") as f:
+        payload = pickle.load(f)
+    if payload.get("version") != ARTIFACT_VERSION:
+        raise ValueError(f"Unsupported filter artifact version: {payload.get('version')}")
+    return FilterArtifact(
+        model=payload["model"],
+        feature_columns=list(payload["feature_columns"]),
+        threshold=float(payload["threshold"]),
+        mode=str(payload["mode"]),
+        filter_model=str(payload["filter_model"]),
+        params=dict(payload["params"]),
+        fold=int(payload["fold"]),
+        train_start=str(payload["train_start"]),
+        train_end=str(payload["train_end"]),
+    )
+
+
+class _CompiledTrees:
+    """Binary tree ensemble flattened into padded node arrays (log-odds output)."""
+
+    def __init__(self, trees: List[Dict[str, np.ndarray]], init_raw: float, scale: float, input_dtype) -> None:
+        n_trees = len(trees)
+        width = max(len(t["value"]) for t in trees)
+
+        feature = np.zeros((n_trees, width), dtype=np.intp)
+        threshold = np.zeros((n_trees, width), dtype=np.float64)
+        left = np.tile(np.arange(width, dtype=np.intp), (n_trees, 1))
+        right = left.copy()
+        value = np.zeros((n_trees, width), dtype=np.float64)
+
+        for k, t in enumerate(trees):
+            n = len(t["value"])
+            is_split = ~t["is_leaf"]
+            feature[k, :n] = np.where(is_split, t["feature"], 0)
+            threshold[k, :n] = t["threshold"]
+            # Leaves point at themselves so every tree can be walked max-depth steps.
+            left[k, :n] = np.where(is_split, t["left"], np.arange(n))
+            right[k, :n] = np.where(is_split, t["right"], np.arange(n))
+            value[k, :n] = t["value"]
+
+        offsets = np.arange(n_trees, dtype=np.intp) * width
+        # Child indices become flat indices so the walk is a chain of np.take calls.
+        self.feature = feature.ravel()
+        self.threshold = threshold.ravel()
+        self.left = (left + offsets[:, None]).ravel()
+        self.right = (right + offsets[:, None]).ravel()
+        self.value = value.ravel()
+        self.depth = max(int(t["depth"]) for t in trees)
+        self.init_raw = float(init_raw)
+        self.scale = float(scale)
+        self.input_dtype = input_dtype
+
+        self._node = offsets.copy()
+        self._offsets = offsets
+        self._feat = np.empty(n_trees, dtype=np.intp)
+        self._x = np.empty(n_trees, dtype=input_dtype)
+        self._thr = np.empty(n_trees, dtype=np.float64)
+        self._go_left = np.empty(n_trees, dtype=bool)
+        self._next_right = np.empty(n_trees, dtype=np.intp)
+        self._leaf = np.empty(n_trees, dtype=np.float64)
+
+    @classmethod
+    def from_model(cls, model) -> "_CompiledTrees | None":
+        """Compiled copy of a supported binary tree model, else None (the scorer then uses predict_proba)."""
+        try:
+            return cls._compile(model)
+        except (AttributeError, KeyError, IndexError, ValueError):
+            # The histogram-GB path reads private sklearn attributes (_predictors,
+            # _baseline_prediction, node fields) that can change between versions.
+            return None
+
+    @classmethod
+    def _compile(cls, model) -> "_CompiledTrees | None":
+        name = type(model).__name__
+        if name == "GradientBoostingClassifier":
+            if getattr(model, "loss", "log_loss") != "log_loss" or len(model.classes_) != 2:
+                return None
+            if not hasattr(model.init_, "class_prior_"):
+                return None
+            trees = []
+            for est in model.estimators_[:, 0]:
+                t = est.tree_
+                trees.append(
+                    {
+                        "feature": t.feature,
+                        "threshold": t.threshold,
+                        "left": t.children_left,
+                        "right": t.children_right,
+                        "value": t.value[:, 0, 0],
+                        "is_leaf": t.children_left < 0,
+                        "depth": t.max_depth,
+                    }
+                )
+            prior = float(model.init_.class_prior_[1])
+            # sklearn trees compare float32 inputs against float64 thresholds.
+            return cls(trees, np.log(prior / (1.0 - prior)), model.learning_rate, np.float32)
+
+        if name == "HistGradientBoostingClassifier":
+            if len(model.classes_) != 2 or model.n_trees_per_iteration_ != 1:
+                return None
+            trees = []
+            for (predictor,) in model._predictors:
+                nodes = predictor.nodes
+                if nodes["is_categorical"].any():
+                    return None
+                trees.append(
+                    {
+                        "feature": nodes["feature_idx"],
+                        "threshold": nodes["num_threshold"],
+                        "left": nodes["left"],
+                        "right": nodes["right"],
+                        "value": nodes["value"],
+                        "is_leaf": nodes["is_leaf"].astype(bool),
+                        "depth": nodes["depth"].max(),
+                    }
+                )
+            # Leaf values already include the learning rate.
+            return cls(trees, float(np.ravel(model._baseline_prediction)[0]), 1.0, np.float64)
+
+        return None
+
+    def win_proba(self, x: np.ndarray) -> float:
+        node = self._node
+        np.copyto(node, self._offsets)
+        for _ in range(self.depth):
+            np.take(self.feature, node, out=self._feat)
+            np.take(x, self._feat, out=self._x)
+            np.take(self.threshold, node, out=self._thr)
+            np.less_equal(self._x, self._thr, out=self._go_left)
+            np.take(self.right, node, out=self._next_right)
+            np.take(self.left, node, out=node)
+            np.copyto(node, self._next_right, where=~self._go_left)
+        np.take(self.value, node, out=self._leaf)
+        raw = self.init_raw + self.scale * float(self._leaf.sum())
+        return 1.0 / (1.0 + np.exp(-raw))
+
+
+class _CompiledLogistic:
+    """StandardScaler + LogisticRegression folded into one weight vector."""
+
+    def __init__(self, model) -> None:
+        scaler = model.named_steps["standardscaler"]
+        clf = model.named_steps["logisticregression"]
+        coef = clf.coef_[0].astype(np.float64)
+        self.weights = coef / scaler.scale_
+        self.bias = float(clf.intercept_[0] - np.dot(coef, scaler.mean_ / scaler.scale_))
+
+    @staticmethod
+    def supports(model) -> bool:
+        steps = getattr(model, "named_steps", {})
+        return set(steps) == {"standardscaler", "logisticregression"} and len(steps["logisticregression"].classes_) == 2
+
+    def win_proba(self, x: np.ndarray) -> float:
+        raw = self.bias + float(np.dot(self.weights, x))
+        return 1.0 / (1.0 + np.exp(-raw))
+
+
+class FilterScorer:
+    """
+    Scores one short candidate at a time from a saved filter artifact.
+
+    features_row can be a sequence in artifact.feature_columns order or a
+    mapping keyed by column name. Features must be finite (the walk-forward
+    never trains or scores candidates with missing features).
+    """
+
+    def __init__(self, artifact: FilterArtifact) -> None:
+        self.artifact = artifact
+        self.columns = list(artifact.feature_columns)
+        self.threshold = float(artifact.threshold)
+        self._row = np.empty(len(self.columns), dtype=np.float64)
+        self._row32 = np.empty(len(self.columns), dtype=np.float32)
+        self._batch = self._row.reshape(1, -1)
+
+        model = artifact.model if artifact.mode == "ml_filter" else None
+        self._model = model
+        self._trees = _CompiledTrees.from_model(model) if model is not None else None
+        self._logistic = _CompiledLogistic(model) if model is not None and _CompiledLogistic.supports(model) else None
+
+    @classmethod
+    def load(cls, pkl_path: Path) -> "FilterScorer":
+        return cls(load_filter_artifact(pkl_path))
+
+    def _fill(self, features_row: Sequence[float] | Mapping[str, float]) -> None:
+        if isinstance(features_row, Mapping):
+            for j, col in enumerate(self.columns):
+                self._row[j] = features_row[col]
+        else:
+            self._row[:] = features_row
+        if not np.isfinite(self._row).all():
+            raise ValueError("Feature row contains NaN or inf values.")
+
+    def score(self, features_row: Sequence[float] | Mapping[str, float]) -> float:
+        """Win probability for one candidate (1.0 when the artifact is in no_filter mode)."""
+        if self._model is None:
+            return 1.0
+        self._fill(features_row)
+        if self._trees is not None:
+            if self._trees.input_dtype is np.float32:
+                np.copyto(self._row32, self._row, casting="same_kind")
+                return float(self._trees.win_proba(self._row32))
+            return float(self._trees.win_proba(self._row))
+        if self._logistic is not None:
+            return float(self._logistic.win_proba(self._row))
+        return float(self._model.predict_proba(self._batch)[0, 1])
+
+    def accepts(self, features_row: Sequence[float] | Mapping[str, float]) -> bool:
+        return self.score(features_row) >= self.threshold
@@ -0,0 +1,258 @@
+"""
+Streaming (O(1) per bar) version of the short ML entry features.
+
+compute_features() in walk_forward_short_ml.py / walk_forward_short_ftmo.py
+recomputes every rolling indicator over the whole DataFrame. In a live loop
+only one new hourly bar arrives at a time, so this engine keeps ring buffers
+and running sums per indicator and updates them in constant time:
+- atr14_pct, rsi14, zscore20, ret_1, ret_6, bar_range_pct, volume_ratio
+- hour/dow sin/cos
+- ema_spread_pct, when the EMA fast/slow periods are given (that column comes
+  from build_short_signals in the batch scripts)
+
+Values match compute_features on the same bar sequence to float tolerance
+(~1e-9 relative). Running sums are rebuilt from their ring buffer once per
+window length, so rounding does not drift over long sessions.
+
+bootstrap(df) replays a historical slice (timestamp/High/Low/Close[/Volume])
+to warm up the state. EMAs (adjust=False) depend on the first bar seen, so a
+slice of a few hundred bars is enough for them to converge to the values
+compute_features gives on the full history.
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class _RollingWindow:
+    """Fixed-length window with O(1) mean/std; NaN anywhere in the window gives NaN (pandas default)."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.values = np.full(size, np.nan)
+        self.pos = 0
+        self.count = 0
+        self.nan_count = 0
+        self.shift = 0.0
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self.pushes_since_resync = 0
+        self.last = float("nan")
+        self.same_run = 0
+
+    def push(self, x: float) -> None:
+        if self.count == self.size:
+            old = self.values[self.pos]
+            if math.isnan(old):
+                self.nan_count -= 1
+            else:
+                d = old - self.shift
+                self.sum -= d
+                self.sumsq -= d * d
+        else:
+            self.count += 1
+
+        self.values[self.pos] = x
+        self.pos = (self.pos + 1) % self.size
+        if math.isnan(x):
+            self.nan_count += 1
+        else:
+            d = x - self.shift
+            self.sum += d
+            self.sumsq += d * d
+
+        # pandas returns the exact value (std 0) when the whole window holds one value.
+        self.same_run = self.same_run + 1 if x == self.last else 1
+        self.last = x
+
+        self.pushes_since_resync += 1
+        if self.pushes_since_resync >= self.size:
+            self._resync()
+
+    def _resync(self) -> None:
+        # Re-anchor the shift at the current mean and rebuild the sums exactly.
+        valid = self.values[: self.count]
+        valid = valid[~np.isnan(valid)]
+        self.shift = float(valid.mean()) if valid.size else 0.0
+        dev = valid - self.shift
+        self.sum = float(dev.sum())
+        self.sumsq = float(np.dot(dev, dev))
+        self.pushes_since_resync = 0
+
+    def ready(self) -> bool:
+        return self.count == self.size and self.nan_count == 0
+
+    def mean(self) -> float:
+        if not self.ready():
+            return float("nan")
+        if self.same_run >= self.size:
+            return self.last
+        return self.shift + self.sum / self.size
+
+    def std(self) -> float:
+        if not self.ready() or self.size < 2:
+            return float("nan")
+        if self.same_run >= self.size:
+            return 0.0
+        var = (self.sumsq - self.sum * self.sum / self.size) / (self.size - 1)
+        return math.sqrt(var) if var > 0 else 0.0
+
+
+class _Ema:
+    """pandas ewm(span=n, adjust=False).mean(), seeded with the first value."""
+
+    def __init__(self, span: int) -> None:
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = float("nan")
+
+    def update(self, x: float) -> float:
+        if math.isnan(self.value):
+            self.value = x
+        else:
+            self.value = (1.0 - self.alpha) * self.value + self.alpha * x
+        return self.value
+
+
+def _nan_div(num: float, den: float) -> float:
+    # Mirrors the batch code's .replace(0.0, np.nan) on denominators.
+    if den == 0.0 or math.isnan(den) or math.isnan(num):
+        return float("nan")
+    return num / den
+
+
+class StreamingFeatureEngine:
+    """
+    Incremental feature state for one symbol.
+
+    update() takes one closed bar and returns the feature dict for that bar.
+    vector(columns) copies the latest features into a reusable float array,
+    e.g. for FilterScorer.score().
+    """
+
+    def __init__(self, fast: int | None = None, slow: int | None = None) -> None:
+        self.atr_window = _RollingWindow(14)
+        self.gain_window = _RollingWindow(14)
+        self.loss_window = _RollingWindow(14)
+        self.close_window = _RollingWindow(20)
+        self.volume_window = _RollingWindow(20)
+        self.ema20 = _Ema(20)
+        self.fast_ema = _Ema(fast) if fast is not None else None
+        self.slow_ema = _Ema(slow) if slow is not None else None
+
+        # Last 7 closes: enough for the 1-bar and 6-bar returns.
+        self.closes = np.full(7, np.nan)
+        self.close_pos = 0
+        self.bars = 0
+        self.latest: Dict[str, float] = {}
+        self._out: np.ndarray | None = None
+
+    def _close_ago(self, k: int) -> float:
+        if self.bars <= k:
+            return float("nan")
+        return float(self.closes[(self.close_pos - 1 - k) % len(self.closes)])
+
+    def update(
+        self,
+        timestamp,
+        high: float,
+        low: float,
+        close: float,
+        volume: float = 1.0,
+    ) -> Dict[str, float]:
+        high = float(high)
+        low = float(low)
+        close = float(close)
+        volume = float(volume)
+
+        prev_close = self._close_ago(0)
+        self.closes[self.close_pos] = close
+        self.close_pos = (self.close_pos + 1) % len(self.closes)
+        self.bars += 1
+
+        # True range; the first bar has no previous close, like pandas max(axis=1) skipping NaN.
+        tr = abs(high - low)
+        if not math.isnan(prev_close):
+            tr = max(tr, abs(high - prev_close), abs(low - prev_close))
+        self.atr_window.push(tr)
+
+        if math.isnan(prev_close):
+            gain = loss = float("nan")
+        else:
+            delta = close - prev_close
+            gain = max(delta, 0.0)
+            loss = -min(delta, 0.0)
+        self.gain_window.push(gain)
+        self.loss_window.push(loss)
+
+        self.close_window.push(close)
+        self.volume_window.push(volume)
+        ema20 = self.ema20.update(close)
+
+        rs = _nan_div(self.gain_window.mean(), self.loss_window.mean())
+        ts = timestamp if isinstance(timestamp, datetime) else pd.Timestamp(timestamp)
+        hour = float(ts.hour)
+        dow = float(ts.weekday())
+
+        ret_1_base = self._close_ago(1)
+        ret_6_base = self._close_ago(6)
+
+        features = {
+            "atr14_pct": self.atr_window.mean() / close * 100.0,
+            "rsi14": 100.0 - (100.0 / (1.0 + rs)) if not math.isnan(rs) else float("nan"),
+            "ema_spread_pct": float("nan"),
+            "zscore20": _nan_div(close - ema20, self.close_window.std()),
+            "ret_1": (close / ret_1_base - 1.0) * 100.0 if not math.isnan(ret_1_base) else float("nan"),
+            "ret_6": (close / ret_6_base - 1.0) * 100.0 if not math.isnan(ret_6_base) else float("nan"),
+            "bar_range_pct": _nan_div(high - low, close) * 100.0,
+            "volume_ratio": _nan_div(volume, self.volume_window.mean()),
+            "hour_sin": math.sin(2.0 * math.pi * hour / 24.0),
+            "hour_cos": math.cos(2.0 * math.pi * hour / 24.0),
+            "dow_sin": math.sin(2.0 * math.pi * dow / 7.0),
+            "dow_cos": math.cos(2.0 * math.pi * dow / 7.0),
+        }
+        if self.fast_ema is not None and self.slow_ema is not None:
+            fast = self.fast_ema.update(close)
+            slow = self.slow_ema.update(close)
+            features["ema_spread_pct"] = (fast - slow) / close * 100.0
+
+        self.latest = features
+        return features
+
+    def bootstrap(self, df: pd.DataFrame) -> Dict[str, float]:
+        """Replay historical bars (oldest first) and return the features of the last one."""
+        high = df["High"].to_numpy(dtype=float) if "High" in df.columns else df["Close"].to_numpy(dtype=float)
+        low = df["Low"].to_numpy(dtype=float) if "Low" in df.columns else df["Close"].to_numpy(dtype=float)
+        close = df["Close"].to_numpy(dtype=float)
+        volume = df["Volume"].to_numpy(dtype=float) if "Volume" in df.columns else np.ones(len(df))
+        timestamps = pd.to_datetime(df["timestamp"]).tolist()
+        for i in range(len(df)):
+            self.update(timestamps[i], high[i], low[i], close[i], volume[i])
+        return self.latest
+
+    def vector(self, columns: Sequence[str]) -> np.ndarray:
+        """Latest features in the given column order, written into a reused buffer."""
+        if self._out is None or len(self._out) != len(columns):
+            self._out = np.empty(len(columns), dtype=float)
+        for j, col in enumerate(columns):
+            self._out[j] = self.latest.get(col, float("nan"))
+        return self._out
+
+
+def feature_frame(engine: StreamingFeatureEngine, df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """Run the engine over every bar of df; used to check it against compute_features."""
+    rows = []
+    high = df["High"].to_numpy(dtype=float)
+    low = df["Low"].to_numpy(dtype=float)
+    close = df["Close"].to_numpy(dtype=float)
+    volume = df["Volume"].to_numpy(dtype=float)
+    timestamps = pd.to_datetime(df["timestamp"]).tolist()
+    for i in range(len(df)):
+        feats = engine.update(timestamps[i], high[i], low[i], close[i], volume[i])
+        rows.append([feats[c] for c in columns])
+    return pd.DataFrame(rows, columns=columns, index=df.index)
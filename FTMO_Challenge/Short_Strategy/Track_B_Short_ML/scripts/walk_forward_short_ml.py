@@ -15,24 +15,53 @@ Outputs:
 - reports/track_b_short_ml_summary.json
 - reports/track_b_short_ml_summary.txt
 - reports/track_b_short_ml_feature_importance.csv
+- reports/track_b_short_ml_train_telemetry.jsonl (one line per (fold, params) task)
 - images/track_b_short_ml_oos_equity.png
 - images/track_b_short_ml_monte_carlo.png
 - images/track_b_short_ml_feature_importance.png
 - images/track_b_short_ml_probability_quality.png
+- models/track_b_short_ml_filter.pkl (latest fold's filter; see filter_artifact.py)
+- models/track_b_short_ml_filter.json
 """
 
 from __future__ import annotations
 
 import argparse
 import json
-from dataclasses import dataclass
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Dict, List, Tuple
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.base import BaseEstimator
+from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+# Shared array-based metrics core lives in FTMO_Challenge/.
+FTMO_ROOT = Path(__file__).resolve().parents[3]
+if str(FTMO_ROOT) not in sys.path:
+    sys.path.insert(0, str(FTMO_ROOT))
+
+from metrics_core import (  # noqa: E402
+    DAILY_LOSS_LIMIT_PCT,
+    DAY_ID_COLUMN,
+    EXIT_DAY_COLUMN,
+    MAX_DRAWDOWN_LIMIT_PCT,
+    compute_metrics_frame,
+    encode_day_ids,
+    sharpe_from_daily,
+    trade_day_ids,
+)
+from feature_store import STORE_ATTR, load_or_build_feature_store, open_feature_store  # noqa: E402
+from filter_artifact import FilterArtifact, save_filter_artifact  # noqa: E402
 
 
 @dataclass
@@ -86,6 +115,7 @@ def load_data(csv_path: Path) -> pd.DataFrame:
     out = out.dropna(subset=["timestamp", "Close"]).sort_values("timestamp").reset_index(drop=True)
     if "Volume" not in out.columns:
         out["Volume"] = 1.0
+    out[DAY_ID_COLUMN] = encode_day_ids(out["timestamp"])
     return out
 
 
@@ -146,77 +176,157 @@ def build_short_signals(df: pd.DataFrame, fast: int, slow: int) -> pd.DataFrame:
     return out
 
 
-def generate_trade_candidates(df: pd.DataFrame, params: Params) -> pd.DataFrame:
-    data = build_short_signals(df, params.fast, params.slow)
-
-    closes = data["Close"].to_numpy(dtype=float)
-    signal_diffs = data["signal_diff"].to_numpy(dtype=float)
-    timestamps = data["timestamp"].to_numpy()
-
-    feature_matrix = data[FEATURE_COLUMNS].replace([np.inf, -np.inf], np.nan).to_numpy(dtype=float)
-
-    candidates: List[Dict[str, float]] = []
-    in_short = False
-    entry_price = 0.0
-    entry_ts = None
-    entry_idx = -1
-
-    for i in range(1, len(data)):
-        price = closes[i]
-        ts = timestamps[i]
-        sig_diff = signal_diffs[i]
-
-        if not in_short and sig_diff > 0:
-            in_short = True
-            entry_price = price
-            entry_ts = ts
-            entry_idx = i
-            continue
+def candidate_columns() -> List[str]:
+    return ["entry_ts", "exit_ts", EXIT_DAY_COLUMN, "entry_price", "exit_price", "move_pct", "reason", "is_win", *FEATURE_COLUMNS]
+
+
+def build_trade_candidates_columnar(df: pd.DataFrame, params: Params) -> Dict[str, np.ndarray]:
+    """
+    Short trade candidates as column arrays, without a per-bar Python loop.
+
+    Entries are the signal_diff > 0 bars. Consecutive entries are always
+    separated by a cover bar (signal_diff < 0), so trades never overlap and
+    each entry exits on the first later bar that hits SL, TP or a cover
+    signal. That first touch is found for all entries at once: each entry's
+    bars up to its next cover are laid out back to back and
+    np.minimum.reduceat picks the first hit per segment. Trades still open on
+    the last bar are dropped, as are entries with non-finite features.
+
+    entry_idx / exit_idx are bar positions in df.
+    """
+    # Same EMA/signal math as build_short_signals, without copying the whole frame.
+    close = df["Close"]
+    fast_ema = close.ewm(span=params.fast, adjust=False).mean()
+    slow_ema = close.ewm(span=params.slow, adjust=False).mean()
+    ema_spread_pct = (((fast_ema - slow_ema) / close) * 100.0).to_numpy(dtype=float)
+    signal_diffs = (fast_ema < slow_ema).astype(int).diff().fillna(0.0).to_numpy(dtype=float)
+    closes = close.to_numpy(dtype=float)
+    timestamps = df["timestamp"].to_numpy()
+    # Feature stores written before the day ID column existed are encoded here instead.
+    day_ids = df[DAY_ID_COLUMN].to_numpy() if DAY_ID_COLUMN in df.columns else encode_day_ids(df["timestamp"])
+
+    entries = np.flatnonzero(signal_diffs[1:] > 0) + 1
+    covers = np.flatnonzero(signal_diffs < 0)
+
+    # Last bar each trade can reach: its next cover bar, else the final bar.
+    if len(covers):
+        nxt = np.searchsorted(covers, entries, side="right")
+        seg_end = np.where(nxt < len(covers), covers[np.minimum(nxt, len(covers) - 1)], len(closes) - 1)
+    else:
+        seg_end = np.full(len(entries), len(closes) - 1)
+    keep = seg_end > entries
+    entries, seg_end = entries[keep], seg_end[keep]
+
+    lengths = seg_end - entries
+    total = int(lengths.sum())
+    if total == 0:
+        return {col: np.zeros(0) for col in ["entry_idx", "exit_idx", *candidate_columns()]}
+
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    offsets = np.arange(total) - np.repeat(starts, lengths)
+    bars = np.repeat(entries, lengths) + 1 + offsets
+    seg_entry_price = np.repeat(closes[entries], lengths)
+
+    move = ((seg_entry_price - closes[bars]) / seg_entry_price) * 100.0
+    hit = (move <= -params.stop_loss_pct) | (move >= params.take_profit_pct) | (signal_diffs[bars] < 0)
+    first = np.minimum.reduceat(np.where(hit, offsets, total), starts)
+
+    closed = first < total
+    entry_idx = entries[closed]
+    exit_idx = entry_idx + 1 + first[closed]
+    entry_price = closes[entry_idx]
+
+    move_pct = ((entry_price - closes[exit_idx]) / entry_price) * 100.0
+    is_sl = move_pct <= -params.stop_loss_pct
+    is_tp = ~is_sl & (move_pct >= params.take_profit_pct)
+    exit_price = np.where(
+        is_sl,
+        entry_price * (1.0 + params.stop_loss_pct / 100.0),
+        np.where(is_tp, entry_price * (1.0 - params.take_profit_pct / 100.0), closes[exit_idx]),
+    )
+    realized = np.where(is_sl, -params.stop_loss_pct, np.where(is_tp, params.take_profit_pct, move_pct))
+    reason = np.where(is_sl, "Stop Loss", np.where(is_tp, "Take Profit", "Cover Signal")).astype(object)
 
-        if in_short:
-            move_pct = ((entry_price - price) / entry_price) * 100.0
-            reason = None
-            exit_price = price
-            realized_move_pct = move_pct
-
-            if move_pct <= -params.stop_loss_pct:
-                reason = "Stop Loss"
-                exit_price = entry_price * (1.0 + params.stop_loss_pct / 100.0)
-                realized_move_pct = -params.stop_loss_pct
-            elif move_pct >= params.take_profit_pct:
-                reason = "Take Profit"
-                exit_price = entry_price * (1.0 - params.take_profit_pct / 100.0)
-                realized_move_pct = params.take_profit_pct
-            elif sig_diff < 0:
-                reason = "Cover Signal"
-
-            if reason is not None:
-                feats = feature_matrix[entry_idx]
-                if not np.isnan(feats).any() and np.isfinite(feats).all():
-                    row = {
-                        "entry_ts": entry_ts,
-                        "exit_ts": ts,
-                        "entry_price": float(entry_price),
-                        "exit_price": float(exit_price),
-                        "move_pct": float(realized_move_pct),
-                        "reason": reason,
-                        "is_win": int(realized_move_pct > 0.0),
-                    }
-                    for j, col in enumerate(FEATURE_COLUMNS):
-                        row[col] = float(feats[j])
-                    candidates.append(row)
-                in_short = False
-
-    if not candidates:
-        return pd.DataFrame()
+    # One gather of the entry-bar features; rows with NaN/inf features are dropped.
+    feats = np.column_stack(
+        [
+            ema_spread_pct[entry_idx] if col == "ema_spread_pct" else df[col].to_numpy(dtype=float)[entry_idx]
+            for col in FEATURE_COLUMNS
+        ]
+    )
+    valid = np.isfinite(feats).all(axis=1)
+
+    columns: Dict[str, np.ndarray] = {
+        "entry_idx": entry_idx[valid],
+        "exit_idx": exit_idx[valid],
+        "entry_ts": timestamps[entry_idx[valid]],
+        "exit_ts": timestamps[exit_idx[valid]],
+        EXIT_DAY_COLUMN: day_ids[exit_idx[valid]],
+        "entry_price": entry_price[valid],
+        "exit_price": exit_price[valid],
+        "move_pct": realized[valid],
+        "reason": reason[valid],
+        "is_win": (realized[valid] > 0.0).astype(int),
+    }
+    for j, col in enumerate(FEATURE_COLUMNS):
+        columns[col] = feats[valid, j]
+    return columns
 
-    out = pd.DataFrame(candidates)
+
+def candidates_to_frame(columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    if len(columns["entry_ts"]) == 0:
+        return pd.DataFrame()
+    out = pd.DataFrame({col: columns[col] for col in candidate_columns()})
     out["entry_ts"] = pd.to_datetime(out["entry_ts"])
     out["exit_ts"] = pd.to_datetime(out["exit_ts"])
-    out = out.sort_values("exit_ts").reset_index(drop=True)
+    # Trades never overlap, so entry order is already exit order.
     return out
 
 
+def generate_trade_candidates(df: pd.DataFrame, params: Params) -> pd.DataFrame:
+    return candidates_to_frame(build_trade_candidates_columnar(df, params))
+
+
+class CandidateCache:
+    """
+    Trade candidates generated once over the full history per (fast, slow, SL, TP).
+
+    Risk % does not change which trades are taken, so all risk levels share one
+    entry. Window lookups return the candidates that both enter and exit inside
+    [start, end) bars, so no trade leaks across a fold boundary. EMAs are warmed
+    up on the full history rather than restarted at each window start, which
+    can shift the first few signals of a window versus generate_trade_candidates.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._entries: Dict[Tuple[int, int, float, float], Tuple[pd.DataFrame, np.ndarray, np.ndarray]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _full(self, params: Params) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+        key = (params.fast, params.slow, params.stop_loss_pct, params.take_profit_pct)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        columns = build_trade_candidates_columnar(self.df, params)
+        entry = (candidates_to_frame(columns), columns["entry_idx"], columns["exit_idx"])
+        self._entries[key] = entry
+        return entry
+
+    def window(self, params: Params, start: int, end: int) -> pd.DataFrame:
+        candidates, entry_bars, exit_bars = self._full(params)
+        if candidates.empty:
+            return pd.DataFrame()
+        mask = (entry_bars >= start) & (exit_bars < end)
+        if not mask.any():
+            return pd.DataFrame()
+        return candidates.loc[mask].reset_index(drop=True)
+
+
 def simulate_filtered_trades(
     candidates_df: pd.DataFrame,
     params: Params,
@@ -250,6 +360,7 @@ def simulate_filtered_trades(
             {
                 "entry_ts": row["entry_ts"],
                 "exit_ts": row["exit_ts"],
+                EXIT_DAY_COLUMN: int(row[EXIT_DAY_COLUMN]),
                 "entry_price": float(row["entry_price"]),
                 "exit_price": float(row["exit_price"]),
                 "move_pct": float(row["move_pct"]),
@@ -265,58 +376,91 @@ def simulate_filtered_trades(
 
 
 def compute_metrics(trades_df: pd.DataFrame, initial_capital: float) -> Dict[str, float]:
-    if trades_df.empty:
-        return {
-            "total_trades": 0.0,
-            "win_rate": 0.0,
-            "total_pnl": 0.0,
-            "return_pct": 0.0,
-            "max_drawdown_pct": 0.0,
-            "worst_daily_loss_pct": 0.0,
-            "profit_factor": 0.0,
-            "sharpe_daily_annualized": 0.0,
-            "ftmo_pass": 1.0,
-        }
+    return compute_metrics_frame(trades_df, initial_capital)
 
-    pnl = trades_df["pnl"].astype(float)
-    total_pnl = float(pnl.sum())
-    wins = pnl[pnl > 0]
-    losses = pnl[pnl < 0]
 
-    win_rate = float((len(wins) / len(trades_df)) * 100.0)
-    return_pct = (total_pnl / initial_capital) * 100.0
-    max_drawdown_pct = float(trades_df["drawdown_pct"].max())
+def sweep_thresholds(
+    candidates_df: pd.DataFrame,
+    params: Params,
+    initial_capital: float,
+    thresholds: np.ndarray,
+    proba_col: str = "win_proba",
+) -> Dict[str, np.ndarray]:
+    """
+    compute_metrics(simulate_filtered_trades(...)) for every threshold at once.
+
+    Builds a (n_thresholds, n_candidates) acceptance mask and compounds equity
+    with a masked cumulative product of (1 + risk * move / SL). Returns one
+    array per compute_metrics key, indexed like thresholds.
+    """
+    thresholds = np.asarray(thresholds, dtype=float)
+    n_thr = len(thresholds)
+    if candidates_df.empty:
+        zeros = np.zeros(n_thr, dtype=float)
+        return {
+            "total_trades": zeros.copy(),
+            "win_rate": zeros.copy(),
+            "total_pnl": zeros.copy(),
+            "return_pct": zeros.copy(),
+            "max_drawdown_pct": zeros.copy(),
+            "worst_daily_loss_pct": zeros.copy(),
+            "profit_factor": zeros.copy(),
+            "sharpe_daily_annualized": zeros.copy(),
+            "ftmo_pass": np.ones(n_thr, dtype=float),
+        }
 
-    temp = trades_df.copy()
-    temp["exit_ts"] = pd.to_datetime(temp["exit_ts"])
-    temp["date"] = temp["exit_ts"].dt.date
-    daily = temp.groupby("date", as_index=False)["pnl"].sum().sort_values("date")
-    daily["daily_loss_pct"] = (daily["pnl"] / initial_capital) * 100.0
-    worst_daily_loss_pct = float(daily["daily_loss_pct"].min()) if not daily.empty else 0.0
-
-    gross_win = float(wins.sum()) if not wins.empty else 0.0
-    gross_loss = abs(float(losses.sum())) if not losses.empty else 0.0
-    profit_factor = (gross_win / gross_loss) if gross_loss > 0 else 0.0
-
-    equity_daily = initial_capital + daily["pnl"].cumsum()
-    daily_returns = equity_daily.pct_change().dropna()
-    if daily_returns.empty or daily_returns.std() == 0:
-        sharpe = 0.0
+    order = np.argsort(pd.to_datetime(candidates_df["exit_ts"]).to_numpy(dtype="datetime64[ns]"), kind="stable")
+    move = candidates_df["move_pct"].to_numpy(dtype=float)[order]
+    if proba_col in candidates_df.columns:
+        proba = candidates_df[proba_col].to_numpy(dtype=float)[order]
     else:
-        sharpe = float((daily_returns.mean() / daily_returns.std()) * np.sqrt(252.0))
-
-    ftmo_pass = 1.0 if (max_drawdown_pct <= 10.0 and worst_daily_loss_pct >= -5.0) else 0.0
-
+        proba = np.ones(len(order), dtype=float)
+    day_ids = trade_day_ids(candidates_df).take(order)
+
+    accepted = proba[None, :] >= thresholds[:, None]
+    growth = (params.risk_pct / 100.0) * (move / params.stop_loss_pct)
+    factors = np.where(accepted, 1.0 + growth[None, :], 1.0)
+    equity = initial_capital * np.cumprod(factors, axis=1)
+    equity_before = np.hstack([np.full((n_thr, 1), initial_capital), equity[:, :-1]])
+    pnl = np.where(accepted, equity_before * growth[None, :], 0.0)
+
+    # Rejected candidates leave equity unchanged, so the running peak matches the accepted-only path.
+    peak = np.maximum.accumulate(np.maximum(equity, initial_capital), axis=1)
+    dd = np.where(accepted & (peak > 0), (peak - equity) / peak * 100.0, 0.0)
+
+    n_trades = accepted.sum(axis=1).astype(float)
+    total_pnl = pnl.sum(axis=1)
+    gross_win = np.where(pnl > 0, pnl, 0.0).sum(axis=1)
+    gross_loss = -np.where(pnl < 0, pnl, 0.0).sum(axis=1)
+    wins = (accepted & (move[None, :] > 0)).sum(axis=1)
+
+    day_offsets = day_ids - day_ids.min()
+    n_days = int(day_offsets.max()) + 1
+    flat = (np.arange(n_thr)[:, None] * n_days + day_offsets[None, :]).ravel()
+    daily_sums = np.bincount(flat, weights=pnl.ravel(), minlength=n_thr * n_days).reshape(n_thr, n_days)
+    daily_counts = np.bincount(flat, weights=accepted.ravel(), minlength=n_thr * n_days).reshape(n_thr, n_days)
+    traded = daily_counts > 0
+
+    has_trades = n_trades > 0
+    worst_daily = np.where(traded, daily_sums, np.inf).min(axis=1)
+    worst_daily_pct = np.where(has_trades, worst_daily / initial_capital * 100.0, 0.0)
+    max_dd = dd.max(axis=1)
+    sharpe = np.array([sharpe_from_daily(daily_sums[i, traded[i]], initial_capital) for i in range(n_thr)])
+
+    safe_trades = np.maximum(n_trades, 1.0)
+    safe_loss = np.where(gross_loss > 0, gross_loss, 1.0)
     return {
-        "total_trades": float(len(trades_df)),
-        "win_rate": win_rate,
+        "total_trades": n_trades,
+        "win_rate": np.where(has_trades, wins / safe_trades * 100.0, 0.0),
         "total_pnl": total_pnl,
-        "return_pct": return_pct,
-        "max_drawdown_pct": max_drawdown_pct,
-        "worst_daily_loss_pct": worst_daily_loss_pct,
-        "profit_factor": profit_factor,
-        "sharpe_daily_annualized": sharpe,
-        "ftmo_pass": ftmo_pass,
+        "return_pct": total_pnl / initial_capital * 100.0,
+        "max_drawdown_pct": max_dd,
+        "worst_daily_loss_pct": worst_daily_pct,
+        "profit_factor": np.where(gross_loss > 0, gross_win / safe_loss, 0.0),
+        "sharpe_daily_annualized": np.where(has_trades, sharpe, 0.0),
+        "ftmo_pass": np.where(
+            (max_dd <= MAX_DRAWDOWN_LIMIT_PCT) & (worst_daily_pct >= DAILY_LOSS_LIMIT_PCT), 1.0, 0.0
+        ),
     }
 
 
@@ -367,91 +511,444 @@ def param_grid(quick_grid: bool = True) -> List[Params]:
     return grid
 
 
+FILTER_MODELS = ["gbc", "hist_gb", "logistic", "shallow_gb"]
+
+
+def build_filter_model(name: str) -> BaseEstimator:
+    """
+    Classifier backend for the trade filter.
+
+    gbc is the original exact 180-tree model; the others trade some accuracy
+    for much cheaper fits inside the walk-forward search.
+    """
+    if name == "gbc":
+        return GradientBoostingClassifier(n_estimators=180, learning_rate=0.05, max_depth=3, random_state=42)
+    if name == "hist_gb":
+        return HistGradientBoostingClassifier(
+            max_iter=180,
+            learning_rate=0.05,
+            max_depth=3,
+            early_stopping=False,
+            random_state=42,
+        )
+    if name == "logistic":
+        return make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000))
+    if name == "shallow_gb":
+        return GradientBoostingClassifier(
+            n_estimators=180,
+            learning_rate=0.1,
+            max_depth=2,
+            subsample=0.8,
+            validation_fraction=0.2,
+            n_iter_no_change=10,
+            random_state=42,
+        )
+    raise ValueError(f"Unknown filter model: {name}")
+
+
+# Next cheaper backend when a fit blows --max-fit-seconds; None means skip ML.
+CHEAPER_FILTER_MODEL: Dict[str, str | None] = {
+    "gbc": "shallow_gb",
+    "hist_gb": "logistic",
+    "shallow_gb": "logistic",
+    "logistic": None,
+}
+
+
+class FitBudgetExceeded(RuntimeError):
+    """Raised by fit_filter_and_threshold when selection fits exceed config.max_fit_seconds."""
+
+
+@dataclass
+class FilterConfig:
+    model: str = "gbc"
+    # 0 keeps the single 70/30 chronological holdout; >= 2 uses purged K-fold CV.
+    cv_folds: int = 0
+    cv_embargo_hours: float = 24.0
+    cv_jobs: int = 1
+    # 0 disables the budget; otherwise fit seconds allowed per (fold, params) before downgrading.
+    max_fit_seconds: float = 0.0
+
+
+def purged_kfold_splits(
+    entry_ts: np.ndarray,
+    exit_ts: np.ndarray,
+    n_splits: int,
+    embargo: np.timedelta64,
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Contiguous K-fold splits over chronologically ordered candidates.
+
+    For each test block, training drops every candidate whose entry-exit span
+    overlaps the block (purge) and every candidate entering within the embargo
+    after the block ends, so no label leaks across the boundary.
+    """
+    n = len(entry_ts)
+    splits = []
+    for test_idx in np.array_split(np.arange(n), n_splits):
+        if len(test_idx) == 0:
+            continue
+        block_start = entry_ts[test_idx].min()
+        block_end = exit_ts[test_idx].max()
+        overlaps = (entry_ts <= block_end) & (exit_ts >= block_start)
+        embargoed = (entry_ts > block_end) & (entry_ts <= block_end + embargo)
+        train_mask = ~(overlaps | embargoed)
+        train_mask[test_idx] = False
+        splits.append((np.flatnonzero(train_mask), test_idx))
+    return splits
+
+
+def _fit_cv_fold(
+    model_name: str,
+    X: np.ndarray,
+    y: np.ndarray,
+    split: Tuple[np.ndarray, np.ndarray],
+) -> Tuple[np.ndarray, float, float]:
+    train_idx, test_idx = split
+    model = build_filter_model(model_name)
+    started = time.perf_counter()
+    model.fit(X[train_idx], y[train_idx])
+    fit_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    proba = model.predict_proba(X[test_idx])[:, 1]
+    return proba, fit_seconds, time.perf_counter() - started
+
+
+def cross_validated_proba(
+    candidates_df: pd.DataFrame,
+    X: np.ndarray,
+    y: np.ndarray,
+    config: FilterConfig,
+    timings: Dict[str, float],
+) -> np.ndarray | None:
+    """
+    Out-of-fold win probabilities from purged, embargoed K-fold CV.
+
+    Folds are fitted concurrently in threads (cv_jobs). Returns None when a
+    purged training set is too small or single-class, so the caller can fall
+    back to the holdout split.
+    """
+    splits = purged_kfold_splits(
+        pd.to_datetime(candidates_df["entry_ts"]).to_numpy(dtype="datetime64[ns]"),
+        pd.to_datetime(candidates_df["exit_ts"]).to_numpy(dtype="datetime64[ns]"),
+        config.cv_folds,
+        np.timedelta64(int(config.cv_embargo_hours * 3600), "s"),
+    )
+    for train_idx, _ in splits:
+        if len(train_idx) < 50 or y[train_idx].min() == y[train_idx].max():
+            return None
+
+    started = time.perf_counter()
+    if config.cv_jobs > 1:
+        with ThreadPoolExecutor(max_workers=config.cv_jobs) as pool:
+            fold_results = list(pool.map(lambda split: _fit_cv_fold(config.model, X, y, split), splits))
+    else:
+        fold_results = [_fit_cv_fold(config.model, X, y, split) for split in splits]
+    wall_seconds = time.perf_counter() - started
+
+    oof = np.full(len(y), np.nan)
+    for (_, test_idx), (proba, _, _) in zip(splits, fold_results):
+        oof[test_idx] = proba
+    # Wall time split between fit and predict in proportion to the per-fold timings.
+    fit_total = sum(r[1] for r in fold_results)
+    predict_total = sum(r[2] for r in fold_results)
+    fit_share = fit_total / (fit_total + predict_total) if (fit_total + predict_total) > 0 else 1.0
+    timings["fit_seconds"] += wall_seconds * fit_share
+    timings["predict_seconds"] += wall_seconds * (1.0 - fit_share)
+    return oof
+
+
+def no_filter_result(
+    candidates_df: pd.DataFrame,
+    params: Params,
+    initial_capital: float,
+) -> Tuple[None, float, float, str]:
+    baseline = simulate_filtered_trades(
+        candidates_df,
+        params=params,
+        initial_capital=initial_capital,
+        threshold=0.0,
+    )
+    return None, 0.0, score_train(compute_metrics(baseline, initial_capital)), "no_filter"
+
+
 def fit_filter_and_threshold(
     candidates_df: pd.DataFrame,
     params: Params,
     initial_capital: float,
-) -> Tuple[GradientBoostingClassifier | None, float, float, str]:
+    config: FilterConfig | None = None,
+    timings: Dict[str, float] | None = None,
+) -> Tuple[BaseEstimator | None, float, float, str]:
+    """
+    Choose the trade filter's probability threshold, then refit on all candidates.
+
+    By default the filter is fitted on the first 70% of candidates and the
+    threshold picked on the last 30%. With config.cv_folds >= 2 the threshold
+    is picked from out-of-fold probabilities over every candidate (purged,
+    embargoed K-fold). Fit, predict and threshold-sweep seconds are added to
+    timings when given. Raises FitBudgetExceeded, before the sweep and the
+    full refit, if the selection fits took longer than config.max_fit_seconds.
+    """
+    config = config or FilterConfig()
+    if timings is None:
+        timings = {}
+    timings.setdefault("fit_seconds", 0.0)
+    timings.setdefault("predict_seconds", 0.0)
+    timings.setdefault("sweep_seconds", 0.0)
+
     if len(candidates_df) < 80:
-        baseline = simulate_filtered_trades(
-            candidates_df,
-            params=params,
-            initial_capital=initial_capital,
-            threshold=0.0,
-        )
-        return None, 0.0, score_train(compute_metrics(baseline, initial_capital)), "no_filter"
+        return no_filter_result(candidates_df, params, initial_capital)
 
     y = candidates_df["is_win"].to_numpy(dtype=int)
     if y.min() == y.max():
-        baseline = simulate_filtered_trades(
-            candidates_df,
-            params=params,
-            initial_capital=initial_capital,
-            threshold=0.0,
-        )
-        return None, 0.0, score_train(compute_metrics(baseline, initial_capital)), "no_filter"
+        return no_filter_result(candidates_df, params, initial_capital)
 
     X = candidates_df[FEATURE_COLUMNS].to_numpy(dtype=float)
-    split = int(len(candidates_df) * 0.7)
-    split = max(50, min(split, len(candidates_df) - 20))
-
-    X_fit = X[:split]
-    y_fit = y[:split]
-    val = candidates_df.iloc[split:].copy()
-    if len(val) < 20:
-        baseline = simulate_filtered_trades(
-            candidates_df,
-            params=params,
-            initial_capital=initial_capital,
-            threshold=0.0,
-        )
-        return None, 0.0, score_train(compute_metrics(baseline, initial_capital)), "no_filter"
 
-    model = GradientBoostingClassifier(
-        n_estimators=180,
-        learning_rate=0.05,
-        max_depth=3,
-        random_state=42,
-    )
-    model.fit(X_fit, y_fit)
+    oof = cross_validated_proba(candidates_df, X, y, config, timings) if config.cv_folds >= 2 else None
+    if oof is not None:
+        val = candidates_df.copy()
+        val["win_proba"] = oof
+    else:
+        split = int(len(candidates_df) * 0.7)
+        split = max(50, min(split, len(candidates_df) - 20))
+
+        X_fit = X[:split]
+        y_fit = y[:split]
+        val = candidates_df.iloc[split:].copy()
+        if len(val) < 20:
+            return no_filter_result(candidates_df, params, initial_capital)
+
+        holdout_model = build_filter_model(config.model)
+        started = time.perf_counter()
+        holdout_model.fit(X_fit, y_fit)
+        timings["fit_seconds"] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        val["win_proba"] = holdout_model.predict_proba(val[FEATURE_COLUMNS].to_numpy(dtype=float))[:, 1]
+        timings["predict_seconds"] += time.perf_counter() - started
+
+    if config.max_fit_seconds > 0 and timings["fit_seconds"] > config.max_fit_seconds:
+        raise FitBudgetExceeded(
+            f"{config.model} selection fits took {timings['fit_seconds']:.2f}s > {config.max_fit_seconds:.2f}s"
+        )
 
-    val["win_proba"] = model.predict_proba(val[FEATURE_COLUMNS].to_numpy(dtype=float))[:, 1]
+    # Row 0 is the unfiltered baseline; the rest are the ML thresholds.
+    thresholds = np.concatenate([[0.0], np.arange(0.3, 0.91, 0.05)])
+    started = time.perf_counter()
+    sweep = sweep_thresholds(val, params, initial_capital, thresholds, proba_col="win_proba")
+    timings["sweep_seconds"] += time.perf_counter() - started
+    scores = [score_train({k: float(v[i]) for k, v in sweep.items()}) for i in range(len(thresholds))]
 
-    baseline_val = simulate_filtered_trades(
-        val,
-        params=params,
-        initial_capital=initial_capital,
-        threshold=0.0,
-        proba_col="win_proba",
-    )
     best_threshold = 0.0
-    best_score = score_train(compute_metrics(baseline_val, initial_capital))
+    best_score = scores[0]
     best_mode = "no_filter"
 
     min_val_trades = max(30, int(len(val) * 0.15))
 
-    for threshold in np.arange(0.3, 0.91, 0.05):
-        sim_trades = simulate_filtered_trades(
-            val,
-            params=params,
-            initial_capital=initial_capital,
-            threshold=float(threshold),
-            proba_col="win_proba",
-        )
-        if len(sim_trades) < min_val_trades:
+    for i in range(1, len(thresholds)):
+        if sweep["total_trades"][i] < min_val_trades:
             continue
-        m = compute_metrics(sim_trades, initial_capital)
-        s = score_train(m)
-        if s > best_score:
-            best_score = s
-            best_threshold = float(threshold)
+        if scores[i] > best_score:
+            best_score = scores[i]
+            best_threshold = float(thresholds[i])
             best_mode = "ml_filter"
 
     # Refit on full training fold for deployment into test window.
+    model = build_filter_model(config.model)
+    started = time.perf_counter()
     model.fit(X, y)
+    timings["fit_seconds"] += time.perf_counter() - started
     return model, best_threshold, float(best_score), best_mode
 
 
+@dataclass
+class TrainResult:
+    fold: int
+    params: Params
+    model: BaseEstimator | None
+    threshold: float
+    score: float
+    mode: str
+    candidates: int
+    seconds: float
+    fit_seconds: float
+    predict_seconds: float
+    sweep_seconds: float
+    model_bytes: int
+    # Backend actually used; differs from the configured one after a budget downgrade.
+    filter_model: str
+    # "none", "downgraded" or "skipped_ml" (see --max-fit-seconds).
+    budget_action: str
+
+
+def train_task(
+    df: pd.DataFrame,
+    cache: CandidateCache | None,
+    task: Tuple[int, int, int, Params],
+    initial_capital: float,
+    filter_config: FilterConfig | None = None,
+) -> TrainResult:
+    """
+    Generate one (fold, params) training set and fit its filter.
+
+    When a fit exceeds filter_config.max_fit_seconds the task retries with the
+    next backend in CHEAPER_FILTER_MODEL, and finally falls back to no_filter.
+    """
+    fold, train_start, train_end, params = task
+    started = time.perf_counter()
+    if cache is not None:
+        candidates = cache.window(params, train_start, train_end)
+    else:
+        candidates = generate_trade_candidates(df.iloc[train_start:train_end], params)
+
+    config = filter_config or FilterConfig()
+    model_name: str | None = config.model
+    budget_action = "none"
+    timings = {"fit_seconds": 0.0, "predict_seconds": 0.0, "sweep_seconds": 0.0}
+    while True:
+        if model_name is None:
+            model, threshold, score, mode = no_filter_result(candidates, params, initial_capital)
+            budget_action = "skipped_ml"
+            break
+        attempt: Dict[str, float] = {}
+        try:
+            model, threshold, score, mode = fit_filter_and_threshold(
+                candidates,
+                params,
+                initial_capital,
+                config=replace(config, model=model_name),
+                timings=attempt,
+            )
+        except FitBudgetExceeded:
+            model_name = CHEAPER_FILTER_MODEL[model_name]
+            budget_action = "downgraded"
+            continue
+        finally:
+            for key, value in attempt.items():
+                timings[key] += value
+        break
+
+    return TrainResult(
+        fold=fold,
+        params=params,
+        model=model,
+        threshold=threshold,
+        score=score,
+        mode=mode,
+        candidates=int(len(candidates)),
+        seconds=time.perf_counter() - started,
+        fit_seconds=timings["fit_seconds"],
+        predict_seconds=timings["predict_seconds"],
+        sweep_seconds=timings["sweep_seconds"],
+        model_bytes=len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)) if model is not None else 0,
+        filter_model=model_name or "none",
+        budget_action=budget_action,
+    )
+
+
+def print_task_timing(result: TrainResult) -> None:
+    p = result.params
+    print(
+        f"  fold {result.fold + 1} | EMA({p.fast}/{p.slow}) SL {p.stop_loss_pct}% TP {p.take_profit_pct}% "
+        f"Risk {p.risk_pct}% | {result.candidates} candidates | {result.mode} ({result.filter_model}) | "
+        f"{result.seconds:.2f}s"
+    )
+
+
+def task_telemetry(result: TrainResult) -> Dict:
+    """One JSON-serializable telemetry record per (fold, params) training task."""
+    p = result.params
+    return {
+        "fold": int(result.fold),
+        "fast": p.fast,
+        "slow": p.slow,
+        "stop_loss_pct": p.stop_loss_pct,
+        "take_profit_pct": p.take_profit_pct,
+        "risk_pct": p.risk_pct,
+        "candidates": int(result.candidates),
+        "filter_model": result.filter_model,
+        "budget_action": result.budget_action,
+        "mode": result.mode,
+        "threshold": float(result.threshold),
+        "score": float(result.score),
+        "fit_seconds": float(result.fit_seconds),
+        "predict_seconds": float(result.predict_seconds),
+        "sweep_seconds": float(result.sweep_seconds),
+        "task_seconds": float(result.seconds),
+        "model_bytes": int(result.model_bytes),
+    }
+
+
+def write_train_telemetry(results: List[TrainResult], out_path: Path) -> None:
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w") as f:
+        for result in results:
+            f.write(json.dumps(task_telemetry(result)) + "\n")
+
+
+# Per-process state for --workers > 1. The feature frame is sent to each worker
+# once by the initializer and then only read; tasks carry just window bounds.
+# With --feature-store only the store path is sent and each worker maps it.
+_WORKER_DF: pd.DataFrame | None = None
+_WORKER_CACHE: CandidateCache | None = None
+_WORKER_CAPITAL: float = 0.0
+_WORKER_FILTER_CONFIG: FilterConfig | None = None
+
+
+def _init_worker(
+    df: pd.DataFrame | str,
+    use_candidate_cache: bool,
+    initial_capital: float,
+    filter_config: FilterConfig,
+) -> None:
+    global _WORKER_DF, _WORKER_CACHE, _WORKER_CAPITAL, _WORKER_FILTER_CONFIG
+    if isinstance(df, str):
+        df = open_feature_store(Path(df))
+    _WORKER_DF = df
+    _WORKER_CACHE = CandidateCache(df) if use_candidate_cache else None
+    _WORKER_CAPITAL = initial_capital
+    _WORKER_FILTER_CONFIG = filter_config
+
+
+def _train_in_worker(task: Tuple[int, int, int, Params]) -> TrainResult:
+    return train_task(_WORKER_DF, _WORKER_CACHE, task, _WORKER_CAPITAL, _WORKER_FILTER_CONFIG)
+
+
+def run_training_tasks(
+    df: pd.DataFrame,
+    tasks: List[Tuple[int, int, int, Params]],
+    initial_capital: float,
+    cache: CandidateCache | None,
+    workers: int = 1,
+    filter_config: FilterConfig | None = None,
+) -> List[TrainResult]:
+    """
+    Train every (fold, params) task, serially or in a process pool.
+
+    Results come back in task order either way, so per-fold selection (first
+    best score in grid order wins) is identical for any worker count.
+    """
+    if workers <= 1:
+        results = []
+        for task in tasks:
+            result = train_task(df, cache, task, initial_capital, filter_config)
+            print_task_timing(result)
+            results.append(result)
+        return results
+
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(df.attrs.get(STORE_ATTR, df), cache is not None, initial_capital, filter_config or FilterConfig()),
+    ) as pool:
+        for result in pool.map(_train_in_worker, tasks):
+            print_task_timing(result)
+            results.append(result)
+    return results
+
+
 def monte_carlo_paths(trades_df: pd.DataFrame, initial_capital: float, n_paths: int, n_trades: int, seed: int = 42) -> np.ndarray:
     if trades_df.empty:
         return np.zeros((0, 0))
@@ -494,7 +991,11 @@ def run_walk_forward_ml(
     step_years: float,
     max_folds: int,
     quick_grid: bool,
-) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, Dict, pd.DataFrame]:
+    use_candidate_cache: bool = False,
+    workers: int = 1,
+    filter_config: FilterConfig | None = None,
+    telemetry_path: Path | None = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, Dict, pd.DataFrame, FilterArtifact | None]:
     bars_per_year = int(24 * 365)
     train_bars = int(train_years * bars_per_year)
     test_bars = int(test_years * bars_per_year)
@@ -506,6 +1007,20 @@ def run_walk_forward_ml(
 
     grid = param_grid(quick_grid=quick_grid)
     print(f"[Track B ML] Testing {len(grid)} parameter combinations per fold")
+    cache = CandidateCache(df) if use_candidate_cache else None
+
+    tasks = [(fold, train_start, train_end, params) for fold, train_start, train_end, _ in windows for params in grid]
+    print(f"[Track B ML] Training {len(tasks)} (fold, params) tasks with {max(workers, 1)} worker(s)")
+    train_started = time.perf_counter()
+    filter_config = filter_config or FilterConfig()
+    train_results = run_training_tasks(df, tasks, initial_capital, cache, workers=workers, filter_config=filter_config)
+    train_wall_seconds = time.perf_counter() - train_started
+    if telemetry_path is not None:
+        # Written straight after training so it survives a failure later in the run.
+        write_train_telemetry(train_results, telemetry_path)
+    results_by_fold: Dict[int, List[TrainResult]] = {}
+    for result in train_results:
+        results_by_fold.setdefault(result.fold, []).append(result)
 
     fold_rows: List[Dict] = []
     all_oos_trades: List[pd.DataFrame] = []
@@ -514,44 +1029,49 @@ def run_walk_forward_ml(
 
     best_global_params: Params | None = None
     best_global_score = -1e18
+    # Filter from the most recent training window, exported for live scoring.
+    deployment: FilterArtifact | None = None
 
     for fold, train_start, train_end, test_end in windows:
-        train_df = df.iloc[train_start:train_end].copy()
-        test_df = df.iloc[train_end:test_end].copy()
+        train_df = df.iloc[train_start:train_end]
+        test_df = df.iloc[train_end:test_end]
 
         print(f"[Track B ML] Fold {fold + 1}/{len(windows)} | train bars={len(train_df):,} | test bars={len(test_df):,}")
 
         best_params = None
         best_threshold = 0.0
         best_mode = "no_filter"
-        best_model: GradientBoostingClassifier | None = None
+        best_model: BaseEstimator | None = None
+        best_filter_model = filter_config.model
         best_score = -1e18
-
-        for idx, params in enumerate(grid):
-            train_candidates = generate_trade_candidates(train_df, params)
-            model, threshold, train_score, mode = fit_filter_and_threshold(train_candidates, params, initial_capital)
-
-            if train_score > best_score:
-                best_score = train_score
-                best_params = params
-                best_threshold = threshold
-                best_model = model
-                best_mode = mode
-
-            if (idx + 1) % max(1, len(grid) // 4) == 0:
-                print(f"  progress: {idx + 1}/{len(grid)}")
+        test_predict_seconds = 0.0
+
+        fold_results = results_by_fold.get(fold, [])
+        for result in fold_results:
+            if result.score > best_score:
+                best_score = result.score
+                best_params = result.params
+                best_threshold = result.threshold
+                best_model = result.model
+                best_filter_model = result.filter_model
+                best_mode = result.mode
 
         if best_params is None:
             print("  warning: no valid setup for fold, skipping.")
             continue
 
-        test_candidates = generate_trade_candidates(test_df, best_params)
+        if cache is not None:
+            test_candidates = cache.window(best_params, train_end, test_end)
+        else:
+            test_candidates = generate_trade_candidates(test_df, best_params)
         if not test_candidates.empty:
             test_candidates = test_candidates.copy()
             if best_model is not None and best_mode == "ml_filter":
+                started = time.perf_counter()
                 test_candidates["win_proba"] = best_model.predict_proba(
                     test_candidates[FEATURE_COLUMNS].to_numpy(dtype=float)
                 )[:, 1]
+                test_predict_seconds = time.perf_counter() - started
             else:
                 test_candidates["win_proba"] = 1.0
             test_candidates["fold"] = fold
@@ -599,8 +1119,15 @@ def run_walk_forward_ml(
                 "best_tp_pct": best_params.take_profit_pct,
                 "best_risk_pct": best_params.risk_pct,
                 "filter_mode": best_mode,
+                "filter_model": best_filter_model,
                 "proba_threshold": best_threshold,
                 "train_ml_score": best_score,
+                "train_task_seconds": float(sum(r.seconds for r in fold_results)),
+                "filter_fit_seconds": float(sum(r.fit_seconds for r in fold_results)),
+                "filter_predict_seconds": float(sum(r.predict_seconds for r in fold_results) + test_predict_seconds),
+                "filter_sweep_seconds": float(sum(r.sweep_seconds for r in fold_results)),
+                "budget_downgrades": int(sum(r.budget_action == "downgraded" for r in fold_results)),
+                "budget_skipped_ml": int(sum(r.budget_action == "skipped_ml" for r in fold_results)),
                 "test_trades": accepted_count,
                 "test_candidates": total_candidates,
                 "accept_rate_pct": accept_rate,
@@ -619,6 +1146,24 @@ def run_walk_forward_ml(
             best_global_score = best_score
             best_global_params = best_params
 
+        deployment = FilterArtifact(
+            model=best_model if best_mode == "ml_filter" else None,
+            feature_columns=list(FEATURE_COLUMNS),
+            threshold=float(best_threshold),
+            mode=best_mode,
+            filter_model=best_filter_model,
+            params={
+                "fast": best_params.fast,
+                "slow": best_params.slow,
+                "stop_loss_pct": best_params.stop_loss_pct,
+                "take_profit_pct": best_params.take_profit_pct,
+                "risk_pct": best_params.risk_pct,
+            },
+            fold=int(fold),
+            train_start=str(train_df["timestamp"].iloc[0]),
+            train_end=str(train_df["timestamp"].iloc[-1]),
+        )
+
     folds_df = pd.DataFrame(fold_rows)
     oos_trades_df = pd.concat(all_oos_trades, ignore_index=True) if all_oos_trades else pd.DataFrame()
     oos_candidates_df = pd.concat(all_oos_candidates, ignore_index=True) if all_oos_candidates else pd.DataFrame()
@@ -652,9 +1197,35 @@ def run_walk_forward_ml(
         "accept_rate_pct": float((len(oos_trades_df) / len(oos_candidates_df) * 100.0) if len(oos_candidates_df) > 0 else 0.0),
         "ml_filter_folds": int((folds_df["filter_mode"] == "ml_filter").sum()) if not folds_df.empty else 0,
         "no_filter_folds": int((folds_df["filter_mode"] == "no_filter").sum()) if not folds_df.empty else 0,
+        "workers": int(max(workers, 1)),
+        "feature_store": df.attrs.get(STORE_ATTR),
+        "filter_model": filter_config.model,
+        "cv_folds": int(filter_config.cv_folds),
+        "cv_embargo_hours": float(filter_config.cv_embargo_hours),
+        "filter_fit_seconds": float(folds_df["filter_fit_seconds"].sum()) if not folds_df.empty else 0.0,
+        "filter_predict_seconds": float(folds_df["filter_predict_seconds"].sum()) if not folds_df.empty else 0.0,
+        "filter_sweep_seconds": float(sum(r.sweep_seconds for r in train_results)),
+        "max_fit_seconds": float(filter_config.max_fit_seconds),
+        "budget_downgrades": int(sum(r.budget_action == "downgraded" for r in train_results)),
+        "budget_skipped_ml": int(sum(r.budget_action == "skipped_ml" for r in train_results)),
+        "max_model_bytes": int(max((r.model_bytes for r in train_results), default=0)),
+        "train_telemetry": str(telemetry_path) if telemetry_path is not None else None,
+        "filter_timing_by_fold": [
+            {
+                "fold": int(row["fold"]),
+                "fit_seconds": float(row["filter_fit_seconds"]),
+                "predict_seconds": float(row["filter_predict_seconds"]),
+            }
+            for _, row in folds_df.iterrows()
+        ],
+        "train_wall_seconds": float(train_wall_seconds),
+        "train_task_seconds": float(sum(r.seconds for r in train_results)),
+        "candidate_cache": bool(cache is not None),
+        "candidate_cache_hits": int(cache.hits) if cache is not None else 0,
+        "candidate_cache_misses": int(cache.misses) if cache is not None else 0,
     }
 
-    return folds_df, oos_trades_df, oos_candidates_df, summary, feat_imp_df
+    return folds_df, oos_trades_df, oos_candidates_df, summary, feat_imp_df, deployment
 
 
 def plot_oos_equity(oos_trades_df: pd.DataFrame, out_path: Path, initial_capital: float) -> None:
@@ -784,6 +1355,38 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--max-folds", type=int, default=2, help="Max folds")
     parser.add_argument("--mc-paths", type=int, default=1000, help="Monte Carlo paths")
     parser.add_argument("--full-grid", action="store_true", help="Use full parameter grid")
+    parser.add_argument(
+        "--candidate-cache",
+        action="store_true",
+        help="Generate candidates once over the full history and slice them per fold",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Processes for (fold, params) model training")
+    parser.add_argument(
+        "--filter-model",
+        choices=FILTER_MODELS,
+        default="gbc",
+        help="Trade filter classifier (gbc is the original; others are faster)",
+    )
+    parser.add_argument(
+        "--cv-folds",
+        type=int,
+        default=0,
+        help="Purged K-fold CV for threshold selection (0 = single 70/30 holdout)",
+    )
+    parser.add_argument("--cv-embargo-hours", type=float, default=24.0, help="Embargo after each CV test block")
+    parser.add_argument("--cv-jobs", type=int, default=1, help="Threads fitting CV folds in parallel")
+    parser.add_argument(
+        "--feature-store",
+        type=Path,
+        default=None,
+        help="Directory of memory-mapped feature columns (built from --data on first use)",
+    )
+    parser.add_argument(
+        "--max-fit-seconds",
+        type=float,
+        default=0.0,
+        help="Fit-time budget per (fold, params); over budget downgrades to a cheaper model, then skips ML (0 = off)",
+    )
     return parser.parse_args()
 
 
@@ -794,6 +1397,7 @@ def main() -> None:
     track_root = script_dir.parent
     reports_dir = track_root / "reports"
     images_dir = track_root / "images"
+    models_dir = track_root / "models"
     reports_dir.mkdir(parents=True, exist_ok=True)
     images_dir.mkdir(parents=True, exist_ok=True)
 
@@ -801,10 +1405,19 @@ def main() -> None:
     if not data_path.exists():
         raise FileNotFoundError(f"Data file not found: {data_path}")
 
-    df = load_data(data_path)
-    df = compute_features(df)
+    if args.feature_store is not None:
+        df = load_or_build_feature_store(
+            args.feature_store,
+            data_path,
+            lambda p: compute_features(load_data(p)),
+            code=(load_data, compute_features),
+            columns=FEATURE_COLUMNS,
+        )
+    else:
+        df = load_data(data_path)
+        df = compute_features(df)
 
-    folds_df, oos_trades_df, oos_candidates_df, summary, feat_imp_df = run_walk_forward_ml(
+    folds_df, oos_trades_df, oos_candidates_df, summary, feat_imp_df, deployment = run_walk_forward_ml(
         df,
         initial_capital=args.initial_capital,
         train_years=args.train_years,
@@ -812,6 +1425,16 @@ def main() -> None:
         step_years=args.step_years,
         max_folds=args.max_folds,
         quick_grid=not args.full_grid,
+        use_candidate_cache=args.candidate_cache,
+        workers=args.workers,
+        filter_config=FilterConfig(
+            model=args.filter_model,
+            cv_folds=args.cv_folds,
+            cv_embargo_hours=args.cv_embargo_hours,
+            cv_jobs=args.cv_jobs,
+            max_fit_seconds=args.max_fit_seconds,
+        ),
+        telemetry_path=reports_dir / "track_b_short_ml_train_telemetry.jsonl",
     )
 
     mc_paths = monte_carlo_paths(
@@ -867,6 +1490,17 @@ def main() -> None:
         f"OOS candidates: {summary['candidate_count']}",
         f"OOS accepted trades: {summary['accept_count']} ({summary['accept_rate_pct']:.2f}%)",
         f"Fold filter modes: ML={summary['ml_filter_folds']} | No-filter={summary['no_filter_folds']}",
+        f"Filter model: {summary['filter_model']} | fit {summary['filter_fit_seconds']:.1f}s | "
+        f"predict {summary['filter_predict_seconds']:.2f}s",
+        f"Threshold selection: "
+        f"{'purged ' + str(summary['cv_folds']) + '-fold CV' if summary['cv_folds'] >= 2 else '70/30 holdout'}",
+        f"Fit budget: "
+        + (
+            f"{summary['max_fit_seconds']:.1f}s per task | downgraded {summary['budget_downgrades']} | "
+            f"ML skipped {summary['budget_skipped_ml']}"
+            if summary["max_fit_seconds"] > 0
+            else "off"
+        ),
         f"OOS Sharpe: {summary['oos_sharpe_daily_annualized']:.3f}",
         f"OOS return: {summary['oos_return_pct']:.2f}%",
         f"OOS max drawdown: {summary['oos_max_drawdown_pct']:.2f}%",
@@ -880,6 +1514,10 @@ def main() -> None:
     ]
     (reports_dir / "track_b_short_ml_summary.txt").write_text("\n".join(lines))
 
+    artifact_path = models_dir / "track_b_short_ml_filter.pkl"
+    if deployment is not None:
+        save_filter_artifact(deployment, artifact_path)
+
     print("Saved reports:")
     print(f"- {reports_dir / 'track_b_short_ml_fold_results.csv'}")
     print(f"- {reports_dir / 'track_b_short_ml_oos_trades.csv'}")
@@ -887,11 +1525,16 @@ def main() -> None:
     print(f"- {reports_dir / 'track_b_short_ml_feature_importance.csv'}")
     print(f"- {reports_dir / 'track_b_short_ml_summary.json'}")
     print(f"- {reports_dir / 'track_b_short_ml_summary.txt'}")
+    print(f"- {reports_dir / 'track_b_short_ml_train_telemetry.jsonl'}")
     print("Saved images:")
     print(f"- {images_dir / 'track_b_short_ml_oos_equity.png'}")
     print(f"- {images_dir / 'track_b_short_ml_monte_carlo.png'}")
     print(f"- {images_dir / 'track_b_short_ml_feature_importance.png'}")
     print(f"- {images_dir / 'track_b_short_ml_probability_quality.png'}")
+    if deployment is not None:
+        print("Saved filter artifact:")
+        print(f"- {artifact_path}")
+        print(f"- {artifact_path.with_suffix('.json')}")
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
 
@@ -9,6 +10,13 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+# Shared array-based metrics core lives in FTMO_Challenge/.
+FTMO_ROOT = Path(__file__).resolve().parents[3]
+if str(FTMO_ROOT) not in sys.path:
+    sys.path.insert(0, str(FTMO_ROOT))
+
+from metrics_core import EXIT_DAY_COLUMN, compute_metrics_frame, encode_day_ids  # noqa: E402
+
 
 def load_trades(path: Path) -> pd.DataFrame:
     df = pd.read_csv(path)
@@ -17,6 +25,8 @@ def load_trades(path: Path) -> pd.DataFrame:
     df["entry_ts"] = pd.to_datetime(df["entry_ts"], errors="coerce")
     df["exit_ts"] = pd.to_datetime(df["exit_ts"], errors="coerce")
     df = df.dropna(subset=["exit_ts", "pnl"]).sort_values("exit_ts").reset_index(drop=True)
+    # Encoded once here; every risk multiplier in the sweep reuses it.
+    df[EXIT_DAY_COLUMN] = encode_day_ids(df["exit_ts"])
     return df
 
 
@@ -34,41 +44,16 @@ def apply_risk_multiplier(trades_df: pd.DataFrame, mult: float, initial_capital:
 
 
 def compute_metrics(trades_df: pd.DataFrame, initial_capital: float) -> Dict[str, float]:
-    if trades_df.empty:
-        return {
-            "return_pct": 0.0,
-            "max_drawdown_pct": 0.0,
-            "worst_daily_loss_pct": 0.0,
-            "sharpe_daily_annualized": 0.0,
-            "final_equity": float(initial_capital),
-            "trades": 0,
-        }
-
-    total_pnl = float(trades_df["pnl"].sum())
-    max_dd = float(trades_df["drawdown_pct"].max())
-
-    daily = trades_df.copy()
-    daily["date"] = daily["exit_ts"].dt.date
-    daily_pnl = daily.groupby("date", as_index=False)["pnl"].sum()
-    daily_pnl["daily_loss_pct"] = (daily_pnl["pnl"] / float(initial_capital)) * 100.0
-    worst_daily = float(daily_pnl["daily_loss_pct"].min()) if not daily_pnl.empty else 0.0
-
-    equity_daily = float(initial_capital) + daily_pnl["pnl"].cumsum()
-    daily_returns = equity_daily.pct_change().dropna()
-    if daily_returns.empty or float(daily_returns.std()) == 0.0:
-        sharpe = 0.0
-    else:
-        sharpe = float((daily_returns.mean() / daily_returns.std()) * np.sqrt(252.0))
-
+    m = compute_metrics_frame(trades_df, float(initial_capital))
     final_equity = float(trades_df["equity_after"].iloc[-1]) if "equity_after" in trades_df.columns and not trades_df.empty else float(initial_capital)
 
     return {
-        "return_pct": (total_pnl / float(initial_capital)) * 100.0,
-        "max_drawdown_pct": max_dd,
-        "worst_daily_loss_pct": worst_daily,
-        "sharpe_daily_annualized": sharpe,
+        "return_pct": m["return_pct"],
+        "max_drawdown_pct": m["max_drawdown_pct"],
+        "worst_daily_loss_pct": m["worst_daily_loss_pct"],
+        "sharpe_daily_annualized": m["sharpe_daily_annualized"],
         "final_equity": final_equity,
-        "trades": int(len(trades_df)),
+        "trades": int(m["total_trades"]),
     }
 
 
@@ -24,6 +24,9 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Tuple
@@ -31,7 +34,19 @@ from typing import Dict, List, Tuple
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.base import BaseEstimator
+from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+# Shared array-based metrics core lives in FTMO_Challenge/.
+FTMO_ROOT = Path(__file__).resolve().parents[3]
+if str(FTMO_ROOT) not in sys.path:
+    sys.path.insert(0, str(FTMO_ROOT))
+
+from metrics_core import DAY_ID_COLUMN, EXIT_DAY_COLUMN, compute_metrics_frame, encode_day_ids  # noqa: E402
+from feature_store import STORE_ATTR, load_or_build_feature_store, open_feature_store  # noqa: E402
 
 
 @dataclass
@@ -70,6 +85,7 @@ def load_data(csv_path: Path) -> pd.DataFrame:
     out = out.dropna(subset=["timestamp", "Close"]).sort_values("timestamp").reset_index(drop=True)
     if "Volume" not in out.columns:
         out["Volume"] = 1.0
+    out[DAY_ID_COLUMN] = encode_day_ids(out["timestamp"])
     return out
 
 
@@ -116,70 +132,115 @@ def build_short_signals(df: pd.DataFrame, fast: int, slow: int) -> pd.DataFrame:
     return out
 
 
-def generate_trade_candidates(df: pd.DataFrame, params: Params) -> pd.DataFrame:
-    data = build_short_signals(df, params.fast, params.slow)
-    closes = data["Close"].to_numpy(dtype=float)
-    signal_diffs = data["signal_diff"].to_numpy(dtype=float)
-    timestamps = data["timestamp"].to_numpy()
-    feats = data[FEATURE_COLUMNS].replace([np.inf, -np.inf], np.nan).to_numpy(dtype=float)
-
-    rows: List[Dict[str, float]] = []
-    in_short = False
-    entry_price = 0.0
-    entry_ts = None
-    entry_idx = -1
-
-    for i in range(1, len(data)):
-        price = closes[i]
-        ts = timestamps[i]
-        sd = signal_diffs[i]
-
-        if not in_short and sd > 0:
-            in_short = True
-            entry_price = price
-            entry_ts = ts
-            entry_idx = i
-            continue
+def candidate_columns() -> List[str]:
+    return ["entry_ts", "exit_ts", EXIT_DAY_COLUMN, "entry_price", "exit_price", "move_pct", "reason", "is_win", *FEATURE_COLUMNS]
+
+
+def build_trade_candidates_columnar(df: pd.DataFrame, params: Params) -> Dict[str, np.ndarray]:
+    """
+    Short trade candidates as column arrays, without a per-bar Python loop.
+
+    Entries are the signal_diff > 0 bars. Consecutive entries are always
+    separated by a cover bar (signal_diff < 0), so trades never overlap and
+    each entry exits on the first later bar that hits SL, TP or a cover
+    signal. That first touch is found for all entries at once: each entry's
+    bars up to its next cover are laid out back to back and
+    np.minimum.reduceat picks the first hit per segment. Trades still open on
+    the last bar are dropped, as are entries with non-finite features.
+
+    entry_idx / exit_idx are bar positions in df.
+    """
+    # Same EMA/signal math as build_short_signals, without copying the whole frame.
+    close = df["Close"]
+    fast_ema = close.ewm(span=params.fast, adjust=False).mean()
+    slow_ema = close.ewm(span=params.slow, adjust=False).mean()
+    ema_spread_pct = (((fast_ema - slow_ema) / close) * 100.0).to_numpy(dtype=float)
+    signal_diffs = (fast_ema < slow_ema).astype(int).diff().fillna(0.0).to_numpy(dtype=float)
+    closes = close.to_numpy(dtype=float)
+    timestamps = df["timestamp"].to_numpy()
+    # Feature stores written before the day ID column existed are encoded here instead.
+    day_ids = df[DAY_ID_COLUMN].to_numpy() if DAY_ID_COLUMN in df.columns else encode_day_ids(df["timestamp"])
+
+    entries = np.flatnonzero(signal_diffs[1:] > 0) + 1
+    covers = np.flatnonzero(signal_diffs < 0)
+
+    # Last bar each trade can reach: its next cover bar, else the final bar.
+    if len(covers):
+        nxt = np.searchsorted(covers, entries, side="right")
+        seg_end = np.where(nxt < len(covers), covers[np.minimum(nxt, len(covers) - 1)], len(closes) - 1)
+    else:
+        seg_end = np.full(len(entries), len(closes) - 1)
+    keep = seg_end > entries
+    entries, seg_end = entries[keep], seg_end[keep]
+
+    lengths = seg_end - entries
+    total = int(lengths.sum())
+    if total == 0:
+        return {col: np.zeros(0) for col in ["entry_idx", "exit_idx", *candidate_columns()]}
+
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    offsets = np.arange(total) - np.repeat(starts, lengths)
+    bars = np.repeat(entries, lengths) + 1 + offsets
+    seg_entry_price = np.repeat(closes[entries], lengths)
+
+    move = ((seg_entry_price - closes[bars]) / seg_entry_price) * 100.0
+    hit = (move <= -params.stop_loss_pct) | (move >= params.take_profit_pct) | (signal_diffs[bars] < 0)
+    first = np.minimum.reduceat(np.where(hit, offsets, total), starts)
+
+    closed = first < total
+    entry_idx = entries[closed]
+    exit_idx = entry_idx + 1 + first[closed]
+    entry_price = closes[entry_idx]
+
+    move_pct = ((entry_price - closes[exit_idx]) / entry_price) * 100.0
+    is_sl = move_pct <= -params.stop_loss_pct
+    is_tp = ~is_sl & (move_pct >= params.take_profit_pct)
+    exit_price = np.where(
+        is_sl,
+        entry_price * (1.0 + params.stop_loss_pct / 100.0),
+        np.where(is_tp, entry_price * (1.0 - params.take_profit_pct / 100.0), closes[exit_idx]),
+    )
+    realized = np.where(is_sl, -params.stop_loss_pct, np.where(is_tp, params.take_profit_pct, move_pct))
+    reason = np.where(is_sl, "Stop Loss", np.where(is_tp, "Take Profit", "Cover Signal")).astype(object)
+
+    # One gather of the entry-bar features; rows with NaN/inf features are dropped.
+    feats = np.column_stack(
+        [
+            ema_spread_pct[entry_idx] if col == "ema_spread_pct" else df[col].to_numpy(dtype=float)[entry_idx]
+            for col in FEATURE_COLUMNS
+        ]
+    )
+    valid = np.isfinite(feats).all(axis=1)
+
+    columns: Dict[str, np.ndarray] = {
+        "entry_idx": entry_idx[valid],
+        "exit_idx": exit_idx[valid],
+        "entry_ts": timestamps[entry_idx[valid]],
+        "exit_ts": timestamps[exit_idx[valid]],
+        EXIT_DAY_COLUMN: day_ids[exit_idx[valid]],
+        "entry_price": entry_price[valid],
+        "exit_price": exit_price[valid],
+        "move_pct": realized[valid],
+        "reason": reason[valid],
+        "is_win": (realized[valid] > 0.0).astype(int),
+    }
+    for j, col in enumerate(FEATURE_COLUMNS):
+        columns[col] = feats[valid, j]
+    return columns
 
-        if in_short:
-            move_pct = ((entry_price - price) / entry_price) * 100.0
-            reason = None
-            exit_price = price
-            realized = move_pct
-            if move_pct <= -params.stop_loss_pct:
-                reason = "Stop Loss"
-                exit_price = entry_price * (1.0 + params.stop_loss_pct / 100.0)
-                realized = -params.stop_loss_pct
-            elif move_pct >= params.take_profit_pct:
-                reason = "Take Profit"
-                exit_price = entry_price * (1.0 - params.take_profit_pct / 100.0)
-                realized = params.take_profit_pct
-            elif sd < 0:
-                reason = "Cover Signal"
-
-            if reason is not None:
-                fv = feats[entry_idx]
-                if np.isfinite(fv).all() and not np.isnan(fv).any():
-                    row = {
-                        "entry_ts": entry_ts,
-                        "exit_ts": ts,
-                        "entry_price": float(entry_price),
-                        "exit_price": float(exit_price),
-                        "move_pct": float(realized),
-                        "reason": reason,
-                        "is_win": int(realized > 0.0),
-                    }
-                    for j, c in enumerate(FEATURE_COLUMNS):
-                        row[c] = float(fv[j])
-                    rows.append(row)
-                in_short = False
-
-    if not rows:
+
+def candidates_to_frame(columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    if len(columns["entry_ts"]) == 0:
         return pd.DataFrame()
-    out = pd.DataFrame(rows)
+    out = pd.DataFrame({col: columns[col] for col in candidate_columns()})
     out["entry_ts"] = pd.to_datetime(out["entry_ts"])
     out["exit_ts"] = pd.to_datetime(out["exit_ts"])
-    return out.sort_values("exit_ts").reset_index(drop=True)
+    # Trades never overlap, so entry order is already exit order.
+    return out
+
+
+def generate_trade_candidates(df: pd.DataFrame, params: Params) -> pd.DataFrame:
+    return candidates_to_frame(build_trade_candidates_columnar(df, params))
 
 
 def simulate_filtered_trades(candidates_df: pd.DataFrame, params: Params, initial_capital: float, threshold: float, proba_col: str = "win_proba") -> pd.DataFrame:
@@ -202,7 +263,7 @@ def simulate_filtered_trades(candidates_df: pd.DataFrame, params: Params, initia
         peak = max(peak, capital)
         dd = ((peak - capital) / peak) * 100.0 if peak > 0 else 0.0
         trades.append({
-            "entry_ts": row["entry_ts"], "exit_ts": row["exit_ts"],
+            "entry_ts": row["entry_ts"], "exit_ts": row["exit_ts"], EXIT_DAY_COLUMN: int(row[EXIT_DAY_COLUMN]),
             "entry_price": float(row["entry_price"]), "exit_price": float(row["exit_price"]),
             "move_pct": float(row["move_pct"]), "pnl": float(pnl), "reason": row["reason"],
             "equity_after": float(capital), "drawdown_pct": float(dd), "win_proba": float(row[proba_col]),
@@ -211,42 +272,7 @@ def simulate_filtered_trades(candidates_df: pd.DataFrame, params: Params, initia
 
 
 def compute_metrics(trades_df: pd.DataFrame, initial_capital: float) -> Dict[str, float]:
-    if trades_df.empty:
-        return {"total_trades": 0.0, "win_rate": 0.0, "total_pnl": 0.0, "return_pct": 0.0,
-                "max_drawdown_pct": 0.0, "worst_daily_loss_pct": 0.0, "profit_factor": 0.0,
-                "sharpe_daily_annualized": 0.0, "ftmo_pass": 1.0}
-
-    pnl = trades_df["pnl"].astype(float)
-    wins = pnl[pnl > 0]
-    losses = pnl[pnl < 0]
-    total_pnl = float(pnl.sum())
-
-    temp = trades_df.copy()
-    temp["exit_ts"] = pd.to_datetime(temp["exit_ts"])
-    temp["date"] = temp["exit_ts"].dt.date
-    daily = temp.groupby("date", as_index=False)["pnl"].sum().sort_values("date")
-    daily["daily_loss_pct"] = (daily["pnl"] / initial_capital) * 100.0
-    worst_daily = float(daily["daily_loss_pct"].min()) if not daily.empty else 0.0
-
-    equity_daily = initial_capital + daily["pnl"].cumsum()
-    dr = equity_daily.pct_change().dropna()
-    sharpe = float((dr.mean() / dr.std()) * np.sqrt(252.0)) if (not dr.empty and dr.std() != 0) else 0.0
-
-    gross_win = float(wins.sum()) if not wins.empty else 0.0
-    gross_loss = abs(float(losses.sum())) if not losses.empty else 0.0
-
-    max_dd = float(trades_df["drawdown_pct"].max())
-    return {
-        "total_trades": float(len(trades_df)),
-        "win_rate": float((len(wins) / len(trades_df)) * 100.0),
-        "total_pnl": total_pnl,
-        "return_pct": (total_pnl / initial_capital) * 100.0,
-        "max_drawdown_pct": max_dd,
-        "worst_daily_loss_pct": worst_daily,
-        "profit_factor": (gross_win / gross_loss) if gross_loss > 0 else 0.0,
-        "sharpe_daily_annualized": sharpe,
-        "ftmo_pass": 1.0 if (max_dd <= 10.0 and worst_daily >= -5.0) else 0.0,
-    }
+    return compute_metrics_frame(trades_df, initial_capital)
 
 
 def evaluate_ftmo_rules(trades_df: pd.DataFrame, target_profit_pct: float = 10.0, max_total_dd_pct: float = 10.0, max_daily_dd_pct: float = 3.0, initial_capital: float = 10000.0) -> Tuple[bool, int | None]:
@@ -353,7 +379,26 @@ def param_grid(quick_grid: bool = True) -> List[Params]:
     return out
 
 
-def fit_filter_and_threshold(candidates_df: pd.DataFrame, params: Params, initial_capital: float) -> Tuple[GradientBoostingClassifier | None, float, float, str, float, int | None]:
+FILTER_MODELS = ["gbc", "hist_gb", "logistic", "shallow_gb"]
+
+
+def build_filter_model(name: str) -> BaseEstimator:
+    # gbc is the original exact model; the others are cheaper backends for the search.
+    if name == "gbc":
+        return GradientBoostingClassifier(n_estimators=180, learning_rate=0.05, max_depth=3, random_state=42)
+    if name == "hist_gb":
+        return HistGradientBoostingClassifier(max_iter=180, learning_rate=0.05, max_depth=3, early_stopping=False, random_state=42)
+    if name == "logistic":
+        return make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000))
+    if name == "shallow_gb":
+        return GradientBoostingClassifier(n_estimators=180, learning_rate=0.1, max_depth=2, subsample=0.8, validation_fraction=0.2, n_iter_no_change=10, random_state=42)
+    raise ValueError(f"Unknown filter model: {name}")
+
+
+def fit_filter_and_threshold(candidates_df: pd.DataFrame, params: Params, initial_capital: float, filter_model: str = "gbc", timings: Dict[str, float] | None = None) -> Tuple[BaseEstimator | None, float, float, str, float, int | None]:
+    timings = timings if timings is not None else {}
+    timings.setdefault("fit_seconds", 0.0)
+    timings.setdefault("predict_seconds", 0.0)
     if len(candidates_df) < 80:
         baseline = simulate_filtered_trades(candidates_df, params, initial_capital, 0.0)
         m = compute_metrics(baseline, initial_capital)
@@ -377,9 +422,13 @@ def fit_filter_and_threshold(candidates_df: pd.DataFrame, params: Params, initia
         p, d = ftmo_monte_carlo_probability(baseline, n_paths=250, initial_capital=initial_capital)
         return None, 0.0, score_ftmo_objective(m, p, d), "no_filter", p, d
 
-    model = GradientBoostingClassifier(n_estimators=180, learning_rate=0.05, max_depth=3, random_state=42)
+    model = build_filter_model(filter_model)
+    started = time.perf_counter()
     model.fit(fit_df[FEATURE_COLUMNS].to_numpy(dtype=float), fit_df["is_win"].to_numpy(dtype=int))
+    timings["fit_seconds"] += time.perf_counter() - started
+    started = time.perf_counter()
     val["win_proba"] = model.predict_proba(val[FEATURE_COLUMNS].to_numpy(dtype=float))[:, 1]
+    timings["predict_seconds"] += time.perf_counter() - started
 
     base_trades = simulate_filtered_trades(val, params, initial_capital, 0.0, "win_proba")
     base_metrics = compute_metrics(base_trades, initial_capital)
@@ -399,10 +448,80 @@ def fit_filter_and_threshold(candidates_df: pd.DataFrame, params: Params, initia
         if s > best_score:
             best_score, best_threshold, best_mode, best_prob, best_days = s, float(threshold), "ml_filter", p, d
 
+    started = time.perf_counter()
     model.fit(X, y)
+    timings["fit_seconds"] += time.perf_counter() - started
     return model, best_threshold, float(best_score), best_mode, float(best_prob), best_days
 
 
+@dataclass
+class TrainResult:
+    fold: int
+    params: Params
+    model: BaseEstimator | None
+    threshold: float
+    score: float
+    mode: str
+    train_prob: float
+    train_days: int | None
+    candidates: int
+    seconds: float
+    fit_seconds: float
+    predict_seconds: float
+
+
+def train_task(df: pd.DataFrame, task: Tuple[int, int, int, Params], initial_capital: float, filter_model: str = "gbc") -> TrainResult:
+    fold, train_start, train_end, params = task
+    started = time.perf_counter()
+    candidates = generate_trade_candidates(df.iloc[train_start:train_end], params)
+    timings: Dict[str, float] = {}
+    model, threshold, score, mode, train_prob, train_days = fit_filter_and_threshold(candidates, params, initial_capital, filter_model, timings)
+    return TrainResult(
+        fold, params, model, threshold, score, mode, train_prob, train_days, int(len(candidates)),
+        time.perf_counter() - started, timings["fit_seconds"], timings["predict_seconds"],
+    )
+
+
+def print_task_timing(r: TrainResult) -> None:
+    p = r.params
+    print(f"  fold {r.fold + 1} | EMA({p.fast}/{p.slow}) SL {p.stop_loss_pct}% TP {p.take_profit_pct}% Risk {p.risk_pct}% | {r.candidates} candidates | {r.mode} | {r.seconds:.2f}s")
+
+
+# Per-process state for --workers > 1: the feature frame (or, with --feature-store,
+# just the store path) is sent once per worker and only read.
+_WORKER_DF: pd.DataFrame | None = None
+_WORKER_CAPITAL: float = 0.0
+_WORKER_FILTER_MODEL: str = "gbc"
+
+
+def _init_worker(df: pd.DataFrame | str, initial_capital: float, filter_model: str) -> None:
+    global _WORKER_DF, _WORKER_CAPITAL, _WORKER_FILTER_MODEL
+    _WORKER_DF = open_feature_store(Path(df)) if isinstance(df, str) else df
+    _WORKER_CAPITAL = initial_capital
+    _WORKER_FILTER_MODEL = filter_model
+
+
+def _train_in_worker(task: Tuple[int, int, int, Params]) -> TrainResult:
+    return train_task(_WORKER_DF, task, _WORKER_CAPITAL, _WORKER_FILTER_MODEL)
+
+
+def run_training_tasks(df: pd.DataFrame, tasks: List[Tuple[int, int, int, Params]], initial_capital: float, workers: int = 1, filter_model: str = "gbc") -> List[TrainResult]:
+    # Results keep task order, so per-fold selection matches the serial run for any worker count.
+    if workers <= 1:
+        results = []
+        for task in tasks:
+            r = train_task(df, task, initial_capital, filter_model)
+            print_task_timing(r)
+            results.append(r)
+        return results
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(df.attrs.get(STORE_ATTR, df), initial_capital, filter_model)) as pool:
+        for r in pool.map(_train_in_worker, tasks):
+            print_task_timing(r)
+            results.append(r)
+    return results
+
+
 def monte_carlo_paths(trades_df: pd.DataFrame, initial_capital: float, n_paths: int, n_trades: int, seed: int = 42) -> np.ndarray:
     if trades_df.empty:
         return np.zeros((0, 0))
@@ -433,7 +552,7 @@ def oos_windows(df: pd.DataFrame, train_bars: int, test_bars: int, step_bars: in
     return out
 
 
-def run_walk_forward_ftmo(df: pd.DataFrame, initial_capital: float, train_years: float, test_years: float, step_years: float, max_folds: int, quick_grid: bool) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, Dict, pd.DataFrame]:
+def run_walk_forward_ftmo(df: pd.DataFrame, initial_capital: float, train_years: float, test_years: float, step_years: float, max_folds: int, quick_grid: bool, workers: int = 1, filter_model: str = "gbc") -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, Dict, pd.DataFrame]:
     bpy = int(24 * 365)
     windows = oos_windows(df, int(train_years * bpy), int(test_years * bpy), int(step_years * bpy), max_folds)
     if not windows:
@@ -442,6 +561,15 @@ def run_walk_forward_ftmo(df: pd.DataFrame, initial_capital: float, train_years:
     grid = param_grid(quick_grid=quick_grid)
     print(f"[Track C FTMO] Testing {len(grid)} parameter combinations per fold")
 
+    tasks = [(fold, train_start, train_end, params) for fold, train_start, train_end, _ in windows for params in grid]
+    print(f"[Track C FTMO] Training {len(tasks)} (fold, params) tasks with {max(workers, 1)} worker(s)")
+    train_started = time.perf_counter()
+    train_results = run_training_tasks(df, tasks, initial_capital, workers=workers, filter_model=filter_model)
+    train_wall_seconds = time.perf_counter() - train_started
+    results_by_fold: Dict[int, List[TrainResult]] = {}
+    for r in train_results:
+        results_by_fold.setdefault(r.fold, []).append(r)
+
     fold_rows: List[Dict] = []
     oos_trades_all: List[pd.DataFrame] = []
     oos_candidates_all: List[pd.DataFrame] = []
@@ -451,8 +579,8 @@ def run_walk_forward_ftmo(df: pd.DataFrame, initial_capital: float, train_years:
     best_global_score = -1e18
 
     for fold, train_start, train_end, test_end in windows:
-        train_df = df.iloc[train_start:train_end].copy()
-        test_df = df.iloc[train_end:test_end].copy()
+        train_df = df.iloc[train_start:train_end]
+        test_df = df.iloc[train_end:test_end]
         print(f"[Track C FTMO] Fold {fold + 1}/{len(windows)} | train bars={len(train_df):,} | test bars={len(test_df):,}")
 
         best_params = None
@@ -462,20 +590,18 @@ def run_walk_forward_ftmo(df: pd.DataFrame, initial_capital: float, train_years:
         best_score = -1e18
         best_train_prob = 0.0
         best_train_days = None
-
-        for idx, params in enumerate(grid):
-            train_candidates = generate_trade_candidates(train_df, params)
-            model, threshold, score, mode, train_prob, train_days = fit_filter_and_threshold(train_candidates, params, initial_capital)
-            if score > best_score:
-                best_score = score
-                best_params = params
-                best_model = model
-                best_threshold = threshold
-                best_mode = mode
-                best_train_prob = train_prob
-                best_train_days = train_days
-            if (idx + 1) % max(1, len(grid) // 4) == 0:
-                print(f"  progress: {idx + 1}/{len(grid)}")
+        test_predict_seconds = 0.0
+
+        fold_results = results_by_fold.get(fold, [])
+        for r in fold_results:
+            if r.score > best_score:
+                best_score = r.score
+                best_params = r.params
+                best_model = r.model
+                best_threshold = r.threshold
+                best_mode = r.mode
+                best_train_prob = r.train_prob
+                best_train_days = r.train_days
 
         if best_params is None:
             continue
@@ -484,7 +610,9 @@ def run_walk_forward_ftmo(df: pd.DataFrame, initial_capital: float, train_years:
         if not test_candidates.empty:
             test_candidates = test_candidates.copy()
             if best_model is not None and best_mode == "ml_filter":
+                started = time.perf_counter()
                 test_candidates["win_proba"] = best_model.predict_proba(test_candidates[FEATURE_COLUMNS].to_numpy(dtype=float))[:, 1]
+                test_predict_seconds = time.perf_counter() - started
             else:
                 test_candidates["win_proba"] = 1.0
             test_candidates["fold"] = fold
@@ -519,6 +647,9 @@ def run_walk_forward_ftmo(df: pd.DataFrame, initial_capital: float, train_years:
             "train_ftmo_score": best_score,
             "train_ftmo_pass_probability_pct": best_train_prob,
             "train_ftmo_median_days_to_pass": best_train_days,
+            "train_task_seconds": float(sum(r.seconds for r in fold_results)),
+            "filter_fit_seconds": float(sum(r.fit_seconds for r in fold_results)),
+            "filter_predict_seconds": float(sum(r.predict_seconds for r in fold_results) + test_predict_seconds),
             "test_trades": int(test_metrics["total_trades"]),
             "test_candidates": int(len(test_candidates)) if not test_candidates.empty else 0,
             "accept_rate_pct": (int(test_metrics["total_trades"]) / int(len(test_candidates)) * 100.0) if not test_candidates.empty else 0.0,
@@ -568,6 +699,17 @@ def run_walk_forward_ftmo(df: pd.DataFrame, initial_capital: float, train_years:
         "accept_rate_pct": float((len(oos_trades_df) / len(oos_candidates_df) * 100.0) if len(oos_candidates_df) > 0 else 0.0),
         "ml_filter_folds": int((folds_df["filter_mode"] == "ml_filter").sum()) if not folds_df.empty else 0,
         "no_filter_folds": int((folds_df["filter_mode"] == "no_filter").sum()) if not folds_df.empty else 0,
+        "workers": int(max(workers, 1)),
+        "feature_store": df.attrs.get(STORE_ATTR),
+        "filter_model": filter_model,
+        "filter_fit_seconds": float(folds_df["filter_fit_seconds"].sum()) if not folds_df.empty else 0.0,
+        "filter_predict_seconds": float(folds_df["filter_predict_seconds"].sum()) if not folds_df.empty else 0.0,
+        "filter_timing_by_fold": [
+            {"fold": int(r["fold"]), "fit_seconds": float(r["filter_fit_seconds"]), "predict_seconds": float(r["filter_predict_seconds"])}
+            for _, r in folds_df.iterrows()
+        ],
+        "train_wall_seconds": float(train_wall_seconds),
+        "train_task_seconds": float(sum(r.seconds for r in train_results)),
     }
     return folds_df, oos_trades_df, oos_candidates_df, summary, feat_imp_df
 
@@ -695,6 +837,9 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--mc-paths", type=int, default=1000, help="Monte Carlo paths")
     parser.add_argument("--ftmo-mc-paths", type=int, default=2000, help="Monte Carlo paths for FTMO pass probability")
     parser.add_argument("--full-grid", action="store_true", help="Use full parameter grid")
+    parser.add_argument("--workers", type=int, default=1, help="Processes for (fold, params) model training")
+    parser.add_argument("--filter-model", choices=FILTER_MODELS, default="gbc", help="Trade filter classifier (gbc is the original; others are faster)")
+    parser.add_argument("--feature-store", type=Path, default=None, help="Directory of memory-mapped feature columns (built from --data on first use)")
     return parser.parse_args()
 
 
@@ -711,11 +856,21 @@ def main() -> None:
     if not data_path.exists():
         raise FileNotFoundError(f"Data file not found: {data_path}")
 
-    df = compute_features(load_data(data_path))
+    if args.feature_store is not None:
+        df = load_or_build_feature_store(
+            args.feature_store,
+            data_path,
+            lambda p: compute_features(load_data(p)),
+            code=(load_data, compute_features),
+            columns=FEATURE_COLUMNS,
+        )
+    else:
+        df = compute_features(load_data(data_path))
 
     folds_df, oos_trades_df, oos_candidates_df, summary, feat_imp_df = run_walk_forward_ftmo(
         df, initial_capital=args.initial_capital, train_years=args.train_years, test_years=args.test_years,
-        step_years=args.step_years, max_folds=args.max_folds, quick_grid=not args.full_grid,
+        step_years=args.step_years, max_folds=args.max_folds, quick_grid=not args.full_grid, workers=args.workers,
+        filter_model=args.filter_model,
     )
 
     paths = monte_carlo_paths(oos_trades_df, args.initial_capital, args.mc_paths, max(int(len(oos_trades_df)), 1))
@@ -763,6 +918,7 @@ def main() -> None:
         f"OOS candidates: {summary['candidate_count']}",
         f"OOS accepted trades: {summary['accept_count']} ({summary['accept_rate_pct']:.2f}%)",
         f"Fold filter modes: ML={summary['ml_filter_folds']} | No-filter={summary['no_filter_folds']}",
+        f"Filter model: {summary['filter_model']} | fit {summary['filter_fit_seconds']:.1f}s | predict {summary['filter_predict_seconds']:.2f}s",
         f"OOS Sharpe: {summary['oos_sharpe_daily_annualized']:.3f}",
         f"OOS return: {summary['oos_return_pct']:.2f}%",
         f"OOS max drawdown: {summary['oos_max_drawdown_pct']:.2f}%",
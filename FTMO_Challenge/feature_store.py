@@ -0,0 +1,152 @@
+"""
+Columnar, memory-mapped feature store for the short ML walk-forward scripts.
+
+Both short ML scripts used to run load_data + compute_features at startup
+and hand each worker process its own pickled copy of the feature frame.
+This module writes the computed frame once, one .npy file per column
+(timestamps as naive datetime64, OHLCV, every feature), plus a manifest:
+
+    <store_dir>/manifest.json
+    <store_dir>/<column>.npy
+
+open_feature_store() maps the arrays read-only (np.load(mmap_mode="r")) and
+builds a DataFrame directly on top of them. Row slices (df.iloc[a:b]) are
+views, and every process that opens the same store shares one copy of the
+data in the OS page cache.
+
+The manifest records the source CSV's size and mtime, a hash of the
+builder functions' source (load_data, compute_features) and the caller's
+feature column list. A store is rebuilt when any of those changes or a
+column file is missing, so editing a feature formula never reuses stale
+columns.
+
+Scripts import it by adding FTMO_Challenge/ to sys.path.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+STORE_VERSION = 2
+MANIFEST_NAME = "manifest.json"
+# DataFrame.attrs key carrying the store directory, so worker pools can reopen it.
+STORE_ATTR = "feature_store"
+
+
+def source_fingerprint(source: Path) -> Dict[str, int | str]:
+    stat = source.stat()
+    return {"path": str(source.resolve()), "size": int(stat.st_size), "mtime_ns": int(stat.st_mtime_ns)}
+
+
+def builder_fingerprint(code: Sequence[Callable], columns: Sequence[str]) -> Dict[str, str | List[str]]:
+    """Hash of the functions that compute the store plus the feature column list the caller uses."""
+    h = hashlib.sha256()
+    for func in code:
+        try:
+            text = inspect.getsource(func)
+        except (OSError, TypeError):
+            # No source available (e.g. a builtin): fall back to the compiled code.
+            text = getattr(getattr(func, "__code__", None), "co_code", b"").hex() or repr(func)
+        h.update(f"{getattr(func, '__qualname__', repr(func))}\n{text}\n".encode())
+    return {"code_sha256": h.hexdigest(), "columns": [str(c) for c in columns]}
+
+
+def write_feature_store(
+    df: pd.DataFrame,
+    store_dir: Path,
+    source: Path,
+    builder: Dict[str, str | List[str]] | None = None,
+) -> Path:
+    """Write every column of df as <column>.npy plus the manifest; returns the manifest path."""
+    store_dir.mkdir(parents=True, exist_ok=True)
+    columns: List[Dict[str, str]] = []
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if values.dtype == object:
+            raise ValueError(f"Column {col!r} is not numeric and cannot be memory-mapped.")
+        np.save(store_dir / f"{col}.npy", np.ascontiguousarray(values))
+        columns.append({"name": str(col), "dtype": str(values.dtype)})
+
+    manifest = {
+        "version": STORE_VERSION,
+        "rows": int(len(df)),
+        "columns": columns,
+        "source": source_fingerprint(source),
+        "builder": builder,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    manifest_path = store_dir / MANIFEST_NAME
+    tmp = manifest_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2))
+    # Manifest last: a half-written store never looks valid.
+    tmp.replace(manifest_path)
+    return manifest_path
+
+
+def read_manifest(store_dir: Path) -> Dict | None:
+    path = store_dir / MANIFEST_NAME
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text())
+    except json.JSONDecodeError:
+        return None
+
+
+def is_store_current(store_dir: Path, source: Path, builder: Dict[str, str | List[str]] | None = None) -> bool:
+    manifest = read_manifest(store_dir)
+    if manifest is None or manifest.get("version") != STORE_VERSION:
+        return False
+    if manifest.get("source") != source_fingerprint(source):
+        return False
+    if manifest.get("builder") != builder:
+        return False
+    names = [c["name"] for c in manifest["columns"]]
+    return all((store_dir / f"{name}.npy").exists() for name in names)
+
+
+def open_feature_store(store_dir: Path) -> pd.DataFrame:
+    """Read-only DataFrame backed by the store's memory-mapped columns."""
+    manifest = read_manifest(store_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No feature store manifest in: {store_dir}")
+
+    arrays = {}
+    for col in manifest["columns"]:
+        arr = np.load(store_dir / f"{col['name']}.npy", mmap_mode="r")
+        if len(arr) != manifest["rows"]:
+            raise ValueError(f"Feature store column {col['name']!r} has {len(arr)} rows, expected {manifest['rows']}")
+        arrays[col["name"]] = arr
+
+    df = pd.DataFrame(arrays, copy=False)
+    df.attrs[STORE_ATTR] = str(store_dir.resolve())
+    return df
+
+
+def load_or_build_feature_store(
+    store_dir: Path,
+    source: Path,
+    build: Callable[[Path], pd.DataFrame],
+    code: Sequence[Callable] = (),
+    columns: Sequence[str] = (),
+) -> pd.DataFrame:
+    """
+    Open the store, first (re)building it with build(source) if it is missing or stale.
+
+    code lists the functions build runs (their source is hashed) and columns
+    the caller's feature column list; changing either forces a rebuild.
+    """
+    builder = builder_fingerprint(code, columns)
+    if not is_store_current(store_dir, source, builder):
+        print(f"[Feature store] Building {store_dir} from {source}")
+        write_feature_store(build(source), store_dir, source, builder)
+    return open_feature_store(store_dir)
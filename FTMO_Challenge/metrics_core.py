@@ -0,0 +1,158 @@
+"""
+Array-based FTMO metrics core shared by the long and short track scripts.
+
+The per-track compute_metrics functions used to copy the trades DataFrame,
+parse timestamps and groupby calendar date on every call just to get the
+worst daily loss. Inside grid searches that runs thousands of times.
+
+This module works on plain numpy arrays instead:
+- encode_day_ids() turns timestamps into int64 days since epoch. Scripts
+  call it once per dataset when loading bars (DAY_ID_COLUMN), and backtests
+  copy the exit bar's value into each trade (EXIT_DAY_COLUMN), so no
+  timestamps are parsed per grid point.
+- compute_metrics_arrays() aggregates daily P&L with np.bincount and returns
+  the same dict keys as the existing compute_metrics variants.
+
+Scripts import it by adding FTMO_Challenge/ to sys.path.
+"""
+
+from __future__ import annotations
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+
+SHARPE_ANNUALIZATION_DAYS = 252.0
+MAX_DRAWDOWN_LIMIT_PCT = 10.0
+DAILY_LOSS_LIMIT_PCT = -5.0
+
+# Per-bar day ID column added once per dataset, and its per-trade copy at the exit bar.
+DAY_ID_COLUMN = "day_id"
+EXIT_DAY_COLUMN = "exit_day"
+
+
+def encode_day_ids(timestamps) -> np.ndarray:
+    """Calendar day of each timestamp as int64 days since 1970-01-01 (wall-clock date)."""
+    if isinstance(timestamps, pd.Series):
+        if isinstance(timestamps.dtype, pd.DatetimeTZDtype):
+            timestamps = timestamps.dt.tz_localize(None)
+        values = timestamps.to_numpy(dtype="datetime64[ns]")
+    else:
+        values = np.asarray(timestamps, dtype="datetime64[ns]")
+    return values.astype("datetime64[D]").astype(np.int64)
+
+
+def daily_pnl(day_ids: np.ndarray, pnl: np.ndarray) -> np.ndarray:
+    """Summed P&L per traded day, in day order (days without trades are dropped)."""
+    if pnl.size == 0:
+        return np.zeros(0, dtype=float)
+    offsets = day_ids - day_ids.min()
+    counts = np.bincount(offsets)
+    sums = np.bincount(offsets, weights=pnl)
+    return sums[counts > 0]
+
+
+def drawdown_pct_from_pnl(pnl: np.ndarray, initial_capital: float) -> np.ndarray:
+    equity = initial_capital + np.cumsum(pnl)
+    peak = np.maximum.accumulate(np.maximum(equity, initial_capital))
+    return np.where(peak > 0, (peak - equity) / peak * 100.0, 0.0)
+
+
+def sharpe_from_daily(daily: np.ndarray, initial_capital: float) -> float:
+    # Mirrors pandas: pct_change of daily equity, sample std (ddof=1).
+    if daily.size < 2:
+        return 0.0
+    equity = initial_capital + np.cumsum(daily)
+    returns = equity[1:] / equity[:-1] - 1.0
+    if returns.size < 2:
+        return float("nan")
+    sd = float(returns.std(ddof=1))
+    if sd == 0:
+        return 0.0
+    return float(returns.mean() / sd * np.sqrt(SHARPE_ANNUALIZATION_DAYS))
+
+
+def compute_metrics_arrays(
+    pnl: np.ndarray,
+    day_ids: np.ndarray,
+    initial_capital: float,
+    drawdown_pct: np.ndarray | None = None,
+) -> Dict[str, float]:
+    """
+    FTMO metrics from per-trade P&L (in exit order) and exit day IDs.
+
+    Returns the short-track compute_metrics keys; long-track wrappers cast
+    total_trades/ftmo_pass back to int/bool. If drawdown_pct is omitted it is
+    rebuilt from the cumulative P&L.
+    """
+    n = int(pnl.size)
+    if n == 0:
+        return {
+            "total_trades": 0.0,
+            "win_rate": 0.0,
+            "total_pnl": 0.0,
+            "return_pct": 0.0,
+            "max_drawdown_pct": 0.0,
+            "worst_daily_loss_pct": 0.0,
+            "profit_factor": 0.0,
+            "sharpe_daily_annualized": 0.0,
+            "ftmo_pass": 1.0,
+        }
+
+    total_pnl = float(pnl.sum())
+    win_mask = pnl > 0
+    gross_win = float(pnl[win_mask].sum())
+    gross_loss = abs(float(pnl[pnl < 0].sum()))
+
+    if drawdown_pct is None:
+        drawdown_pct = drawdown_pct_from_pnl(pnl, initial_capital)
+    max_drawdown_pct = float(drawdown_pct.max())
+
+    daily = daily_pnl(day_ids, pnl)
+    worst_daily_loss_pct = float(daily.min() / initial_capital * 100.0)
+
+    ftmo_pass = max_drawdown_pct <= MAX_DRAWDOWN_LIMIT_PCT and worst_daily_loss_pct >= DAILY_LOSS_LIMIT_PCT
+
+    return {
+        "total_trades": float(n),
+        "win_rate": float(win_mask.sum() / n * 100.0),
+        "total_pnl": total_pnl,
+        "return_pct": total_pnl / initial_capital * 100.0,
+        "max_drawdown_pct": max_drawdown_pct,
+        "worst_daily_loss_pct": worst_daily_loss_pct,
+        "profit_factor": (gross_win / gross_loss) if gross_loss > 0 else 0.0,
+        "sharpe_daily_annualized": sharpe_from_daily(daily, initial_capital),
+        "ftmo_pass": 1.0 if ftmo_pass else 0.0,
+    }
+
+
+def trade_day_ids(trades_df: pd.DataFrame) -> np.ndarray:
+    """
+    Exit day ID of each trade.
+
+    Backtest trades carry the pre-encoded EXIT_DAY_COLUMN; only frames without
+    it (trade reports read back from CSV) fall back to parsing exit_ts.
+    """
+    if EXIT_DAY_COLUMN in trades_df.columns:
+        return trades_df[EXIT_DAY_COLUMN].to_numpy(dtype=np.int64)
+    return encode_day_ids(pd.to_datetime(trades_df["exit_ts"]))
+
+
+def compute_metrics_frame(
+    trades_df: pd.DataFrame,
+    initial_capital: float,
+    day_ids: np.ndarray | None = None,
+) -> Dict[str, float]:
+    """compute_metrics_arrays for a trades frame with pnl, exit day (see trade_day_ids) and drawdown_pct columns."""
+    if trades_df.empty:
+        return compute_metrics_arrays(np.zeros(0), np.zeros(0, dtype=np.int64), initial_capital)
+
+    drawdown = trades_df["drawdown_pct"].to_numpy(dtype=float) if "drawdown_pct" in trades_df.columns else None
+    return compute_metrics_arrays(
+        trades_df["pnl"].to_numpy(dtype=float),
+        trade_day_ids(trades_df) if day_ids is None else day_ids,
+        initial_capital,
+        drawdown_pct=drawdown,
+    )
@@ -0,0 +1,156 @@
+"""
+Local rolling OHLCV bar store for the Track D runner.
+
+Each cycle used to download the whole `trading.bars_count` window (or a 60d
+Yahoo range) just to read the last two EMA values. The store keeps the bars
+already seen in SQLite, keyed by (source, symbol, timeframe), so a cycle only
+asks its provider for bars from the last stored timestamp onwards. The last
+stored bar is re-requested and overwritten, which picks up revisions to a bar
+that was still forming. The full window is then read back from the store.
+
+Bars from different sources are never mixed (a GLD proxy from Alpha Vantage
+is not XAUUSD spot), so a provider fail-over does its own first fill.
+
+Output:
+- state/track_d_bars.sqlite (created at runtime)
+"""
+
+from __future__ import annotations
+
+import math
+import sqlite3
+import time
+from pathlib import Path
+
+import pandas as pd
+
+
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def bar_store_path(base_dir: Path) -> Path:
+    return base_dir / "state" / "track_d_bars.sqlite"
+
+
+class BarStore:
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS bars (
+                source TEXT NOT NULL,
+                symbol TEXT NOT NULL,
+                timeframe TEXT NOT NULL,
+                ts INTEGER NOT NULL,
+                open REAL,
+                high REAL,
+                low REAL,
+                close REAL NOT NULL,
+                volume REAL,
+                PRIMARY KEY (source, symbol, timeframe, ts)
+            )
+            """
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def stats(self, source: str, symbol: str, timeframe: str) -> tuple[int, int | None]:
+        """(stored bar count, last bar epoch seconds or None)."""
+        count, last_ts = self.conn.execute(
+            "SELECT COUNT(*), MAX(ts) FROM bars WHERE source = ? AND symbol = ? AND timeframe = ?",
+            (source, symbol, timeframe),
+        ).fetchone()
+        return int(count), (int(last_ts) if last_ts is not None else None)
+
+    def resume_from(
+        self,
+        source: str,
+        symbol: str,
+        timeframe: str,
+        bars_count: int,
+        bar_seconds: int,
+        now: float | None = None,
+    ) -> int | None:
+        """
+        Timestamp to fetch from for an incremental update, or None for a full fill.
+
+        A full fill is needed when the store holds fewer than bars_count bars,
+        or when the last bar is so old that the gap would not fit in one window.
+        """
+        count, last_ts = self.stats(source, symbol, timeframe)
+        if last_ts is None or count < bars_count:
+            return None
+        now = time.time() if now is None else now
+        if now - last_ts >= bars_count * bar_seconds:
+            return None
+        return last_ts
+
+    def merge(self, source: str, symbol: str, timeframe: str, frame: pd.DataFrame, bar_seconds: int | None = None) -> int:
+        """
+        Insert new bars and overwrite revised ones; returns the number of rows written.
+
+        With bar_seconds, timestamps are floored to the bar grid and only the
+        newest row per bar is kept: a provider's live row stamped at the last
+        trade time (Yahoo's 09:37 on H1) then overwrites the 09:00 bar instead
+        of being stored as an extra bar next to it.
+        """
+        if frame.empty:
+            return 0
+        # Unit-agnostic epoch seconds (pandas may hold datetimes as ns or us).
+        ts = (pd.to_datetime(frame["timestamp"], utc=True) - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)
+        values = frame.reindex(columns=BAR_COLUMNS).astype(float)
+        latest: dict[int, tuple[int, tuple[float, ...]]] = {}
+        for t, row in zip(ts.tolist(), values.itertuples(index=False, name=None)):
+            t = int(t)
+            key = t - t % int(bar_seconds) if bar_seconds else t
+            if key not in latest or t >= latest[key][0]:
+                latest[key] = (t, row)
+        rows = [
+            (source, symbol, timeframe, key, *(None if math.isnan(v) else float(v) for v in row))
+            for key, (_, row) in sorted(latest.items())
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO bars (source, symbol, timeframe, ts, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def trim(self, source: str, symbol: str, timeframe: str, keep_bars: int) -> None:
+        """Drop all but the newest keep_bars bars for this key."""
+        with self.conn:
+            self.conn.execute(
+                """
+                DELETE FROM bars
+                WHERE source = ? AND symbol = ? AND timeframe = ? AND ts < (
+                    SELECT MIN(ts) FROM (
+                        SELECT ts FROM bars
+                        WHERE source = ? AND symbol = ? AND timeframe = ?
+                        ORDER BY ts DESC LIMIT ?
+                    )
+                )
+                """,
+                (source, symbol, timeframe, source, symbol, timeframe, int(keep_bars)),
+            )
+
+    def window(self, source: str, symbol: str, timeframe: str, bars_count: int) -> pd.DataFrame:
+        """Newest bars_count bars in ascending time order, in the fetchers' frame layout."""
+        rows = self.conn.execute(
+            """
+            SELECT ts, open, high, low, close, volume FROM bars
+            WHERE source = ? AND symbol = ? AND timeframe = ?
+            ORDER BY ts DESC LIMIT ?
+            """,
+            (source, symbol, timeframe, int(bars_count)),
+        ).fetchall()
+        rows.reverse()
+        frame = pd.DataFrame(rows, columns=["ts"] + BAR_COLUMNS)
+        frame.insert(0, "timestamp", pd.to_datetime(frame.pop("ts"), unit="s", utc=True))
+        for column in BAR_COLUMNS:
+            frame[column] = pd.to_numeric(frame[column], errors="coerce")
+        return frame
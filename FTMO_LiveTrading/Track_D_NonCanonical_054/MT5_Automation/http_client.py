@@ -0,0 +1,295 @@
+"""
+Pooled keep-alive HTTP client for the Track D runner.
+
+Every provider fetch and Telegram message used to build a fresh
+urllib Request and call urlopen, which pays a TCP + TLS handshake per call.
+HttpClient keeps idle http.client connections per (scheme, host, port) and
+reuses them, so in --daemon mode most requests go out on an already open
+connection. It also gives all call sites:
+
+- one browser-like header block plus Accept-Encoding: gzip
+- a default timeout and RetryPolicy, overridable per request
+- timing hooks: callables receiving one record per attempt
+
+A connection the server closed while idle is detected on reuse and the
+request is replayed once on a fresh connection (not counted as a retry).
+HTTPS(_)PROXY environment variables are honoured through CONNECT tunnels,
+like urlopen did. The pool is shared by the hedged provider threads, so
+checkout/checkin is locked; a connection is only used by one thread at a time.
+"""
+
+from __future__ import annotations
+
+import gzip
+import http.client
+import json
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Callable
+from urllib.parse import urlencode, urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/126.0.0.0 Safari/537.36"
+    ),
+    "Accept": "application/json,text/plain,*/*",
+    "Accept-Encoding": "gzip",
+    "Connection": "keep-alive",
+}
+
+# Idle connections kept per host; hedged fetches rarely hit one host twice at once.
+MAX_IDLE_PER_HOST = 4
+
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+
+class HttpStatusError(RuntimeError):
+    """Non-2xx response; code mirrors urllib's HTTPError.code."""
+
+    def __init__(self, code: int, reason: str, url: str, body: bytes = b"") -> None:
+        super().__init__(f"HTTP Error {code}: {reason} ({url})")
+        self.code = code
+        self.reason = reason
+        self.body = body
+
+
+class HttpTransportError(RuntimeError):
+    """Connection, TLS or timeout failure after all retries."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    # Total attempts per request; waits backoff_seconds * attempt number between them.
+    attempts: int = 2
+    backoff_seconds: float = 1.0
+    # 429 is left to the caller's rate limiter rather than retried blindly.
+    retry_statuses: frozenset[int] = field(default_factory=lambda: frozenset({500, 502, 503, 504}))
+    retry_transport_errors: bool = True
+
+
+NO_RETRY = RetryPolicy(attempts=1)
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    elapsed: float
+    reused: bool
+
+    def text(self) -> str:
+        return self.body.decode("utf-8")
+
+    def json(self) -> Any:
+        return json.loads(self.body.decode("utf-8"))
+
+
+def redacted_url(url: str) -> str:
+    """scheme://host/path without the query, which carries API keys and tokens."""
+    parts = urlsplit(url)
+    path = parts.path
+    # Telegram puts the bot token in the path.
+    if parts.hostname == "api.telegram.org" and path.startswith("/bot"):
+        path = "/bot***/" + path.rsplit("/", 1)[-1]
+    return f"{parts.scheme}://{parts.netloc}{path}"
+
+
+def decode_body(body: bytes, encoding: str | None) -> bytes:
+    encoding = (encoding or "").lower()
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        return zlib.decompress(body)
+    return body
+
+
+class HttpClient:
+    def __init__(self, timeout: float = 15.0, retry: RetryPolicy | None = None) -> None:
+        self.timeout = timeout
+        self.retry = retry or RetryPolicy()
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._hooks: list[Callable[[dict[str, Any]], None]] = []
+
+    def add_hook(self, hook: Callable[[dict[str, Any]], None]) -> None:
+        """Register hook(record) called after every attempt (method, url, status, elapsed, reused, error...)."""
+        with self._lock:
+            self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[dict[str, Any]], None]) -> None:
+        with self._lock:
+            if hook in self._hooks:
+                self._hooks.remove(hook)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+    def _new_connection(self, scheme: str, host: str, port: int, timeout: float) -> http.client.HTTPConnection:
+        connection_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        proxy = getproxies().get(scheme)
+        if proxy and not proxy_bypass(host):
+            proxy_parts = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+            conn = connection_cls(proxy_parts.hostname, proxy_parts.port or 8080, timeout=timeout)
+            conn.set_tunnel(host, port)
+            return conn
+        return connection_cls(host, port, timeout=timeout)
+
+    def _checkout(self, key: tuple[str, str, int], timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+        if conn is None:
+            return self._new_connection(*key, timeout=timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def _checkin(self, key: tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < MAX_IDLE_PER_HOST:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _emit(self, record: dict[str, Any]) -> None:
+        with self._lock:
+            hooks = list(self._hooks)
+        for hook in hooks:
+            try:
+                hook(record)
+            except Exception:
+                pass
+
+    def _send_once(
+        self,
+        method: str,
+        key: tuple[str, str, int],
+        target: str,
+        body: bytes | None,
+        headers: dict[str, str],
+        timeout: float,
+    ) -> HttpResponse:
+        conn, reused = self._checkout(key, timeout)
+        started = time.monotonic()
+        try:
+            try:
+                conn.request(method, target, body=body, headers=headers)
+                response = conn.getresponse()
+            except STALE_CONNECTION_ERRORS:
+                if not reused:
+                    raise
+                # The server dropped the idle connection; replay once on a fresh one.
+                conn.close()
+                conn, reused = self._new_connection(*key, timeout=timeout), False
+                started = time.monotonic()
+                conn.request(method, target, body=body, headers=headers)
+                response = conn.getresponse()
+            raw = response.read()
+        except BaseException:
+            conn.close()
+            raise
+
+        response_headers = {name.lower(): value for name, value in response.getheaders()}
+        if response.will_close:
+            conn.close()
+        else:
+            self._checkin(key, conn)
+        return HttpResponse(
+            status=response.status,
+            headers=response_headers,
+            body=decode_body(raw, response_headers.get("content-encoding")),
+            elapsed=time.monotonic() - started,
+            reused=reused,
+        )
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+        retry: RetryPolicy | None = None,
+    ) -> HttpResponse:
+        """Send one request with the retry policy; raises HttpStatusError or HttpTransportError."""
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in {"http", "https"} or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {redacted_url(url)}")
+        key = (scheme, parts.hostname, parts.port or (443 if scheme == "https" else 80))
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        merged_headers = {**DEFAULT_HEADERS, **(headers or {})}
+        timeout = self.timeout if timeout is None else timeout
+        retry = retry or self.retry
+
+        for attempt in range(1, max(1, retry.attempts) + 1):
+            record: dict[str, Any] = {"method": method, "url": redacted_url(url), "attempt": attempt}
+            started = time.monotonic()
+            try:
+                response = self._send_once(method, key, target, body, merged_headers, timeout)
+            except (OSError, http.client.HTTPException) as exc:
+                record.update({"status": None, "elapsed": time.monotonic() - started, "reused": False, "error": str(exc)})
+                self._emit(record)
+                if retry.retry_transport_errors and attempt < retry.attempts:
+                    time.sleep(retry.backoff_seconds * attempt)
+                    continue
+                raise HttpTransportError(f"{method} {redacted_url(url)} failed: {exc}") from exc
+
+            record.update(
+                {
+                    "status": response.status,
+                    "elapsed": response.elapsed,
+                    "reused": response.reused,
+                    "bytes": len(response.body),
+                }
+            )
+            self._emit(record)
+            if 200 <= response.status < 300:
+                return response
+            if response.status in retry.retry_statuses and attempt < retry.attempts:
+                time.sleep(retry.backoff_seconds * attempt)
+                continue
+            raise HttpStatusError(response.status, http.client.responses.get(response.status, ""), redacted_url(url), response.body)
+
+        raise HttpTransportError(f"{method} {redacted_url(url)} failed without a response")
+
+    def get_json(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+        retry: RetryPolicy | None = None,
+    ) -> Any:
+        return self.request("GET", url, headers=headers, timeout=timeout, retry=retry).json()
+
+    def post_form(
+        self,
+        url: str,
+        fields: dict[str, Any],
+        timeout: float | None = None,
+        retry: RetryPolicy | None = None,
+    ) -> str:
+        body = urlencode(fields).encode("utf-8")
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        return self.request("POST", url, body=body, headers=headers, timeout=timeout, retry=retry).text()
@@ -0,0 +1,404 @@
+"""
+Rotating, indexed journal for the Track D runner.
+
+The cycle journal used to be a single state/track_d_mt5_journal.jsonl that
+grew forever, and any question about a past run meant parsing all of it.
+JournalStore writes the same one-JSON-object-per-line records into segments:
+
+    state/journal/manifest.json
+    state/journal/journal-YYYYMMDD-NNN.jsonl       (active segment)
+    state/journal/journal-YYYYMMDD-NNN.jsonl.gz    (closed, compressed)
+    state/journal/journal-YYYYMMDD-NNN.idx.jsonl   (sidecar index)
+
+A new segment starts on a new UTC day or once the active one reaches
+max_segment_bytes. Closed segments are gzip-compressed when compress_closed
+is set. Each index line holds the record's epoch timestamp, its byte offset
+and length in the uncompressed segment, its action types and an error flag,
+and the manifest keeps each segment's first/last timestamp, action types
+and error count. query() skips segments that cannot match, filters on the
+index lines, and decodes only the matching records.
+
+The old single-file journal is imported once, the first time the store opens.
+Query from the shell with query_journal.py.
+
+Several processes append to the same journal (a --monitor process next to
+one-shot cycles), so append, rotation, crash recovery and the legacy import
+run under an exclusive lock on journal.lock, and each re-reads the manifest
+before changing it. A store opened with read_only=True (queries) never takes
+the lock and never writes: no recovery, no import.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+
+JOURNAL_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = "journal.lock"
+LEGACY_JOURNAL_NAME = "track_d_mt5_journal.jsonl"
+
+
+def journal_dir(base_dir: Path) -> Path:
+    return base_dir / "state" / "journal"
+
+
+def legacy_journal_path(base_dir: Path) -> Path:
+    return base_dir / "state" / LEGACY_JOURNAL_NAME
+
+
+def record_epoch(payload: dict[str, Any]) -> int:
+    """Epoch seconds of a journal record (its run_utc), or now when it has none."""
+    run_utc = payload.get("run_utc")
+    if run_utc:
+        try:
+            parsed = datetime.fromisoformat(str(run_utc).replace("Z", "+00:00"))
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return int(parsed.timestamp())
+        except ValueError:
+            pass
+    return int(datetime.now(timezone.utc).timestamp())
+
+
+@contextmanager
+def exclusive_lock(path: Path) -> Iterator[None]:
+    """Blocking inter-process lock held for the duration of the with block."""
+    with path.open("a+b") as handle:
+        if sys.platform == "win32":
+            import msvcrt
+
+            handle.seek(0)
+            while True:
+                try:
+                    # LK_LOCK retries for ~10s and then raises; keep waiting.
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def index_entry(payload: dict[str, Any], offset: int, length: int) -> dict[str, Any]:
+    return {
+        "ts": record_epoch(payload),
+        "offset": offset,
+        "length": length,
+        "actions": [str(action.get("type")) for action in payload.get("actions") or [] if isinstance(action, dict)],
+        "error": bool(payload.get("error"))
+        or payload.get("api_status") == "error"
+        or payload.get("bot_status") == "running_with_errors",
+    }
+
+
+class JournalStore:
+    def __init__(
+        self,
+        directory: Path,
+        max_segment_bytes: int = 5_000_000,
+        rotate_daily: bool = True,
+        compress_closed: bool = True,
+        read_only: bool = False,
+    ) -> None:
+        self.directory = directory
+        self.max_segment_bytes = int(max_segment_bytes)
+        self.rotate_daily = rotate_daily
+        self.compress_closed = compress_closed
+        self.read_only = read_only
+        if read_only:
+            # Whatever a writer has committed; a torn tail is left for the writer to repair.
+            self.manifest = self._read_manifest()
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock():
+            self.manifest = self._read_manifest()
+            self._recover_active()
+
+    @classmethod
+    def from_config(cls, base_dir: Path, journal_cfg: dict[str, Any] | None = None) -> "JournalStore":
+        journal_cfg = journal_cfg or {}
+        store = cls(
+            journal_dir(base_dir),
+            max_segment_bytes=int(journal_cfg.get("max_segment_bytes", 5_000_000)),
+            rotate_daily=bool(journal_cfg.get("rotate_daily", True)),
+            compress_closed=bool(journal_cfg.get("compress_closed", True)),
+        )
+        store.import_legacy(legacy_journal_path(base_dir))
+        return store
+
+    def _lock(self):
+        if self.read_only:
+            raise PermissionError("journal store is open read-only")
+        return exclusive_lock(self.directory / LOCK_NAME)
+
+    # -- manifest ---------------------------------------------------------
+
+    def _read_manifest(self) -> dict[str, Any]:
+        path = self.directory / MANIFEST_NAME
+        if path.exists():
+            try:
+                manifest = json.loads(path.read_text())
+                if manifest.get("version") == JOURNAL_VERSION:
+                    return manifest
+            except json.JSONDecodeError:
+                pass
+        return {"version": JOURNAL_VERSION, "segments": []}
+
+    def _write_manifest(self) -> None:
+        path = self.directory / MANIFEST_NAME
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.manifest, indent=2))
+        tmp.replace(path)
+
+    @property
+    def segments(self) -> list[dict[str, Any]]:
+        return self.manifest["segments"]
+
+    def _active(self) -> dict[str, Any] | None:
+        if self.segments and not self.segments[-1]["compressed"] and not self.segments[-1].get("closed"):
+            return self.segments[-1]
+        return None
+
+    def _data_path(self, segment: dict[str, Any]) -> Path:
+        return self.directory / (segment["name"] + (".jsonl.gz" if segment["compressed"] else ".jsonl"))
+
+    def _index_path(self, segment: dict[str, Any]) -> Path:
+        return self.directory / f"{segment['name']}.idx.jsonl"
+
+    # -- writing ----------------------------------------------------------
+
+    def _recover_active(self) -> None:
+        """Rebuild the active segment's index if a crash left data and index out of step (caller holds the lock)."""
+        segment = self._active()
+        if segment is None:
+            return
+        data_path = self._data_path(segment)
+        size = data_path.stat().st_size if data_path.exists() else 0
+        if size == segment["bytes"]:
+            return
+        entries: list[dict[str, Any]] = []
+        offset = 0
+        with data_path.open("rb") as handle:
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entries.append(index_entry(json.loads(line), offset, len(line)))
+                except json.JSONDecodeError:
+                    pass
+                offset += len(line)
+        if offset != size:
+            # Drop a torn final line so the next append starts on a record boundary.
+            with data_path.open("r+b") as handle:
+                handle.truncate(offset)
+        self._index_path(segment).write_text("".join(json.dumps(entry) + "\n" for entry in entries))
+        segment.update(
+            {
+                "bytes": offset,
+                "records": len(entries),
+                "first_ts": min((entry["ts"] for entry in entries), default=None),
+                "last_ts": max((entry["ts"] for entry in entries), default=None),
+                "action_types": sorted({action for entry in entries for action in entry["actions"]}),
+                "errors": sum(1 for entry in entries if entry["error"]),
+            }
+        )
+        self._write_manifest()
+
+    def _close_segment(self, segment: dict[str, Any]) -> None:
+        if self.compress_closed:
+            plain = self._data_path(segment)
+            compressed = plain.with_name(plain.name + ".gz")
+            with plain.open("rb") as source, gzip.open(compressed, "wb") as target:
+                while chunk := source.read(1 << 20):
+                    target.write(chunk)
+            segment["compressed"] = True
+            self._write_manifest()
+            plain.unlink()
+        else:
+            segment["closed"] = True
+            self._write_manifest()
+
+    def _open_segment(self, day: str) -> dict[str, Any]:
+        sequence = 1 + sum(1 for segment in self.segments if segment["day"] == day)
+        segment = {
+            "name": f"journal-{day}-{sequence:03d}",
+            "day": day,
+            "first_ts": None,
+            "last_ts": None,
+            "records": 0,
+            "bytes": 0,
+            "compressed": False,
+            "action_types": [],
+            "errors": 0,
+        }
+        self.segments.append(segment)
+        return segment
+
+    def append(self, payload: dict[str, Any]) -> None:
+        """Append one record durably, under the lock and on top of the latest manifest."""
+        with self._lock():
+            # Another process may have appended or rotated since this store last looked.
+            self.manifest = self._read_manifest()
+            self._recover_active()
+            self._append(payload, durable=True)
+
+    def _append(self, payload: dict[str, Any], durable: bool) -> None:
+        # Caller holds the lock. durable=False skips fsync and the manifest write (bulk import).
+        line = (json.dumps(payload) + "\n").encode("utf-8")
+        ts = record_epoch(payload)
+        day = datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y%m%d")
+
+        segment = self._active()
+        if segment is not None and segment["records"] and (
+            (self.rotate_daily and segment["day"] != day) or segment["bytes"] + len(line) > self.max_segment_bytes
+        ):
+            self._close_segment(segment)
+            segment = None
+        if segment is None:
+            segment = self._open_segment(day)
+
+        entry = index_entry(payload, segment["bytes"], len(line))
+        # Data, then index, then manifest: _recover_active repairs any gap left by a crash.
+        with self._data_path(segment).open("ab") as handle:
+            handle.write(line)
+            if durable:
+                handle.flush()
+                os.fsync(handle.fileno())
+        with self._index_path(segment).open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry) + "\n")
+        segment["bytes"] += len(line)
+        segment["records"] += 1
+        segment["first_ts"] = ts if segment["first_ts"] is None else min(segment["first_ts"], ts)
+        segment["last_ts"] = ts if segment["last_ts"] is None else max(segment["last_ts"], ts)
+        segment["action_types"] = sorted(set(segment["action_types"]).union(entry["actions"]))
+        segment["errors"] += int(entry["error"])
+        if durable:
+            self._write_manifest()
+
+    def import_legacy(self, legacy_path: Path) -> int:
+        """Move the old single-file journal into segments (once); returns the number of records imported."""
+        if not legacy_path.exists():
+            return 0
+        with self._lock():
+            # Checked again under the lock: another process may have imported it meanwhile.
+            if not legacy_path.exists():
+                return 0
+            self.manifest = self._read_manifest()
+            self._recover_active()
+            imported = 0
+            with legacy_path.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        payload = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self._append(payload, durable=False)
+                    imported += 1
+            self._write_manifest()
+            legacy_path.rename(legacy_path.with_name(legacy_path.name + ".imported"))
+        return imported
+
+    # -- reading ----------------------------------------------------------
+
+    def query(
+        self,
+        start: int | None = None,
+        end: int | None = None,
+        actions: set[str] | None = None,
+        errors_only: bool = False,
+        limit: int | None = None,
+        newest_first: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Records with start <= ts < end (epoch seconds) matching every given filter.
+
+        actions matches records holding at least one of the action types;
+        the pseudo-type "any" matches records with any action at all.
+        """
+        segments = [
+            segment
+            for segment in self.segments
+            if segment["records"]
+            and (start is None or segment["last_ts"] >= start)
+            and (end is None or segment["first_ts"] < end)
+            and (not errors_only or segment["errors"])
+            and (not actions or ("any" in actions and segment["action_types"]) or actions.intersection(segment["action_types"]))
+        ]
+        if newest_first:
+            segments.reverse()
+
+        remaining = limit
+        for segment in segments:
+            matches: list[dict[str, Any]] = []
+            with self._index_path(segment).open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    if not line.endswith("\n"):
+                        # A writer is mid-append (or crashed there); the record is not committed yet.
+                        break
+                    entry = json.loads(line)
+                    if start is not None and entry["ts"] < start:
+                        continue
+                    if end is not None and entry["ts"] >= end:
+                        continue
+                    if errors_only and not entry["error"]:
+                        continue
+                    if actions and not (("any" in actions and entry["actions"]) or actions.intersection(entry["actions"])):
+                        continue
+                    matches.append(entry)
+            if not matches:
+                continue
+            if newest_first:
+                matches.reverse()
+            if remaining is not None:
+                matches = matches[:remaining]
+
+            data_path = self._data_path(segment)
+            if not segment["compressed"] and not data_path.exists():
+                # Compressed by a writer after this store read the manifest.
+                data_path = data_path.with_name(data_path.name + ".gz")
+            opener = gzip.open if data_path.suffix == ".gz" else open
+            with opener(data_path, "rb") as handle:
+                # gzip seeks are emulated by decompressing forward, so read in file order.
+                records = {}
+                for entry in sorted(matches, key=lambda item: item["offset"]):
+                    handle.seek(entry["offset"])
+                    records[entry["offset"]] = json.loads(handle.read(entry["length"]))
+            for entry in matches:
+                yield records[entry["offset"]]
+
+            if remaining is not None:
+                remaining -= len(matches)
+                if remaining <= 0:
+                    return
+
+    def stats(self) -> dict[str, Any]:
+        total_bytes = sum(self._data_path(segment).stat().st_size for segment in self.segments if self._data_path(segment).exists())
+        return {
+            "segments": len(self.segments),
+            "records": sum(segment["records"] for segment in self.segments),
+            "bytes_on_disk": total_bytes,
+            "first_ts": self.segments[0]["first_ts"] if self.segments else None,
+            "last_ts": self.segments[-1]["last_ts"] if self.segments else None,
+        }
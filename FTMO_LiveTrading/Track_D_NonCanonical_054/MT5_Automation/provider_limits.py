@@ -0,0 +1,176 @@
+"""
+Per-provider rate limiting and circuit breaking for the Track D API mode.
+
+Throttling used to be handled inside each fetcher with blocking sleeps
+(12s for an Alpha Vantage "Note" or a Massive 429), and nothing carried over
+to the next cycle. ProviderGuard keeps, per provider:
+
+- a token bucket sized to the provider's published per-minute quota; every
+  HTTP request to one of its hosts spends a token, and a throttle response
+  drains the bucket so the next attempt waits for a full refill
+- a circuit breaker: after failure_threshold consecutive failures the
+  provider is skipped for cooldown_seconds, then gets one trial attempt
+  (half-open); a success closes the circuit
+
+fetch_rates_api asks allow() before starting a provider, so the fallback
+chain moves past a provider that is known to be down or out of quota
+instead of waiting on it. State is saved to the bot's state directory and
+survives between cycles and restarts.
+
+Output:
+- state/track_d_provider_health.json (created at runtime)
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+
+# Free-tier requests per minute. Alpha Vantage also caps at 25/day and Massive
+# (ex-Polygon) at 5/min; Yahoo publishes no quota, so it gets a conservative one.
+DEFAULT_REQUESTS_PER_MINUTE = {
+    "yahoo": 30.0,
+    "twelvedata": 8.0,
+    "alphavantage": 5.0,
+    "finnhub": 60.0,
+    "massive": 5.0,
+}
+
+PROVIDER_HOSTS = {
+    "query1.finance.yahoo.com": "yahoo",
+    "query2.finance.yahoo.com": "yahoo",
+    "api.twelvedata.com": "twelvedata",
+    "www.alphavantage.co": "alphavantage",
+    "finnhub.io": "finnhub",
+    "api.massive.com": "massive",
+}
+
+
+class ProviderThrottled(RuntimeError):
+    """The provider answered with a rate-limit response (HTTP 429 or an in-payload notice)."""
+
+
+def provider_health_path(base_dir: Path) -> Path:
+    return base_dir / "state" / "track_d_provider_health.json"
+
+
+def is_throttle_error(exc: BaseException | None) -> bool:
+    """True for ProviderThrottled or an HTTP 429 anywhere in the exception chain."""
+    while exc is not None:
+        if isinstance(exc, ProviderThrottled) or getattr(exc, "code", None) == 429:
+            return True
+        exc = exc.__cause__
+    return False
+
+
+class ProviderGuard:
+    def __init__(
+        self,
+        path: Path,
+        requests_per_minute: dict[str, float] | None = None,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 900.0,
+    ) -> None:
+        self.path = path
+        self.requests_per_minute = {**DEFAULT_REQUESTS_PER_MINUTE, **(requests_per_minute or {})}
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown_seconds = float(cooldown_seconds)
+        self._lock = threading.Lock()
+        self.providers: dict[str, dict[str, Any]] = {}
+        if path.exists():
+            try:
+                self.providers = dict(json.loads(path.read_text()).get("providers", {}))
+            except (json.JSONDecodeError, AttributeError):
+                self.providers = {}
+
+    @classmethod
+    def from_config(cls, trading_cfg: dict[str, Any], base_dir: Path) -> "ProviderGuard":
+        return cls(
+            provider_health_path(base_dir),
+            requests_per_minute={
+                str(name).lower(): float(value) for name, value in trading_cfg.get("provider_requests_per_minute", {}).items()
+            },
+            failure_threshold=int(trading_cfg.get("provider_failure_threshold", 3)),
+            cooldown_seconds=float(trading_cfg.get("provider_cooldown_seconds", 900)),
+        )
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {"updated_at": time.time(), "providers": self.providers}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(payload, indent=2))
+            tmp.replace(self.path)
+
+    def _entry(self, provider: str, now: float) -> dict[str, Any]:
+        # Caller holds the lock. Refills the bucket up to one minute's quota.
+        capacity = self.requests_per_minute.get(provider, 60.0)
+        entry = self.providers.setdefault(
+            provider,
+            {"tokens": capacity, "refilled_at": now, "failures": 0, "open_until": 0.0, "last_error": None},
+        )
+        elapsed = max(0.0, now - float(entry.get("refilled_at", now)))
+        entry["tokens"] = min(capacity, float(entry.get("tokens", capacity)) + elapsed * capacity / 60.0)
+        entry["refilled_at"] = now
+        return entry
+
+    def allow(self, provider: str, now: float | None = None) -> tuple[bool, str | None, float]:
+        """(allowed, reason if not, seconds until it would be allowed)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entry(provider, now)
+            open_until = float(entry.get("open_until", 0.0))
+            if open_until > now:
+                return False, f"circuit open after {entry['failures']} failures ({entry.get('last_error')})", open_until - now
+            if entry["tokens"] < 1.0:
+                rate = self.requests_per_minute.get(provider, 60.0) / 60.0
+                return False, "rate limited", (1.0 - entry["tokens"]) / rate
+            return True, None, 0.0
+
+    def spend(self, provider: str, tokens: float = 1.0) -> None:
+        with self._lock:
+            entry = self._entry(provider, time.time())
+            # May go negative: requests already sent still count against the next refill.
+            entry["tokens"] -= tokens
+
+    def on_http_request(self, record: dict[str, Any]) -> None:
+        """HttpClient hook: charge every request sent to a known provider host."""
+        provider = PROVIDER_HOSTS.get(urlsplit(str(record.get("url", ""))).hostname or "")
+        if provider is not None:
+            self.spend(provider)
+
+    def record_success(self, provider: str) -> None:
+        with self._lock:
+            entry = self._entry(provider, time.time())
+            entry["failures"] = 0
+            entry["open_until"] = 0.0
+            entry["last_error"] = None
+
+    def record_failure(self, provider: str, error: BaseException | str, throttled: bool = False) -> None:
+        now = time.time()
+        with self._lock:
+            entry = self._entry(provider, now)
+            entry["failures"] = int(entry.get("failures", 0)) + 1
+            entry["last_error"] = str(error)[:300]
+            if throttled:
+                entry["tokens"] = min(entry["tokens"], 0.0)
+            # Also re-opens straight away when a half-open trial fails.
+            if entry["failures"] >= self.failure_threshold:
+                entry["open_until"] = now + self.cooldown_seconds
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            return {
+                provider: {
+                    "tokens": round(self._entry(provider, now)["tokens"], 2),
+                    "failures": int(entry.get("failures", 0)),
+                    "circuit_open": float(entry.get("open_until", 0.0)) > now,
+                }
+                for provider, entry in list(self.providers.items())
+            }
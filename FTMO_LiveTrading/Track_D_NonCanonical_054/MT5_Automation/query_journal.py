@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from journal_store import LEGACY_JOURNAL_NAME, JournalStore
+
+
+RELATIVE_TIME = re.compile(r"^(\d+)([mhdw])$")
+RELATIVE_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_time(value: str | None) -> int | None:
+    """ISO date/datetime (UTC when no offset) or a relative age like 90m, 24h, 7d, 2w."""
+    if not value:
+        return None
+    match = RELATIVE_TIME.match(value.strip())
+    if match:
+        delta = timedelta(**{RELATIVE_UNITS[match.group(2)]: int(match.group(1))})
+        return int((datetime.now(timezone.utc) - delta).timestamp())
+    parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def pick(record: dict[str, Any], dotted: str) -> Any:
+    value: Any = record
+    for key in dotted.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Query the Track D cycle journal (state/journal) through its index.")
+    parser.add_argument("--state-dir", default="state", help="State folder. Relative paths are resolved from this script folder.")
+    parser.add_argument("--since", help="Start time: ISO date/datetime (UTC) or relative age like 24h, 7d.")
+    parser.add_argument("--until", help="End time (exclusive), same formats as --since.")
+    parser.add_argument(
+        "--action",
+        action="append",
+        default=[],
+        help="Only runs with this action type (repeatable), e.g. open_buy, close_guardrail; 'any' for any action.",
+    )
+    parser.add_argument("--errors", action="store_true", help="Only runs that ended with an error.")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many records.")
+    parser.add_argument("--latest", action="store_true", help="Newest records first.")
+    parser.add_argument(
+        "--fields",
+        default="",
+        help="Comma-separated dotted fields to print instead of whole records, e.g. run_utc,signal.close,error.",
+    )
+    parser.add_argument("--stats", action="store_true", help="Print segment and record counts and exit.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    script_dir = Path(__file__).resolve().parent
+    state_dir = Path(args.state_dir)
+    if not state_dir.is_absolute():
+        state_dir = script_dir / state_dir
+
+    # Read-only: a query must not repair, import or rename anything a running cycle may be writing.
+    store = JournalStore(state_dir / "journal", read_only=True)
+    if (state_dir / LEGACY_JOURNAL_NAME).exists():
+        print(f"note: {LEGACY_JOURNAL_NAME} is not imported yet; the next runner cycle imports it", file=sys.stderr)
+    if args.stats:
+        print(json.dumps(store.stats(), indent=2))
+        return
+
+    fields = [field.strip() for field in args.fields.split(",") if field.strip()]
+    for record in store.query(
+        start=parse_time(args.since),
+        end=parse_time(args.until),
+        actions=set(args.action) or None,
+        errors_only=args.errors,
+        limit=args.limit,
+        newest_first=args.latest,
+    ):
+        if fields:
+            record = {field: pick(record, field) for field in fields}
+        print(json.dumps(record))
+
+
+if __name__ == "__main__":
+    main()
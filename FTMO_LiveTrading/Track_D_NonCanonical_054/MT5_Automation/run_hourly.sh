@@ -5,6 +5,11 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 ENV_FILE="${SCRIPT_DIR}/.env.live"
 LOG_FILE="${SCRIPT_DIR}/state/hourly_cycle.log"
 INTERVAL_SECONDS="${INTERVAL_SECONDS:-3600}"
+# DAEMON=1 (default): one long-lived python process scheduled on bar close,
+# relaunched after RESTART_DELAY_SECONDS if it ever exits.
+# DAEMON=0: legacy loop that relaunches python every INTERVAL_SECONDS.
+DAEMON="${DAEMON:-1}"
+RESTART_DELAY_SECONDS="${RESTART_DELAY_SECONDS:-30}"
 
 mkdir -p "${SCRIPT_DIR}/state"
 
@@ -25,6 +30,25 @@ if [[ -z "${MASSIVE_API_KEY:-}" ]]; then
   exit 1
 fi
 
+if [[ "${DAEMON}" == "1" ]]; then
+  CHILD=""
+  # The PID file holds this shell's PID: pass SIGTERM/SIGINT (stop) and SIGHUP (reload) on to python.
+  trap 'if [[ -n "${CHILD}" ]]; then kill -TERM "${CHILD}" 2>/dev/null || true; wait "${CHILD}" || true; fi; exit 0' TERM INT
+  trap 'if [[ -n "${CHILD}" ]]; then kill -HUP "${CHILD}" 2>/dev/null || true; fi' HUP
+  while true; do
+    echo "$(date -u +"%Y-%m-%dT%H:%M:%SZ") starting daemon" >> "${LOG_FILE}"
+    python "${SCRIPT_DIR}/run_track_d_mt5.py" --market-data-only --daemon >> "${LOG_FILE}" 2>&1 &
+    CHILD=$!
+    # wait returns early when a trapped signal arrives; keep waiting while python is alive.
+    while kill -0 "${CHILD}" 2>/dev/null; do
+      wait "${CHILD}" || true
+    done
+    CHILD=""
+    echo "$(date -u +"%Y-%m-%dT%H:%M:%SZ") daemon exited; restarting in ${RESTART_DELAY_SECONDS}s" >> "${LOG_FILE}"
+    sleep "${RESTART_DELAY_SECONDS}"
+  done
+fi
+
 while true; do
   echo "$(date -u +"%Y-%m-%dT%H:%M:%SZ") starting hourly cycle" >> "${LOG_FILE}"
   python "${SCRIPT_DIR}/run_track_d_mt5.py" --market-data-only >> "${LOG_FILE}" 2>&1 || true
@@ -1,22 +1,32 @@
 from __future__ import annotations
 
 import argparse
+import bisect
 import json
 import math
 import os
+import queue
+import signal
+import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Any
 from urllib.parse import quote, urlencode
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
 from zoneinfo import ZoneInfo
 
 import numpy as np
 import pandas as pd
 
+from bar_store import BarStore, bar_store_path
+from journal_store import JournalStore
+from http_client import NO_RETRY, HttpClient, HttpStatusError, HttpTransportError, RetryPolicy
+from provider_limits import ProviderGuard, ProviderThrottled, is_throttle_error
+from state_store import open_state_store, write_json_atomic
+from telegram_queue import TelegramNotifier, telegram_outbox_path
+
 try:
     import MetaTrader5 as mt5
 except ImportError as exc:  # pragma: no cover - depends on local MT5 install
@@ -102,6 +112,22 @@ MASSIVE_DEFAULT_SYMBOLS = {
     "XAUUSD": "C:XAUUSD",
 }
 
+TIMEFRAME_SECONDS = {
+    "M1": 60,
+    "M5": 5 * 60,
+    "M15": 15 * 60,
+    "M30": 30 * 60,
+    "H1": 60 * 60,
+    "H4": 4 * 60 * 60,
+    "D1": 24 * 60 * 60,
+}
+
+
+# One pool for every provider and Telegram; in --daemon mode connections stay open between cycles.
+HTTP_CLIENT = HttpClient(timeout=15.0)
+# One provider guard per health file for the life of the process (see shared_provider_guard).
+PROVIDER_GUARDS: dict[Path, ProviderGuard] = {}
+
 
 @dataclass
 class StrategyConfig:
@@ -122,13 +148,15 @@ class GuardrailStatus:
     notes: list[str]
 
 
-def load_json(path: Path) -> dict[str, Any]:
-    return json.loads(path.read_text())
+@dataclass
+class GuardrailMonitorState:
+    polls: int = 0
+    last_breach_at: float = 0.0
+    last_poll_seconds: float = 0.0
 
 
-def save_json(path: Path, payload: dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, indent=2))
+def load_json(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text())
 
 
 def utc_now_iso() -> str:
@@ -167,6 +195,24 @@ def shutdown_mt5() -> None:
         mt5.shutdown()
 
 
+def bars_since(since_ts: int, timeframe_name: str, now: float | None = None) -> int:
+    """Bars from since_ts (inclusive) up to now, for sizing incremental requests."""
+    bar_seconds = TIMEFRAME_SECONDS.get(timeframe_name.upper(), 60 * 60)
+    now = datetime.now(timezone.utc).timestamp() if now is None else now
+    elapsed = max(0.0, now - since_ts)
+    return int(math.ceil(elapsed / bar_seconds)) + 1
+
+
+def mt5_server_now(symbol: str) -> float:
+    """Current time on the terminal's clock: MT5 bar times are broker server time, not UTC."""
+    tick = mt5.symbol_info_tick(symbol)
+    if tick is None or not int(getattr(tick, "time", 0) or 0):
+        # No tick (market closed): server time is ahead of UTC for FTMO, so the
+        # UTC clock can only undercount; the two-bar floor in fetch_rates still applies.
+        return datetime.now(timezone.utc).timestamp()
+    return float(tick.time)
+
+
 def mt5_timeframe(name: str) -> int:
     attr_name = TIMEFRAME_MAP.get(name.upper())
     if attr_name is None or mt5 is None or not hasattr(mt5, attr_name):
@@ -174,8 +220,13 @@ def mt5_timeframe(name: str) -> int:
     return getattr(mt5, attr_name)
 
 
-def fetch_rates(symbol: str, timeframe_name: str, bars_count: int) -> pd.DataFrame:
+def fetch_rates(symbol: str, timeframe_name: str, bars_count: int, since_ts: int | None = None) -> pd.DataFrame:
     timeframe = mt5_timeframe(timeframe_name)
+    if since_ts is not None:
+        # Sized on the terminal clock, plus the bar before since_ts: the last two
+        # stored bars are always re-read, so a bar stored while still forming
+        # gets its final close.
+        bars_count = min(int(bars_count), max(2, bars_since(since_ts, timeframe_name, now=mt5_server_now(symbol)) + 1))
     rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, bars_count)
     if rates is None or len(rates) == 0:
         raise RuntimeError(f"No MT5 rates returned for {symbol} on {timeframe_name}. Last error: {mt5.last_error()}")
@@ -195,7 +246,13 @@ def fetch_rates(symbol: str, timeframe_name: str, bars_count: int) -> pd.DataFra
     return df
 
 
-def fetch_rates_yahoo(symbol: str, timeframe_name: str, bars_count: int, trading_cfg: dict[str, Any]) -> pd.DataFrame:
+def fetch_rates_yahoo(
+    symbol: str,
+    timeframe_name: str,
+    bars_count: int,
+    trading_cfg: dict[str, Any],
+    since_ts: int | None = None,
+) -> pd.DataFrame:
     interval = YAHOO_TIMEFRAME_MAP.get(timeframe_name.upper())
     if interval is None:
         supported = ", ".join(sorted(YAHOO_TIMEFRAME_MAP.keys()))
@@ -208,14 +265,17 @@ def fetch_rates_yahoo(symbol: str, timeframe_name: str, bars_count: int, trading
     )
     yahoo_range = str(trading_cfg.get("yahoo_range", "60d"))
     encoded_symbol = quote(api_symbol)
-    query = urlencode(
-        {
-            "interval": interval,
-            "range": yahoo_range,
-            "includePrePost": "false",
-            "events": "div,splits",
-        }
-    )
+    params = {
+        "interval": interval,
+        "includePrePost": "false",
+        "events": "div,splits",
+    }
+    if since_ts is not None:
+        params["period1"] = str(int(since_ts))
+        params["period2"] = str(int(datetime.now(timezone.utc).timestamp()))
+    else:
+        params["range"] = yahoo_range
+    query = urlencode(params)
     base_urls = [
         "https://query1.finance.yahoo.com/v8/finance/chart",
         "https://query2.finance.yahoo.com/v8/finance/chart",
@@ -225,38 +285,21 @@ def fetch_rates_yahoo(symbol: str, timeframe_name: str, bars_count: int, trading
     last_error: Exception | None = None
     for base_url in base_urls:
         url = f"{base_url}/{encoded_symbol}?{query}"
-        for attempt in range(3):
-            try:
-                request = Request(
-                    url=url,
-                    method="GET",
-                    headers={
-                        "User-Agent": (
-                            "Mozilla/5.0 (X11; Linux x86_64) "
-                            "AppleWebKit/537.36 (KHTML, like Gecko) "
-                            "Chrome/126.0.0.0 Safari/537.36"
-                        ),
-                        "Accept": "application/json,text/plain,*/*",
-                        "Accept-Language": "en-US,en;q=0.9",
-                    },
-                )
-                with urlopen(request, timeout=10) as response:
-                    payload = json.loads(response.read().decode("utf-8"))
-                break
-            except HTTPError as exc:
-                last_error = exc
-                if exc.code == 429 and attempt < 2:
-                    time.sleep(1.5 * (attempt + 1))
-                    continue
-                break
-            except (URLError, TimeoutError) as exc:
-                last_error = exc
-                if attempt < 2:
-                    time.sleep(1.0 * (attempt + 1))
-                    continue
-                break
-        if payload is not None:
+        try:
+            payload = HTTP_CLIENT.get_json(
+                url,
+                headers={"Accept-Language": "en-US,en;q=0.9"},
+                timeout=10,
+                retry=RetryPolicy(attempts=3, backoff_seconds=1.0),
+            )
             break
+        except HttpStatusError as exc:
+            # Both hosts share one quota; leave the wait to the provider guard.
+            if exc.code == 429:
+                raise ProviderThrottled(f"Yahoo rate limit for {api_symbol}") from exc
+            last_error = exc
+        except HttpTransportError as exc:
+            last_error = exc
 
     if payload is None:
         raise RuntimeError(f"Yahoo API request failed for {api_symbol}: {last_error}")
@@ -297,7 +340,13 @@ def fetch_rates_yahoo(symbol: str, timeframe_name: str, bars_count: int, trading
     return frame.tail(bars_count).reset_index(drop=True)
 
 
-def fetch_rates_twelvedata(symbol: str, timeframe_name: str, bars_count: int, trading_cfg: dict[str, Any]) -> pd.DataFrame:
+def fetch_rates_twelvedata(
+    symbol: str,
+    timeframe_name: str,
+    bars_count: int,
+    trading_cfg: dict[str, Any],
+    since_ts: int | None = None,
+) -> pd.DataFrame:
     interval = TWELVEDATA_TIMEFRAME_MAP.get(timeframe_name.upper())
     if interval is None:
         supported = ", ".join(sorted(TWELVEDATA_TIMEFRAME_MAP.keys()))
@@ -309,33 +358,22 @@ def fetch_rates_twelvedata(symbol: str, timeframe_name: str, bars_count: int, tr
     if not api_key:
         raise RuntimeError(f"Missing API key environment variable for TwelveData: {api_key_env}")
 
-    query = urlencode(
-        {
-            "symbol": api_symbol,
-            "interval": interval,
-            "outputsize": str(max(50, int(bars_count))),
-            "timezone": "UTC",
-            "apikey": api_key,
-        }
-    )
+    params = {
+        "symbol": api_symbol,
+        "interval": interval,
+        "outputsize": str(max(50, int(bars_count))),
+        "timezone": "UTC",
+        "apikey": api_key,
+    }
+    if since_ts is not None:
+        params["start_date"] = datetime.fromtimestamp(int(since_ts), tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    query = urlencode(params)
     url = f"https://api.twelvedata.com/time_series?{query}"
-    request = Request(
-        url=url,
-        method="GET",
-        headers={
-            "User-Agent": (
-                "Mozilla/5.0 (X11; Linux x86_64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/126.0.0.0 Safari/537.36"
-            ),
-            "Accept": "application/json,text/plain,*/*",
-        },
-    )
-
-    with urlopen(request, timeout=12) as response:
-        payload = json.loads(response.read().decode("utf-8"))
+    payload = HTTP_CLIENT.get_json(url, timeout=12)
 
     if payload.get("status") == "error":
+        if payload.get("code") == 429:
+            raise ProviderThrottled(f"TwelveData rate limit: {payload.get('message')}")
         raise RuntimeError(f"TwelveData error: {payload.get('message')}")
 
     values = payload.get("values") or []
@@ -367,7 +405,13 @@ def fetch_rates_twelvedata(symbol: str, timeframe_name: str, bars_count: int, tr
     return frame.tail(bars_count).reset_index(drop=True)
 
 
-def fetch_rates_alphavantage(symbol: str, timeframe_name: str, bars_count: int, trading_cfg: dict[str, Any]) -> pd.DataFrame:
+def fetch_rates_alphavantage(
+    symbol: str,
+    timeframe_name: str,
+    bars_count: int,
+    trading_cfg: dict[str, Any],
+    since_ts: int | None = None,
+) -> pd.DataFrame:
     timeframe = timeframe_name.upper()
     interval = ALPHAVANTAGE_INTERVAL_MAP.get(timeframe)
     use_daily_endpoint = timeframe == "D1"
@@ -398,10 +442,13 @@ def fetch_rates_alphavantage(symbol: str, timeframe_name: str, bars_count: int,
     if not stock_symbol and (not from_symbol or not to_symbol):
         stock_symbol = str(trading_cfg.get("api_fallback_symbol", "GLD")).strip().upper()
 
+    # Alpha Vantage has no start parameter; the compact payload (last 100 bars) covers small updates.
+    request_bars = min(int(bars_count), bars_since(since_ts, timeframe)) if since_ts is not None else int(bars_count)
+
     def request_alpha(function_name: str, intraday_interval: str | None = None, symbol_param: str | None = None) -> dict[str, Any]:
         params = {
             "function": function_name,
-            "outputsize": "full" if int(bars_count) > 100 else "compact",
+            "outputsize": "full" if request_bars > 100 else "compact",
             "apikey": api_key,
         }
         if symbol_param:
@@ -414,33 +461,12 @@ def fetch_rates_alphavantage(symbol: str, timeframe_name: str, bars_count: int,
 
         query = urlencode(params)
         url = f"https://www.alphavantage.co/query?{query}"
-        request = Request(
-            url=url,
-            method="GET",
-            headers={
-                "User-Agent": (
-                    "Mozilla/5.0 (X11; Linux x86_64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/126.0.0.0 Safari/537.36"
-                ),
-                "Accept": "application/json,text/plain,*/*",
-            },
-        )
 
-        payload_local: dict[str, Any] | None = None
-        for attempt in range(3):
-            with urlopen(request, timeout=15) as response:
-                payload_local = json.loads(response.read().decode("utf-8"))
-
-            if payload_local.get("Note"):
-                if attempt < 2:
-                    time.sleep(12)
-                    continue
-                raise RuntimeError(f"Alpha Vantage throttle message: {payload_local['Note']}")
-            break
-
-        if payload_local is None:
-            raise RuntimeError("Alpha Vantage returned no payload")
+        payload_local = HTTP_CLIENT.get_json(url, timeout=15)
+        if payload_local.get("Note"):
+            raise ProviderThrottled(f"Alpha Vantage throttle message: {payload_local['Note']}")
+        if "rate limit" in str(payload_local.get("Information", "")).lower():
+            raise ProviderThrottled(f"Alpha Vantage info: {payload_local['Information']}")
         return payload_local
 
     if stock_symbol:
@@ -495,7 +521,13 @@ def fetch_rates_alphavantage(symbol: str, timeframe_name: str, bars_count: int,
     return frame.tail(bars_count).reset_index(drop=True)
 
 
-def fetch_rates_finnhub(symbol: str, timeframe_name: str, bars_count: int, trading_cfg: dict[str, Any]) -> pd.DataFrame:
+def fetch_rates_finnhub(
+    symbol: str,
+    timeframe_name: str,
+    bars_count: int,
+    trading_cfg: dict[str, Any],
+    since_ts: int | None = None,
+) -> pd.DataFrame:
     timeframe = timeframe_name.upper()
     mapping = FINNHUB_RESOLUTION_MAP.get(timeframe)
     if mapping is None:
@@ -515,7 +547,7 @@ def fetch_rates_finnhub(symbol: str, timeframe_name: str, bars_count: int, tradi
 
     to_ts = int(datetime.now(timezone.utc).timestamp())
     lookback_bars = max(int(bars_count) + 50, 120)
-    from_ts = to_ts - lookback_bars * seconds_per_bar
+    from_ts = int(since_ts) if since_ts is not None else to_ts - lookback_bars * seconds_per_bar
 
     def fetch_endpoint(endpoint: str, endpoint_symbol: str) -> dict[str, Any]:
         query = urlencode(
@@ -528,20 +560,7 @@ def fetch_rates_finnhub(symbol: str, timeframe_name: str, bars_count: int, tradi
             }
         )
         url = f"https://finnhub.io/api/v1/{endpoint}?{query}"
-        request = Request(
-            url=url,
-            method="GET",
-            headers={
-                "User-Agent": (
-                    "Mozilla/5.0 (X11; Linux x86_64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/126.0.0.0 Safari/537.36"
-                ),
-                "Accept": "application/json,text/plain,*/*",
-            },
-        )
-        with urlopen(request, timeout=15) as response:
-            return json.loads(response.read().decode("utf-8"))
+        return HTTP_CLIENT.get_json(url, timeout=15)
 
     payload = None
     errors: list[str] = []
@@ -554,10 +573,10 @@ def fetch_rates_finnhub(symbol: str, timeframe_name: str, bars_count: int, tradi
     for endpoint, endpoint_symbol in endpoint_attempts:
         try:
             candidate = fetch_endpoint(endpoint, endpoint_symbol)
-        except HTTPError as exc:
+        except HttpStatusError as exc:
             errors.append(f"{endpoint}:{endpoint_symbol} HTTP {exc.code}")
             continue
-        except URLError as exc:
+        except HttpTransportError as exc:
             errors.append(f"{endpoint}:{endpoint_symbol} URL error {exc}")
             continue
 
@@ -606,7 +625,13 @@ def fetch_rates_finnhub(symbol: str, timeframe_name: str, bars_count: int, tradi
     return frame.tail(bars_count).reset_index(drop=True)
 
 
-def fetch_rates_massive(symbol: str, timeframe_name: str, bars_count: int, trading_cfg: dict[str, Any]) -> pd.DataFrame:
+def fetch_rates_massive(
+    symbol: str,
+    timeframe_name: str,
+    bars_count: int,
+    trading_cfg: dict[str, Any],
+    since_ts: int | None = None,
+) -> pd.DataFrame:
     timeframe = timeframe_name.upper()
     mapping = MASSIVE_TIMESPAN_MAP.get(timeframe)
     if mapping is None:
@@ -626,7 +651,10 @@ def fetch_rates_massive(symbol: str, timeframe_name: str, bars_count: int, tradi
 
     to_dt = datetime.now(timezone.utc)
     lookback_bars = max(int(bars_count) + 50, 120)
-    from_dt = datetime.fromtimestamp(int(to_dt.timestamp()) - lookback_bars * seconds_per_bar, tz=timezone.utc)
+    if since_ts is not None:
+        from_dt = datetime.fromtimestamp(int(since_ts), tz=timezone.utc)
+    else:
+        from_dt = datetime.fromtimestamp(int(to_dt.timestamp()) - lookback_bars * seconds_per_bar, tz=timezone.utc)
     from_str = from_dt.strftime("%Y-%m-%d")
     to_str = to_dt.strftime("%Y-%m-%d")
 
@@ -642,30 +670,13 @@ def fetch_rates_massive(symbol: str, timeframe_name: str, bars_count: int, tradi
         f"https://api.massive.com/v2/aggs/ticker/{quote(api_symbol, safe=':')}/range/"
         f"{multiplier}/{timespan}/{from_str}/{to_str}?{query}"
     )
-    request = Request(
-        url=url,
-        method="GET",
-        headers={
-            "User-Agent": (
-                "Mozilla/5.0 (X11; Linux x86_64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/126.0.0.0 Safari/537.36"
-            ),
-            "Accept": "application/json,text/plain,*/*",
-        },
-    )
-
     payload: dict[str, Any] | None = None
-    for attempt in range(3):
-        try:
-            with urlopen(request, timeout=20) as response:
-                payload = json.loads(response.read().decode("utf-8"))
-            break
-        except HTTPError as exc:
-            if exc.code == 429 and attempt < 2:
-                time.sleep(12)
-                continue
-            raise RuntimeError(f"Massive HTTP error {exc.code}") from exc
+    try:
+        payload = HTTP_CLIENT.get_json(url, timeout=20)
+    except HttpStatusError as exc:
+        if exc.code == 429:
+            raise ProviderThrottled(f"Massive rate limit for {api_symbol}") from exc
+        raise RuntimeError(f"Massive HTTP error {exc.code}") from exc
 
     if payload is None:
         raise RuntimeError(f"Massive returned no payload for {api_symbol}")
@@ -703,29 +714,290 @@ def fetch_rates_massive(symbol: str, timeframe_name: str, bars_count: int, tradi
     return frame.tail(bars_count).reset_index(drop=True)
 
 
-def fetch_rates_api(symbol: str, timeframe_name: str, bars_count: int, trading_cfg: dict[str, Any]) -> tuple[pd.DataFrame, str]:
+API_FETCHERS = {
+    "yahoo": fetch_rates_yahoo,
+    "twelvedata": fetch_rates_twelvedata,
+    "alphavantage": fetch_rates_alphavantage,
+    "finnhub": fetch_rates_finnhub,
+    "massive": fetch_rates_massive,
+}
+
+
+def store_resume_from(bar_store: BarStore | None, source: str, symbol: str, timeframe_name: str, bars_count: int) -> int | None:
+    if bar_store is None:
+        return None
+    timeframe = timeframe_name.upper()
+    return bar_store.resume_from(source, symbol, timeframe, bars_count, TIMEFRAME_SECONDS.get(timeframe, 60 * 60))
+
+
+def store_window(
+    received: pd.DataFrame,
+    since_ts: int | None,
+    source: str,
+    symbol: str,
+    timeframe_name: str,
+    bars_count: int,
+    bar_store: BarStore | None,
+) -> pd.DataFrame:
+    """Merge received bars into the store and read back the bars_count window (received itself without a store)."""
+    if bar_store is None:
+        frame = received
+    else:
+        timeframe = timeframe_name.upper()
+        bar_store.merge(source, symbol, timeframe, received, bar_seconds=TIMEFRAME_SECONDS.get(timeframe, 60 * 60))
+        bar_store.trim(source, symbol, timeframe, keep_bars=max(2 * int(bars_count), 500))
+        frame = bar_store.window(source, symbol, timeframe, bars_count)
+    frame.attrs["bars_received"] = int(len(received))
+    frame.attrs["incremental"] = since_ts is not None
+    return frame
+
+
+def fetch_with_store(
+    fetch: Any,
+    source: str,
+    symbol: str,
+    timeframe_name: str,
+    bars_count: int,
+    bar_store: BarStore | None,
+) -> pd.DataFrame:
+    """
+    Call fetch(since_ts) and return the bars_count window.
+
+    With a bar store, only bars from the last stored timestamp are requested
+    and merged, and the window is read back from the store. frame.attrs
+    records bars_received and whether the request was incremental.
+    """
+    since_ts = store_resume_from(bar_store, source, symbol, timeframe_name, bars_count)
+    return store_window(fetch(since_ts), since_ts, source, symbol, timeframe_name, bars_count, bar_store)
+
+
+def validate_rates(frame: pd.DataFrame, incremental: bool) -> None:
+    """Reject provider responses that cannot feed the signal; raises ValueError."""
+    if frame.empty or "Close" not in frame.columns or "timestamp" not in frame.columns:
+        raise ValueError("response has no bars")
+    closes = pd.to_numeric(frame["Close"], errors="coerce")
+    if not np.isfinite(closes.to_numpy(dtype=float)).all():
+        raise ValueError("response has non-finite closes")
+    if not pd.to_datetime(frame["timestamp"], utc=True).is_monotonic_increasing:
+        raise ValueError("response timestamps are not in ascending order")
+    # An incremental update may legitimately carry a single bar; a full fill must hold a signal.
+    if not incremental and len(frame) < 3:
+        raise ValueError(f"response has only {len(frame)} bars")
+
+
+def fetch_rates_api(
+    symbol: str,
+    timeframe_name: str,
+    bars_count: int,
+    trading_cfg: dict[str, Any],
+    bar_store: BarStore | None = None,
+    provider_guard: ProviderGuard | None = None,
+) -> tuple[pd.DataFrame, str]:
+    """
+    Fetch the window from the first provider in the chain that answers with valid bars.
+
+    Each provider request runs in its own daemon thread. Sequentially, the
+    next provider starts only when the previous one failed. With
+    trading.api_hedge_enabled, it also starts once trading.api_hedge_delay_seconds
+    have passed without a valid answer, so a slow provider no longer holds up
+    the fail-over. The first valid response wins; later ones are discarded
+    (a running request cannot be interrupted and finishes on its own timeout).
+    Bar store reads and writes stay on the calling thread (sqlite connections
+    are not shared across threads). frame.attrs["attempts"] lists each
+    provider with its start offset, latency and outcome.
+
+    With a provider_guard, providers with an open circuit are skipped, and so
+    are providers out of rate-limit tokens unless they are the last option and
+    a token is due within trading.provider_max_wait_seconds. Outcomes feed
+    the breaker and the guard is saved before returning. Attempts abandoned
+    after another provider won keep counting: their HTTP requests are charged
+    by the guard's process-wide hook (shared_provider_guard), and a failure
+    that arrives after the return still reaches the breaker.
+    """
     primary_provider = str(trading_cfg.get("api_provider", "yahoo")).lower()
     fallback_providers = [str(item).lower() for item in trading_cfg.get("api_provider_fallbacks", [])]
     providers = [primary_provider] + [provider for provider in fallback_providers if provider and provider != primary_provider]
-
-    errors: list[str] = []
-    for provider in providers:
+    hedge_delay = float(trading_cfg.get("api_hedge_delay_seconds", 3.0)) if bool(trading_cfg.get("api_hedge_enabled", False)) else None
+    max_wait = float(trading_cfg.get("provider_max_wait_seconds", 15.0))
+
+    started = time.monotonic()
+    results: queue.Queue = queue.Queue()
+    attempts: list[dict[str, Any]] = []
+    since_by_attempt: list[int | None] = []
+    next_provider = 0
+    pending = 0
+    next_launch_at = float("inf")
+    # Set once this call has returned; attempts finishing after that account for themselves.
+    returned = False
+    returned_lock = threading.Lock()
+
+    def record_late_outcome(provider: str, error: BaseException | None) -> None:
+        # A late frame is never validated or stored, so only failures are recorded.
+        if provider_guard is None or error is None:
+            return
+        provider_guard.record_failure(provider, error, throttled=is_throttle_error(error))
+        provider_guard.save()
+
+    def run_attempt(index: int, provider: str, fetcher: Any, since_ts: int | None) -> None:
+        attempt_started = time.monotonic()
         try:
-            if provider == "yahoo":
-                return fetch_rates_yahoo(symbol, timeframe_name, bars_count, trading_cfg), provider
-            if provider == "twelvedata":
-                return fetch_rates_twelvedata(symbol, timeframe_name, bars_count, trading_cfg), provider
-            if provider == "alphavantage":
-                return fetch_rates_alphavantage(symbol, timeframe_name, bars_count, trading_cfg), provider
-            if provider == "finnhub":
-                return fetch_rates_finnhub(symbol, timeframe_name, bars_count, trading_cfg), provider
-            if provider == "massive":
-                return fetch_rates_massive(symbol, timeframe_name, bars_count, trading_cfg), provider
-            errors.append(f"{provider}: unsupported provider")
+            outcome = (index, fetcher(symbol, timeframe_name, bars_count, trading_cfg, since_ts=since_ts), None)
         except Exception as exc:
-            errors.append(f"{provider}: {exc}")
+            outcome = (index, None, exc)
+        with returned_lock:
+            late = returned
+            if not late:
+                results.put((*outcome, time.monotonic() - attempt_started))
+        if late:
+            record_late_outcome(provider, outcome[2])
+
+    def launch_next() -> bool:
+        nonlocal next_provider, pending, next_launch_at
+        while next_provider < len(providers):
+            provider = providers[next_provider]
+            next_provider += 1
+            attempt = {"provider": provider, "started_s": round(time.monotonic() - started, 3)}
+            attempts.append(attempt)
+            since_by_attempt.append(None)
+            fetcher = API_FETCHERS.get(provider)
+            if fetcher is None:
+                attempt.update({"status": "error", "error": "unsupported provider"})
+                continue
+            if provider_guard is not None:
+                allowed, reason, wait = provider_guard.allow(provider)
+                last_option = next_provider >= len(providers) and pending == 0
+                if not allowed and reason == "rate limited" and last_option and wait <= max_wait:
+                    time.sleep(wait)
+                    attempt["waited_s"] = round(wait, 3)
+                elif not allowed:
+                    attempt.update({"status": "skipped", "error": reason, "retry_in_s": round(wait, 1)})
+                    continue
+            since_ts = store_resume_from(bar_store, provider, symbol, timeframe_name, bars_count)
+            since_by_attempt[-1] = since_ts
+            threading.Thread(
+                target=run_attempt,
+                args=(len(attempts) - 1, provider, fetcher, since_ts),
+                name=f"track-d-fetch-{provider}",
+                daemon=True,
+            ).start()
+            pending += 1
+            next_launch_at = time.monotonic() + hedge_delay if hedge_delay is not None else float("inf")
+            return True
+        next_launch_at = float("inf")
+        return False
+
+    try:
+        launch_next()
+        while pending:
+            timeout = None if next_launch_at == float("inf") else max(0.0, next_launch_at - time.monotonic())
+            try:
+                index, received, error, latency = results.get(timeout=timeout)
+            except queue.Empty:
+                launch_next()
+                continue
+            pending -= 1
+            attempt = attempts[index]
+            attempt["latency_s"] = round(latency, 3)
+            if error is None:
+                try:
+                    validate_rates(received, incremental=since_by_attempt[index] is not None)
+                    frame = store_window(
+                        received,
+                        since_by_attempt[index],
+                        attempt["provider"],
+                        symbol,
+                        timeframe_name,
+                        bars_count,
+                        bar_store,
+                    )
+                    validate_rates(frame, incremental=False)
+                except Exception as exc:
+                    attempt.update({"status": "invalid", "error": str(exc)})
+                    if provider_guard is not None:
+                        provider_guard.record_failure(attempt["provider"], exc)
+                else:
+                    attempt["status"] = "ok"
+                    if provider_guard is not None:
+                        provider_guard.record_success(attempt["provider"])
+                    for other in attempts:
+                        other.setdefault("status", "abandoned")
+                    frame.attrs["attempts"] = attempts
+                    frame.attrs["hedged"] = hedge_delay is not None
+                    return frame, attempt["provider"]
+            else:
+                attempt.update({"status": "throttled" if is_throttle_error(error) else "error", "error": str(error)})
+                if provider_guard is not None:
+                    provider_guard.record_failure(attempt["provider"], error, throttled=is_throttle_error(error))
+            # A failed attempt releases the next provider right away.
+            if not pending or hedge_delay is not None:
+                launch_next()
+
+        errors = [f"{attempt['provider']}: {attempt.get('error')}" for attempt in attempts]
+        raise RuntimeError("All API providers failed: " + " | ".join(errors))
+    finally:
+        with returned_lock:
+            returned = True
+            unread = []
+            while not results.empty():
+                unread.append(results.get_nowait())
+        # Outcomes queued before the return but never read here (another provider had already won).
+        for index, _, error, _ in unread:
+            record_late_outcome(attempts[index]["provider"], error)
+        if provider_guard is not None:
+            provider_guard.save()
+
+
+def shared_provider_guard(trading_cfg: dict[str, Any], base_dir: Path) -> ProviderGuard:
+    """
+    The process's ProviderGuard for base_dir, created on first use.
+
+    Its on_http_request hook stays registered on HTTP_CLIENT, so every request
+    to a provider host is charged to that provider's bucket when it is sent,
+    including requests from hedged attempts still running after
+    fetch_rates_api returned. Reusing one guard across daemon cycles also
+    means a late update is never overwritten by a guard reloaded from disk.
+    Limits are refreshed from trading_cfg on every call (config reloads).
+    """
+    fresh = ProviderGuard.from_config(trading_cfg, base_dir)
+    guard = PROVIDER_GUARDS.get(fresh.path)
+    if guard is None:
+        guard = PROVIDER_GUARDS[fresh.path] = fresh
+        HTTP_CLIENT.add_hook(guard.on_http_request)
+    else:
+        guard.requests_per_minute = fresh.requests_per_minute
+        guard.failure_threshold = fresh.failure_threshold
+        guard.cooldown_seconds = fresh.cooldown_seconds
+    return guard
+
+
+def open_bar_store(config: dict[str, Any], base_dir: Path) -> BarStore | None:
+    if not bool(config.get("trading", {}).get("bar_store_enabled", True)):
+        return None
+    return BarStore(bar_store_path(base_dir))
+
+
+def http_timing_summary(requests: list[dict[str, Any]]) -> dict[str, Any]:
+    """Aggregate HTTP_CLIENT hook records: request count, reused connections, failures, wall time."""
+    return {
+        "requests": len(requests),
+        "reused_connections": sum(1 for record in requests if record.get("reused")),
+        "failed": sum(1 for record in requests if record.get("status") is None or record["status"] >= 400),
+        "seconds": round(sum(float(record.get("elapsed", 0.0)) for record in requests), 3),
+    }
 
-    raise RuntimeError("All API providers failed: " + " | ".join(errors))
+
+def market_data_summary(rates: pd.DataFrame, http_requests: list[dict[str, Any]] | None = None) -> dict[str, Any]:
+    summary = {
+        "bars_received": rates.attrs.get("bars_received"),
+        "bars_in_window": int(len(rates)),
+        "incremental": bool(rates.attrs.get("incremental", False)),
+    }
+    if "attempts" in rates.attrs:
+        summary["hedged"] = bool(rates.attrs.get("hedged", False))
+        summary["attempts"] = rates.attrs["attempts"]
+    if http_requests is not None:
+        summary["http"] = http_timing_summary(http_requests)
+    return summary
 
 
 def apply_ema_strategy(df: pd.DataFrame, strategy: StrategyConfig) -> pd.DataFrame:
@@ -756,12 +1028,163 @@ def latest_signal(df: pd.DataFrame) -> dict[str, Any]:
     }
 
 
-def load_state(state_path: Path, starting_balance: float, account_equity: float) -> dict[str, Any]:
-    today = datetime.now(timezone.utc).date().isoformat()
-    if state_path.exists():
-        state = load_json(state_path)
+EPOCH_UNITS_PER_SECOND = {"s": 1, "ms": 10**3, "us": 10**6, "ns": 10**9}
+
+
+def epoch_seconds(timestamps: pd.Series) -> list[int]:
+    # Unit-agnostic (pandas may hold datetimes as ns or us); skips re-parsing
+    # columns that are already datetime64, which is most of the cost.
+    if not pd.api.types.is_datetime64_any_dtype(timestamps):
+        timestamps = pd.to_datetime(timestamps, utc=True)
+    index = pd.DatetimeIndex(timestamps)
+    return (index.asi8 // EPOCH_UNITS_PER_SECOND[index.unit]).tolist()
+
+
+def ema_step(value: float, close: float, span: int) -> float:
+    """One step of pandas ewm(span=span, adjust=False).mean()."""
+    alpha = 2.0 / (span + 1.0)
+    return (1.0 - alpha) * value + alpha * close
+
+
+def evaluate_signal(
+    rates: pd.DataFrame,
+    strategy: StrategyConfig,
+    state: dict[str, Any],
+    source: str,
+    symbol: str,
+    timeframe_name: str,
+    now: float | None = None,
+    full_check_every: int = 24,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    latest_signal(apply_ema_strategy(rates)) from persisted EMA state.
+
+    state["ema_state"] holds the fast/slow EMAs at the last closed bar (the
+    anchor) and the bar before it. When the anchor is still in rates with
+    the same close, only the bars after it go through the adjust=False
+    recurrence. Otherwise (first run, key change, missing or revised anchor)
+    both EMAs are recomputed over the whole window; when the old anchor is
+    still present, the gap between stored and recomputed values is reported
+    as divergence. Revisions to bars older than the anchor are invisible to
+    the recurrence, so every full_check_every incremental updates (0 = never)
+    a full recompute runs anyway and replaces the carried values. The anchor
+    moves to the newest closed bar. Returns (signal, info) and updates
+    state["ema_state"] in place.
+    """
+    timestamps = epoch_seconds(rates["timestamp"])
+    closes = rates["Close"].to_numpy(dtype=float).tolist()
+    n = len(closes)
+    if n < 3:
+        raise RuntimeError("Need at least 3 bars to evaluate signal state.")
+
+    key = {
+        "source": source,
+        "symbol": symbol,
+        "timeframe": timeframe_name.upper(),
+        "fast_ema": strategy.fast_ema,
+        "slow_ema": strategy.slow_ema,
+    }
+    bar_seconds = TIMEFRAME_SECONDS.get(timeframe_name.upper(), 60 * 60)
+    now = datetime.now(timezone.utc).timestamp() if now is None else now
+    # Newest closed bar; the last bar in rates may still be forming.
+    new_anchor: int | None = n - 1
+    while new_anchor is not None and timestamps[new_anchor] + bar_seconds > now:
+        new_anchor = new_anchor - 1 if new_anchor > 0 else None
+
+    ema_state = state.get("ema_state") or {}
+    anchor = None
+    reason = "no_state"
+    if ema_state:
+        if ema_state.get("key") != key:
+            reason = "key_changed"
+        else:
+            idx = bisect.bisect_left(timestamps, int(ema_state.get("ts", -1)))
+            if idx >= n or timestamps[idx] != ema_state.get("ts"):
+                reason = "anchor_missing"
+            elif closes[idx] != ema_state.get("close"):
+                reason = "anchor_revised"
+            elif full_check_every > 0 and int(ema_state.get("incremental_updates", 0)) >= full_check_every:
+                reason = "periodic_check"
+            else:
+                anchor = idx
+
+    info: dict[str, Any] = {}
+    # fast/slow EMA at the newest bar, the bar before it, and the new anchor pair.
+    values: dict[int, tuple[float, float]] = {}
+    if anchor is not None:
+        fast = float(ema_state["fast"])
+        slow = float(ema_state["slow"])
+        values[anchor] = (fast, slow)
+        if anchor > 0:
+            values[anchor - 1] = (float(ema_state["prev_fast"]), float(ema_state["prev_slow"]))
+        for i in range(anchor + 1, n):
+            fast = ema_step(fast, closes[i], strategy.fast_ema)
+            slow = ema_step(slow, closes[i], strategy.slow_ema)
+            values[i] = (fast, slow)
+        info = {"mode": "incremental", "bars_processed": n - 1 - anchor}
+        if new_anchor is not None and new_anchor < anchor:
+            new_anchor = anchor
     else:
-        state = {}
+        fast = slow = closes[0]
+        values[0] = (fast, slow)
+        for i in range(1, n):
+            fast = ema_step(fast, closes[i], strategy.fast_ema)
+            slow = ema_step(slow, closes[i], strategy.slow_ema)
+            values[i] = (fast, slow)
+        info = {"mode": "full", "bars_processed": n, "reason": reason}
+        if reason in {"anchor_revised", "periodic_check"}:
+            old_fast, old_slow = values[bisect.bisect_left(timestamps, int(ema_state["ts"]))]
+            info["divergence"] = max(abs(old_fast - float(ema_state["fast"])), abs(old_slow - float(ema_state["slow"])))
+
+    if new_anchor is not None and new_anchor > 0 and new_anchor - 1 in values:
+        state["ema_state"] = {
+            "key": key,
+            "ts": timestamps[new_anchor],
+            "close": closes[new_anchor],
+            "fast": values[new_anchor][0],
+            "slow": values[new_anchor][1],
+            "prev_fast": values[new_anchor - 1][0],
+            "prev_slow": values[new_anchor - 1][1],
+            "incremental_updates": int(ema_state.get("incremental_updates", 0)) + 1 if anchor is not None else 0,
+        }
+
+    fast, slow = values[n - 1]
+    prev_fast, prev_slow = values[n - 2]
+    signal = {
+        "timestamp": str(rates["timestamp"].iloc[-1]),
+        "close": closes[-1],
+        "fast_ema": fast,
+        "slow_ema": slow,
+        "buy_cross": bool(prev_fast <= prev_slow and fast > slow),
+        "sell_cross": bool(prev_fast >= prev_slow and fast < slow),
+        "signal": int(fast > slow),
+    }
+    return signal, info
+
+
+def compute_signal(
+    rates: pd.DataFrame,
+    strategy: StrategyConfig,
+    state: dict[str, Any],
+    config: dict[str, Any],
+    source: str,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    if not bool(config.get("strategy", {}).get("incremental_ema", True)):
+        return latest_signal(apply_ema_strategy(rates, strategy)), {"mode": "pandas"}
+    return evaluate_signal(
+        rates,
+        strategy,
+        state,
+        source,
+        config["trading"]["symbol"],
+        config["trading"]["timeframe"],
+        full_check_every=int(config.get("strategy", {}).get("ema_full_check_every", 24)),
+    )
+
+
+def load_state(state_store: Any, starting_balance: float, account_equity: float) -> dict[str, Any]:
+    today = datetime.now(timezone.utc).date().isoformat()
+    state = state_store.load()
 
     if not state.get("starting_balance"):
         state["starting_balance"] = float(starting_balance)
@@ -776,6 +1199,23 @@ def load_state(state_path: Path, starting_balance: float, account_equity: float)
     return state
 
 
+def signal_history_row(state: dict[str, Any], source: str, symbol: str) -> dict[str, Any]:
+    signal = state["last_signal"]
+    return {
+        "run_utc": state["last_run_utc"],
+        "source": source,
+        "symbol": symbol,
+        "bar_timestamp": signal["timestamp"],
+        "close": signal["close"],
+        "fast_ema": signal["fast_ema"],
+        "slow_ema": signal["slow_ema"],
+        "buy_cross": int(signal["buy_cross"]),
+        "sell_cross": int(signal["sell_cross"]),
+        "signal": signal["signal"],
+        "actions": [action.get("type") for action in state.get("last_actions", [])],
+    }
+
+
 def evaluate_guardrails(account_info: Any, ftmo_cfg: dict[str, Any], state: dict[str, Any]) -> GuardrailStatus:
     equity = float(account_info.equity)
     starting_balance = float(state["starting_balance"])
@@ -909,39 +1349,39 @@ def close_position(position: Any, config: dict[str, Any], dry_run: bool) -> dict
     return {"mode": "live", "retcode": int(result.retcode), "comment": result.comment, "request": request}
 
 
-def journal_path(base_dir: Path) -> Path:
-    return base_dir / "state" / "track_d_mt5_journal.jsonl"
-
+def append_journal(base_dir: Path, payload: dict[str, Any], journal_cfg: dict[str, Any] | None = None) -> None:
+    JournalStore.from_config(base_dir, journal_cfg).append(payload)
 
-def append_journal(base_dir: Path, payload: dict[str, Any]) -> None:
-    path = journal_path(base_dir)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(payload) + "\n")
 
-
-def maybe_send_telegram(config: dict[str, Any], message: str) -> dict[str, Any]:
+def telegram_unavailable_reason(config: dict[str, Any]) -> str | None:
     tg_cfg = config.get("telegram", {})
     if not tg_cfg.get("enabled", False):
-        return {"sent": False, "reason": "disabled"}
-
+        return "disabled"
     bot_token_env = tg_cfg.get("bot_token_env")
-    bot_token = os.getenv(bot_token_env, "") if bot_token_env else ""
-    chat_id = str(tg_cfg.get("chat_id", "")).strip()
+    if not (os.getenv(bot_token_env, "") if bot_token_env else ""):
+        return f"missing env token: {bot_token_env}"
+    if not str(tg_cfg.get("chat_id", "")).strip():
+        return "missing chat_id"
+    return None
 
-    if not bot_token:
-        return {"sent": False, "reason": f"missing env token: {bot_token_env}"}
-    if not chat_id:
-        return {"sent": False, "reason": "missing chat_id"}
 
+def maybe_send_telegram(config: dict[str, Any], message: str) -> dict[str, Any]:
+    reason = telegram_unavailable_reason(config)
+    if reason is not None:
+        return {"sent": False, "reason": reason}
+
+    tg_cfg = config.get("telegram", {})
+    bot_token = os.getenv(tg_cfg["bot_token_env"], "")
+    chat_id = str(tg_cfg.get("chat_id", "")).strip()
     url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-    body = urlencode({"chat_id": chat_id, "text": message}).encode("utf-8")
-    request = Request(url=url, data=body, method="POST")
 
     try:
-        with urlopen(request, timeout=10) as response:
-            payload = response.read().decode("utf-8")
+        # sendMessage is not idempotent: a retry after a timeout could post twice.
+        payload = HTTP_CLIENT.post_form(url, {"chat_id": chat_id, "text": message}, timeout=10, retry=NO_RETRY)
         return {"sent": True, "response": payload}
+    except HttpStatusError as exc:
+        # The status lets the notifier tell a permanent rejection (4xx) from a retryable one.
+        return {"sent": False, "reason": str(exc), "status": exc.code}
     except Exception as exc:
         return {"sent": False, "reason": str(exc)}
 
@@ -1096,7 +1536,12 @@ def local_run_time(run_utc: str, tz_name: str | None) -> str | None:
         return None
 
 
-def run_cycle(config: dict[str, Any], base_dir: Path, execute: bool) -> dict[str, Any]:
+def run_cycle(
+    config: dict[str, Any],
+    base_dir: Path,
+    execute: bool,
+    bar_store: BarStore | None = None,
+) -> dict[str, Any]:
     market_data_mode = str(config.get("trading", {}).get("market_data_mode", "mt5")).lower()
     if market_data_mode not in {"mt5", "api"}:
         raise ValueError("trading.market_data_mode must be one of: mt5, api")
@@ -1110,14 +1555,23 @@ def run_cycle(config: dict[str, Any], base_dir: Path, execute: bool) -> dict[str
             take_profit_pct=float(config["strategy"]["take_profit_pct"]),
             risk_pct=float(config["strategy"]["risk_pct"]),
         )
-        rates, provider = fetch_rates_api(
-            symbol=config["trading"]["symbol"],
-            timeframe_name=config["trading"]["timeframe"],
-            bars_count=int(config["trading"]["bars_count"]),
-            trading_cfg=config["trading"],
-        )
-        signal_df = apply_ema_strategy(rates, strategy)
-        signal = latest_signal(signal_df)
+        provider_guard = shared_provider_guard(config["trading"], base_dir)
+        http_requests: list[dict[str, Any]] = []
+        HTTP_CLIENT.add_hook(http_requests.append)
+        try:
+            rates, provider = fetch_rates_api(
+                symbol=config["trading"]["symbol"],
+                timeframe_name=config["trading"]["timeframe"],
+                bars_count=int(config["trading"]["bars_count"]),
+                trading_cfg=config["trading"],
+                bar_store=bar_store,
+                provider_guard=provider_guard,
+            )
+        finally:
+            HTTP_CLIENT.remove_hook(http_requests.append)
+        state_store = open_state_store(config, base_dir)
+        state = state_store.load()
+        signal, ema_info = compute_signal(rates, strategy, state, config, provider)
         actions: list[dict[str, Any]] = []
         entry_price = float(signal["close"])
         go_long = bool(signal["buy_cross"])
@@ -1145,13 +1599,12 @@ def run_cycle(config: dict[str, Any], base_dir: Path, execute: bool) -> dict[str
             "notes": ["api_mode_no_mt5_guardrails"],
         }
 
-        state_path = base_dir / "state" / "track_d_ftmo_state.json"
-        state = load_json(state_path) if state_path.exists() else {}
         state["last_run_utc"] = utc_now_iso()
         state["last_signal"] = signal
         state["last_guardrail"] = guardrail
         state["last_actions"] = actions
-        save_json(state_path, state)
+        state_store.save(state, signal=signal_history_row(state, provider, config["trading"]["symbol"]))
+        state_store.close()
 
         result = {
             "run_utc": utc_now_iso(),
@@ -1159,6 +1612,9 @@ def run_cycle(config: dict[str, Any], base_dir: Path, execute: bool) -> dict[str
             "dry_run": dry_run,
             "market_data_mode": "api",
             "data_provider": provider,
+            "market_data": market_data_summary(rates, http_requests),
+            "provider_health": provider_guard.snapshot(),
+            "ema": ema_info,
             "api_status": "ok",
             "bot_status": "running",
             "account": {
@@ -1178,7 +1634,7 @@ def run_cycle(config: dict[str, Any], base_dir: Path, execute: bool) -> dict[str
             "open_positions": 0,
             "actions": actions,
         }
-        append_journal(base_dir, result)
+        append_journal(base_dir, result, config.get("journal"))
         return result
 
     ensure_symbol_selected(config["trading"]["symbol"])
@@ -1188,9 +1644,9 @@ def run_cycle(config: dict[str, Any], base_dir: Path, execute: bool) -> dict[str
     if account_info is None:
         raise RuntimeError(f"mt5.account_info() failed: {mt5.last_error()}")
 
-    state_path = base_dir / "state" / "track_d_ftmo_state.json"
+    state_store = open_state_store(config, base_dir)
     state = load_state(
-        state_path=state_path,
+        state_store=state_store,
         starting_balance=float(config["ftmo"]["starting_balance"]),
         account_equity=float(account_info.equity),
     )
@@ -1204,13 +1660,20 @@ def run_cycle(config: dict[str, Any], base_dir: Path, execute: bool) -> dict[str
         risk_pct=float(config["strategy"]["risk_pct"]),
     )
 
-    rates = fetch_rates(
-        symbol=config["trading"]["symbol"],
-        timeframe_name=config["trading"]["timeframe"],
-        bars_count=int(config["trading"]["bars_count"]),
+    rates = fetch_with_store(
+        lambda since_ts: fetch_rates(
+            symbol=config["trading"]["symbol"],
+            timeframe_name=config["trading"]["timeframe"],
+            bars_count=int(config["trading"]["bars_count"]),
+            since_ts=since_ts,
+        ),
+        "mt5",
+        config["trading"]["symbol"],
+        config["trading"]["timeframe"],
+        int(config["trading"]["bars_count"]),
+        bar_store,
     )
-    signal_df = apply_ema_strategy(rates, strategy)
-    signal = latest_signal(signal_df)
+    signal, ema_info = compute_signal(rates, strategy, state, config, "mt5")
     positions = track_d_positions(config["trading"]["symbol"], int(config["trading"]["magic_number"]))
 
     actions: list[dict[str, Any]] = []
@@ -1290,7 +1753,20 @@ def run_cycle(config: dict[str, Any], base_dir: Path, execute: bool) -> dict[str
         "notes": guard.notes,
     }
     state["last_actions"] = actions
-    save_json(state_path, state)
+    state_store.save(
+        state,
+        equity={
+            "run_utc": state["last_run_utc"],
+            "balance": float(account_info.balance),
+            "equity": float(account_info.equity),
+            "day_start_equity": float(state["day_start_equity"]),
+            "peak_equity": float(state["peak_equity"]),
+            "daily_loss_pct": guard.daily_loss_pct,
+            "total_loss_pct": guard.total_loss_pct,
+        },
+        signal=signal_history_row(state, "mt5", config["trading"]["symbol"]),
+    )
+    state_store.close()
 
     result = {
         "run_utc": utc_now_iso(),
@@ -1298,6 +1774,8 @@ def run_cycle(config: dict[str, Any], base_dir: Path, execute: bool) -> dict[str
         "dry_run": dry_run,
         "market_data_mode": "mt5",
         "data_provider": "mt5",
+        "market_data": market_data_summary(rates),
+        "ema": ema_info,
         "api_status": "n/a",
         "bot_status": "running",
         "account": {
@@ -1310,12 +1788,459 @@ def run_cycle(config: dict[str, Any], base_dir: Path, execute: bool) -> dict[str
         "open_positions": len(positions),
         "actions": actions,
     }
-    append_journal(base_dir, result)
+    append_journal(base_dir, result, config.get("journal"))
     return result
 
 
+def cycle_error_result(config: dict[str, Any], market_data_mode: str, exc: Exception) -> dict[str, Any]:
+    return {
+        "run_utc": utc_now_iso(),
+        "symbol": config.get("trading", {}).get("symbol"),
+        "dry_run": True,
+        "market_data_mode": market_data_mode,
+        "data_provider": config.get("trading", {}).get("api_provider", "mt5"),
+        "api_status": "error",
+        "bot_status": "running_with_errors",
+        "account": {"balance": None, "equity": None},
+        "signal": {},
+        "recommendation": {
+            "go_long": False,
+            "go_short": False,
+            "entry_price": None,
+            "sl_price": None,
+            "tp_price": None,
+            "lot_size": None,
+        },
+        "guardrail": {
+            "trading_allowed": False,
+            "hard_breach": False,
+            "soft_stop_hit": False,
+            "daily_loss_pct": 0.0,
+            "total_loss_pct": 0.0,
+            "notes": ["cycle_error"],
+        },
+        "open_positions": 0,
+        "actions": [],
+        "error": str(exc),
+    }
+
+
+def open_telegram_notifier(config: dict[str, Any], base_dir: Path) -> TelegramNotifier | None:
+    """Background sender for notify_result, or None to send inline (telegram.async_delivery: false)."""
+    tg_cfg = config.get("telegram", {})
+    if not bool(tg_cfg.get("async_delivery", True)) or telegram_unavailable_reason(config) is not None:
+        return None
+    return TelegramNotifier(
+        telegram_outbox_path(base_dir),
+        send=lambda text: maybe_send_telegram(config, text),
+        max_queue=int(tg_cfg.get("queue_max_messages", 100)),
+        coalesce_seconds=float(tg_cfg.get("coalesce_seconds", 2.0)),
+        max_attempts=int(tg_cfg.get("max_attempts", 5)),
+    ).start()
+
+
+def close_telegram_notifier(config: dict[str, Any], notifier: TelegramNotifier | None) -> None:
+    if notifier is None:
+        return
+    status = notifier.close(timeout=float(config.get("telegram", {}).get("flush_timeout_seconds", 10.0)))
+    if status["queue_depth"]:
+        print(f"[telegram] {status['queue_depth']} message(s) left in outbox: {status['last_error']}", flush=True)
+
+
+def notify_result(config: dict[str, Any], result: dict[str, Any], notifier: TelegramNotifier | None = None) -> None:
+    should_notify = bool(result.get("actions")) or bool(config.get("telegram", {}).get("notify_on_no_action", False))
+    if should_notify:
+        telegram_message = format_result_for_telegram(result)
+        tz_name = config.get("telegram", {}).get("timezone")
+        run_local = local_run_time(result.get("run_utc", ""), tz_name)
+        if run_local:
+            telegram_message += f"\nLocal time ({tz_name}): {run_local}"
+        if notifier is not None:
+            result["telegram"] = notifier.submit(telegram_message)
+        else:
+            result["telegram"] = maybe_send_telegram(config, telegram_message)
+
+
+class Mt5Account:
+    """Account adapter for the guardrail monitor, backed by the MT5 terminal."""
+
+    name = "mt5"
+
+    def account_info(self) -> Any:
+        info = mt5.account_info()
+        if info is None:
+            raise RuntimeError(f"mt5.account_info() failed: {mt5.last_error()}")
+        return info
+
+    def positions(self, symbol: str, magic_number: int) -> list[Any]:
+        return track_d_positions(symbol, magic_number)
+
+    def close(self, position: Any, config: dict[str, Any], dry_run: bool) -> dict[str, Any]:
+        return close_position(position, config, dry_run)
+
+
+class LocalAccountStandIn:
+    """
+    Account adapter for exercising the guardrail monitor without MT5.
+
+    Re-reads a JSON file such as {"balance": 10000, "equity": 9450,
+    "positions": [{"ticket": 1, "symbol": "XAUUSD", "volume": 0.1, "magic": 54054}]}
+    on every poll, so editing it simulates equity moves. A live close removes
+    the position from the file.
+    """
+
+    name = "stand-in"
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def account_info(self) -> Any:
+        payload = load_json(self.path)
+        return SimpleNamespace(balance=float(payload.get("balance", payload["equity"])), equity=float(payload["equity"]))
+
+    def positions(self, symbol: str, magic_number: int) -> list[Any]:
+        return [
+            SimpleNamespace(**position)
+            for position in load_json(self.path).get("positions", [])
+            if position.get("symbol") == symbol and int(position.get("magic", 0)) == int(magic_number)
+        ]
+
+    def close(self, position: Any, config: dict[str, Any], dry_run: bool) -> dict[str, Any]:
+        request = {"symbol": position.symbol, "volume": float(position.volume), "position": int(position.ticket)}
+        if dry_run:
+            return {"mode": "dry-run", "request": request}
+        payload = load_json(self.path)
+        payload["positions"] = [item for item in payload.get("positions", []) if int(item.get("ticket", 0)) != int(position.ticket)]
+        write_json_atomic(self.path, payload)
+        return {"mode": "stand-in", "request": request}
+
+
+def monitor_guardrails(
+    config: dict[str, Any],
+    base_dir: Path,
+    account: Mt5Account | LocalAccountStandIn,
+    execute: bool,
+    monitor_state: GuardrailMonitorState,
+) -> dict[str, Any] | None:
+    """
+    One intrabar guardrail poll: current equity against the persisted day/start references.
+
+    Costs one account_info call and a state read (no bars, no pandas);
+    positions are only listed on a hard breach. Returns a cycle-shaped result
+    when the breach is acted on, at most once per monitor.alert_cooldown_seconds.
+    """
+    monitor_state.polls += 1
+    info = account.account_info()
+    today = datetime.now(timezone.utc).date().isoformat()
+    state_store = open_state_store(config, base_dir)
+    try:
+        state = state_store.load()
+        if state.get("day_reference_date") != today or not state.get("starting_balance") or not state.get("day_start_equity"):
+            # Day rollover before the first cycle of the day: same reset the cycle would do.
+            state = load_state(state_store, float(config["ftmo"]["starting_balance"]), float(info.equity))
+            state_store.save(state)
+    finally:
+        state_store.close()
+
+    guard = evaluate_guardrails(info, config["ftmo"], state)
+    now = time.time()
+    cooldown = float(config.get("monitor", {}).get("alert_cooldown_seconds", 300))
+    if not guard.hard_breach or now - monitor_state.last_breach_at < cooldown:
+        return None
+    monitor_state.last_breach_at = now
+
+    dry_run = bool(config["trading"].get("dry_run", True)) if not execute else False
+    positions = account.positions(config["trading"]["symbol"], int(config["trading"]["magic_number"]))
+    actions: list[dict[str, Any]] = []
+    if bool(config["trading"].get("close_on_guardrail_breach", True)):
+        for position in positions:
+            actions.append(
+                {
+                    "type": "close_guardrail",
+                    "ticket": int(position.ticket),
+                    "reason": "guardrail_hard_breach_intrabar",
+                    "result": account.close(position, config, dry_run),
+                }
+            )
+    return {
+        "run_utc": utc_now_iso(),
+        "symbol": config["trading"]["symbol"],
+        "dry_run": dry_run,
+        "market_data_mode": "monitor",
+        "data_provider": account.name,
+        "api_status": "n/a",
+        "bot_status": "running",
+        "account": {"balance": float(info.balance), "equity": float(info.equity)},
+        "signal": {},
+        "recommendation": {
+            "go_long": False,
+            "go_short": False,
+            "entry_price": None,
+            "sl_price": None,
+            "tp_price": None,
+            "lot_size": None,
+        },
+        "guardrail": {
+            "trading_allowed": guard.trading_allowed,
+            "hard_breach": guard.hard_breach,
+            "soft_stop_hit": guard.soft_stop_hit,
+            "daily_loss_pct": guard.daily_loss_pct,
+            "total_loss_pct": guard.total_loss_pct,
+            "notes": guard.notes,
+        },
+        "open_positions": len(positions),
+        "actions": actions,
+        "monitor": {"polls": monitor_state.polls, "last_poll_seconds": monitor_state.last_poll_seconds},
+    }
+
+
+def guardrail_monitor_poll(
+    config: dict[str, Any],
+    base_dir: Path,
+    account: Mt5Account | LocalAccountStandIn,
+    execute: bool,
+    monitor_state: GuardrailMonitorState,
+    notifier: TelegramNotifier | None,
+) -> None:
+    """Run one monitor poll; a breach result is journaled, notified and printed like a cycle result."""
+    started = time.perf_counter()
+    result = monitor_guardrails(config, base_dir, account, execute, monitor_state)
+    monitor_state.last_poll_seconds = round(time.perf_counter() - started, 4)
+    if result is None:
+        return
+    append_journal(base_dir, result, config.get("journal"))
+    notify_result(config, result, notifier)
+    print(json.dumps(result, indent=2), flush=True)
+
+
+def load_runtime_config(config_path: Path, market_data_only: bool, execute: bool) -> dict[str, Any]:
+    if not config_path.exists():
+        raise FileNotFoundError(
+            f"Config not found: {config_path}. Copy config.example.json to config.json and edit it first."
+        )
+
+    config = load_json(config_path)
+
+    if market_data_only:
+        config.setdefault("trading", {})["market_data_mode"] = "api"
+
+    market_data_mode = str(config.get("trading", {}).get("market_data_mode", "mt5")).lower()
+    if execute and market_data_mode == "api":
+        raise ValueError("--execute cannot be used with API market-data-only mode.")
+    return config
+
+
+def next_bar_run_time(now: float, bar_seconds: int, close_delay_seconds: float) -> float:
+    """Epoch seconds of the next bar close (UTC-aligned) plus the provider settle delay."""
+    run_at = now - (now % bar_seconds) + close_delay_seconds
+    while run_at <= now:
+        run_at += bar_seconds
+    return run_at
+
+
+class DaemonSignals:
+    """
+    SIGTERM/SIGINT request shutdown, SIGHUP requests a config reload; both end the sleep.
+
+    The handlers only set plain flags. sleep() waits in short slices and
+    checks them, since taking a lock (threading.Event.set) inside a signal
+    handler can deadlock against the main thread holding the same lock.
+    """
+
+    SLEEP_SLICE_SECONDS = 0.5
+
+    def __init__(self) -> None:
+        self.stop_requested = False
+        self.reload_requested = False
+
+    def install(self) -> None:
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        # SIGHUP does not exist on Windows, where the MT5 terminal usually runs.
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, self._on_reload)
+
+    def _on_stop(self, signum: int, frame: Any) -> None:
+        self.stop_requested = True
+
+    def _on_reload(self, signum: int, frame: Any) -> None:
+        self.reload_requested = True
+
+    def sleep(self, seconds: float) -> None:
+        end = time.monotonic() + max(0.0, seconds)
+        while not (self.stop_requested or self.reload_requested):
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, self.SLEEP_SLICE_SECONDS))
+
+
+def log_daemon(message: str) -> None:
+    try:
+        print(f"{utc_now_iso()} [daemon] {message}", flush=True)
+    except OSError:
+        # A closed or full log must not stop the daemon.
+        pass
+
+
+def run_daemon(
+    config_path: Path,
+    base_dir: Path,
+    market_data_only: bool,
+    execute: bool,
+    close_delay_seconds: float,
+) -> None:
+    """
+    Run cycles in one long-lived process, each just after a bar close.
+
+    The first cycle runs immediately. The config and the MT5 connection stay
+    in memory between cycles; MT5 is re-initialized only after a failed cycle
+    or a config reload. With monitor.enabled in MT5 mode, the wait between
+    cycles is spent polling the guardrails every monitor.poll_seconds.
+    """
+    signals = DaemonSignals()
+    signals.install()
+    config = load_runtime_config(config_path, market_data_only, execute)
+    bar_store = open_bar_store(config, base_dir)
+    notifier = open_telegram_notifier(config, base_dir)
+    mt5_ready = False
+    monitor_state = GuardrailMonitorState()
+    next_run = time.time()
+    log_daemon(f"started pid={os.getpid()} config={config_path}")
+
+    try:
+        while not signals.stop_requested:
+            if signals.reload_requested:
+                signals.reload_requested = False
+                try:
+                    config = load_runtime_config(config_path, market_data_only, execute)
+                    log_daemon(f"reloaded config {config_path}")
+                except Exception as exc:
+                    log_daemon(f"config reload failed, keeping previous config: {exc}")
+                if mt5_ready:
+                    shutdown_mt5()
+                    mt5_ready = False
+                if bar_store is not None:
+                    bar_store.close()
+                bar_store = open_bar_store(config, base_dir)
+                close_telegram_notifier(config, notifier)
+                notifier = open_telegram_notifier(config, base_dir)
+
+            market_data_mode = str(config.get("trading", {}).get("market_data_mode", "mt5")).lower()
+            remaining = next_run - time.time()
+            if remaining > 0:
+                monitor_cfg = config.get("monitor", {})
+                if market_data_mode == "mt5" and bool(monitor_cfg.get("enabled", False)):
+                    try:
+                        if not mt5_ready:
+                            initialize_mt5(config)
+                            mt5_ready = True
+                        guardrail_monitor_poll(config, base_dir, Mt5Account(), execute, monitor_state, notifier)
+                    except Exception as exc:
+                        log_daemon(f"guardrail monitor poll failed: {exc}")
+                        if mt5_ready:
+                            shutdown_mt5()
+                            mt5_ready = False
+                    remaining = min(next_run - time.time(), float(monitor_cfg.get("poll_seconds", 5.0)))
+                signals.sleep(remaining)
+                continue
+
+            started = time.perf_counter()
+            try:
+                if market_data_mode == "mt5" and not mt5_ready:
+                    initialize_mt5(config)
+                    mt5_ready = True
+                result = run_cycle(
+                    config,
+                    base_dir=base_dir,
+                    execute=execute and market_data_mode == "mt5",
+                    bar_store=bar_store,
+                )
+            except Exception as exc:
+                result = cycle_error_result(config, market_data_mode, exc)
+                try:
+                    append_journal(base_dir, result, config.get("journal"))
+                except Exception as journal_exc:
+                    log_daemon(f"journal append failed: {journal_exc}")
+                if mt5_ready:
+                    shutdown_mt5()
+                    mt5_ready = False
+
+            # Reporting failures are logged; only a stop signal ends the daemon.
+            try:
+                notify_result(config, result, notifier)
+            except Exception as exc:
+                log_daemon(f"notify failed: {exc}")
+            result["cycle_seconds"] = round(time.perf_counter() - started, 3)
+            try:
+                print(json.dumps(result, indent=2), flush=True)
+            except Exception as exc:
+                log_daemon(f"printing cycle result failed: {exc}")
+
+            timeframe = str(config.get("trading", {}).get("timeframe", "H1")).upper()
+            bar_seconds = TIMEFRAME_SECONDS.get(timeframe, 60 * 60)
+            next_run = next_bar_run_time(time.time(), bar_seconds, close_delay_seconds)
+            log_daemon(f"next cycle at {datetime.fromtimestamp(next_run, tz=timezone.utc).isoformat()}")
+    finally:
+        if mt5_ready:
+            shutdown_mt5()
+        if bar_store is not None:
+            bar_store.close()
+        close_telegram_notifier(config, notifier)
+        HTTP_CLIENT.close()
+        log_daemon("stopped")
+
+
+def run_monitor(config_path: Path, base_dir: Path, execute: bool, stand_in_path: Path | None) -> None:
+    """
+    Poll the guardrails every monitor.poll_seconds until SIGTERM/SIGINT.
+
+    For running next to scheduled one-shot cycles; the state store must then
+    be shared between processes, which state.backend "sqlite" is built for.
+    """
+    signals = DaemonSignals()
+    signals.install()
+    config = load_runtime_config(config_path, False, execute)
+    account: Mt5Account | LocalAccountStandIn = LocalAccountStandIn(stand_in_path) if stand_in_path else Mt5Account()
+    notifier = open_telegram_notifier(config, base_dir)
+    mt5_ready = False
+    monitor_state = GuardrailMonitorState()
+    log_daemon(f"guardrail monitor started pid={os.getpid()} account={account.name}")
+
+    try:
+        while not signals.stop_requested:
+            if signals.reload_requested:
+                signals.reload_requested = False
+                try:
+                    config = load_runtime_config(config_path, False, execute)
+                    log_daemon(f"reloaded config {config_path}")
+                except Exception as exc:
+                    log_daemon(f"config reload failed, keeping previous config: {exc}")
+                close_telegram_notifier(config, notifier)
+                notifier = open_telegram_notifier(config, base_dir)
+
+            started = time.time()
+            try:
+                if isinstance(account, Mt5Account) and not mt5_ready:
+                    initialize_mt5(config)
+                    mt5_ready = True
+                guardrail_monitor_poll(config, base_dir, account, execute, monitor_state, notifier)
+            except Exception as exc:
+                log_daemon(f"guardrail monitor poll failed: {exc}")
+                if mt5_ready:
+                    shutdown_mt5()
+                    mt5_ready = False
+            signals.sleep(float(config.get("monitor", {}).get("poll_seconds", 5.0)) - (time.time() - started))
+    finally:
+        if mt5_ready:
+            shutdown_mt5()
+        close_telegram_notifier(config, notifier)
+        HTTP_CLIENT.close()
+        log_daemon(f"guardrail monitor stopped after {monitor_state.polls} polls")
+
+
 def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Run one MT5 automation cycle for Track D.")
+    parser = argparse.ArgumentParser(description="Run one MT5 automation cycle for Track D (or keep running with --daemon).")
     parser.add_argument(
         "--config",
         default="config.json",
@@ -1331,6 +2256,27 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Use Yahoo market data and skip all MT5 connectivity and order logic.",
     )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Stay running and run a cycle after every bar close (SIGHUP reloads config, SIGTERM stops).",
+    )
+    parser.add_argument(
+        "--close-delay-seconds",
+        type=float,
+        default=30.0,
+        help="Daemon mode: seconds after each bar close before the cycle runs, so providers publish the bar.",
+    )
+    parser.add_argument(
+        "--monitor",
+        action="store_true",
+        help="Only run the intrabar guardrail monitor: poll equity every monitor.poll_seconds and close on a hard breach.",
+    )
+    parser.add_argument(
+        "--monitor-stand-in",
+        default=None,
+        help="Monitor mode: read balance, equity and positions from this JSON file instead of MT5 (for testing).",
+    )
     return parser.parse_args()
 
 
@@ -1341,73 +2287,54 @@ def main() -> None:
     config_arg = Path(args.config)
     config_path = config_arg if config_arg.is_absolute() else (script_dir / config_arg)
 
-    if not config_path.exists():
-        raise FileNotFoundError(
-            f"Config not found: {config_path}. Copy config.example.json to config.json and edit it first."
+    if args.monitor:
+        stand_in_path = None
+        if args.monitor_stand_in:
+            stand_in_path = Path(args.monitor_stand_in)
+            if not stand_in_path.is_absolute():
+                stand_in_path = script_dir / stand_in_path
+        run_monitor(config_path, base_dir=base_dir, execute=args.execute, stand_in_path=stand_in_path)
+        return
+
+    if args.daemon:
+        run_daemon(
+            config_path,
+            base_dir=base_dir,
+            market_data_only=args.market_data_only,
+            execute=args.execute,
+            close_delay_seconds=args.close_delay_seconds,
         )
+        return
 
-    config = load_json(config_path)
-
-    if args.market_data_only:
-        config.setdefault("trading", {})["market_data_mode"] = "api"
-
+    config = load_runtime_config(config_path, args.market_data_only, args.execute)
     market_data_mode = str(config.get("trading", {}).get("market_data_mode", "mt5")).lower()
-    if args.execute and market_data_mode == "api":
-        raise ValueError("--execute cannot be used with API market-data-only mode.")
 
+    bar_store: BarStore | None = None
     try:
+        bar_store = open_bar_store(config, base_dir)
         if market_data_mode == "mt5":
             initialize_mt5(config)
             try:
-                result = run_cycle(config, base_dir=base_dir, execute=args.execute)
+                result = run_cycle(config, base_dir=base_dir, execute=args.execute, bar_store=bar_store)
             finally:
                 shutdown_mt5()
         else:
-            result = run_cycle(config, base_dir=base_dir, execute=False)
+            result = run_cycle(config, base_dir=base_dir, execute=False, bar_store=bar_store)
     except Exception as exc:
-        result = {
-            "run_utc": utc_now_iso(),
-            "symbol": config.get("trading", {}).get("symbol"),
-            "dry_run": True,
-            "market_data_mode": market_data_mode,
-            "data_provider": config.get("trading", {}).get("api_provider", "mt5"),
-            "api_status": "error",
-            "bot_status": "running_with_errors",
-            "account": {"balance": None, "equity": None},
-            "signal": {},
-            "recommendation": {
-                "go_long": False,
-                "go_short": False,
-                "entry_price": None,
-                "sl_price": None,
-                "tp_price": None,
-                "lot_size": None,
-            },
-            "guardrail": {
-                "trading_allowed": False,
-                "hard_breach": False,
-                "soft_stop_hit": False,
-                "daily_loss_pct": 0.0,
-                "total_loss_pct": 0.0,
-                "notes": ["cycle_error"],
-            },
-            "open_positions": 0,
-            "actions": [],
-            "error": str(exc),
-        }
-        append_journal(base_dir, result)
+        result = cycle_error_result(config, market_data_mode, exc)
+        append_journal(base_dir, result, config.get("journal"))
+    finally:
+        if bar_store is not None:
+            bar_store.close()
 
-    should_notify = bool(result.get("actions")) or bool(config.get("telegram", {}).get("notify_on_no_action", False))
-    if should_notify:
-        telegram_message = format_result_for_telegram(result)
-        tz_name = config.get("telegram", {}).get("timezone")
-        run_local = local_run_time(result.get("run_utc", ""), tz_name)
-        if run_local:
-            telegram_message += f"\nLocal time ({tz_name}): {run_local}"
-        result["telegram"] = maybe_send_telegram(config, telegram_message)
+    notifier = open_telegram_notifier(config, base_dir)
+    notify_result(config, result, notifier)
+    print(json.dumps(result, indent=2), flush=True)
 
-    print(json.dumps(result, indent=2))
+    # Delivery happens after the decision and its journal entry are out.
+    close_telegram_notifier(config, notifier)
+    HTTP_CLIENT.close()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,210 @@
+"""
+Bot state backends for the Track D runner.
+
+The runner keeps its guardrail state (starting_balance, peak_equity,
+day_start_equity, ...) and last-run context in one dict. It used to be
+rewritten in place to state/track_d_ftmo_state.json every cycle, so a crash
+mid-write could leave a truncated file and lose the guardrail references.
+
+Both backends expose load() -> dict and save(state, equity=None, signal=None):
+
+- JsonStateStore (state.backend "json", default): the same JSON file, now
+  written to a temp file and renamed over the old one, so it is either the
+  old or the new state
+- SqliteStateStore (state.backend "sqlite"): state/track_d_state.sqlite in
+  WAL mode. State keys live in a key/value table; each save is one
+  transaction that also appends an equity snapshot and a signal row to
+  history tables. Only keys changed since load() are written, so several
+  bot instances sharing the state folder do not overwrite each other's
+  keys. After each commit the JSON file is re-exported as a read-only
+  snapshot; on first use an existing JSON state is imported.
+
+Output:
+- state/track_d_ftmo_state.json (both backends; a snapshot with sqlite)
+- state/track_d_state.sqlite (sqlite backend, created at runtime)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+
+STATE_JSON_NAME = "track_d_ftmo_state.json"
+STATE_SQLITE_NAME = "track_d_state.sqlite"
+
+EQUITY_COLUMNS = ["balance", "equity", "day_start_equity", "peak_equity", "daily_loss_pct", "total_loss_pct"]
+SIGNAL_COLUMNS = ["source", "symbol", "bar_timestamp", "close", "fast_ema", "slow_ema", "buy_cross", "sell_cross", "signal", "actions"]
+
+
+def write_json_atomic(path: Path, payload: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Per-process temp name: several instances may export the snapshot at once.
+    tmp = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(payload, indent=2))
+    tmp.replace(path)
+
+
+class JsonStateStore:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def load(self) -> dict[str, Any]:
+        if not self.path.exists():
+            return {}
+        return json.loads(self.path.read_text())
+
+    def save(
+        self,
+        state: dict[str, Any],
+        equity: dict[str, Any] | None = None,
+        signal: dict[str, Any] | None = None,
+    ) -> None:
+        # The JSON backend keeps no history; equity and signal rows are dropped.
+        write_json_atomic(self.path, state)
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteStateStore:
+    def __init__(self, path: Path, snapshot_path: Path | None = None) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.snapshot_path = snapshot_path
+        # isolation_level=None: transactions are explicit (BEGIN IMMEDIATE in save).
+        self.conn = sqlite3.connect(str(path), timeout=10.0, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # Guardrail references must survive power loss, not just process crashes.
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS kv (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                updated_utc TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS equity_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_utc TEXT NOT NULL,
+                balance REAL,
+                equity REAL,
+                day_start_equity REAL,
+                peak_equity REAL,
+                daily_loss_pct REAL,
+                total_loss_pct REAL
+            );
+            CREATE INDEX IF NOT EXISTS equity_history_run_utc ON equity_history (run_utc);
+            CREATE TABLE IF NOT EXISTS signal_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_utc TEXT NOT NULL,
+                source TEXT,
+                symbol TEXT,
+                bar_timestamp TEXT,
+                close REAL,
+                fast_ema REAL,
+                slow_ema REAL,
+                buy_cross INTEGER,
+                sell_cross INTEGER,
+                signal INTEGER,
+                actions TEXT
+            );
+            CREATE INDEX IF NOT EXISTS signal_history_run_utc ON signal_history (run_utc);
+            """
+        )
+        self._loaded: dict[str, str] = {}
+        if snapshot_path is not None and snapshot_path.exists() and self._is_empty():
+            self._import_json(snapshot_path)
+
+    def _is_empty(self) -> bool:
+        return self.conn.execute("SELECT COUNT(*) FROM kv").fetchone()[0] == 0
+
+    def _import_json(self, path: Path) -> None:
+        try:
+            state = json.loads(path.read_text())
+        except json.JSONDecodeError:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO kv (key, value, updated_utc) VALUES (?, ?, ?)",
+                [(key, json.dumps(value), now) for key, value in state.items()],
+            )
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def load(self) -> dict[str, Any]:
+        rows = self.conn.execute("SELECT key, value FROM kv").fetchall()
+        self._loaded = {key: value for key, value in rows}
+        return {key: json.loads(value) for key, value in rows}
+
+    def save(
+        self,
+        state: dict[str, Any],
+        equity: dict[str, Any] | None = None,
+        signal: dict[str, Any] | None = None,
+    ) -> None:
+        """Write changed keys plus the optional history rows in one transaction, then export the snapshot."""
+        now = datetime.now(timezone.utc).isoformat()
+        encoded = {key: json.dumps(value) for key, value in state.items()}
+        changed = [(key, value, now) for key, value in encoded.items() if self._loaded.get(key) != value]
+        removed = [(key,) for key in self._loaded if key not in encoded]
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.executemany(
+                "INSERT INTO kv (key, value, updated_utc) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_utc = excluded.updated_utc",
+                changed,
+            )
+            self.conn.executemany("DELETE FROM kv WHERE key = ?", removed)
+            if equity is not None:
+                self.conn.execute(
+                    f"INSERT INTO equity_history (run_utc, {', '.join(EQUITY_COLUMNS)}) VALUES (?, {', '.join('?' * len(EQUITY_COLUMNS))})",
+                    [equity.get("run_utc", now)] + [equity.get(column) for column in EQUITY_COLUMNS],
+                )
+            if signal is not None:
+                self.conn.execute(
+                    f"INSERT INTO signal_history (run_utc, {', '.join(SIGNAL_COLUMNS)}) VALUES (?, {', '.join('?' * len(SIGNAL_COLUMNS))})",
+                    [signal.get("run_utc", now)]
+                    + [json.dumps(signal.get(column)) if column == "actions" else signal.get(column) for column in SIGNAL_COLUMNS],
+                )
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self._loaded.update({key: value for key, value, _ in changed})
+        for (key,) in removed:
+            self._loaded.pop(key, None)
+
+        if self.snapshot_path is not None:
+            # Export what is committed, including keys written by other instances.
+            write_json_atomic(self.snapshot_path, self.load())
+
+    def history(self, table: str, limit: int = 100) -> list[dict[str, Any]]:
+        """Newest rows first from equity_history or signal_history."""
+        if table not in {"equity_history", "signal_history"}:
+            raise ValueError(f"Unknown history table: {table}")
+        cursor = self.conn.execute(f"SELECT * FROM {table} ORDER BY id DESC LIMIT ?", (int(limit),))
+        columns = [item[0] for item in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def open_state_store(config: dict[str, Any], base_dir: Path) -> JsonStateStore | SqliteStateStore:
+    state_dir = base_dir / "state"
+    backend = str(config.get("state", {}).get("backend", "json")).lower()
+    if backend == "sqlite":
+        return SqliteStateStore(state_dir / STATE_SQLITE_NAME, snapshot_path=state_dir / STATE_JSON_NAME)
+    if backend != "json":
+        raise ValueError("state.backend must be one of: json, sqlite")
+    return JsonStateStore(state_dir / STATE_JSON_NAME)
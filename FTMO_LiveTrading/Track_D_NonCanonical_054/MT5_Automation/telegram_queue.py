@@ -0,0 +1,315 @@
+"""
+Background Telegram delivery for the Track D runner.
+
+maybe_send_telegram used to run inline at the end of every cycle, so a slow
+or unreachable Telegram API (10s timeout) delayed the cycle and, in --daemon
+mode, the next one. TelegramNotifier hands messages to a worker thread:
+
+- submit() only appends to a bounded in-memory queue and returns
+- messages arriving within coalesce_seconds of each other are joined into
+  one sendMessage (kept under Telegram's 4096-character limit); a single
+  message over the limit is split into 4096-character chunks
+- a failed send is retried with exponential backoff, up to max_attempts
+- a send rejected with HTTP 4xx other than 429 (bad chat_id, malformed
+  text) cannot succeed later, so the batch is moved to a dead-letter file
+  instead of being retried
+- every accepted message is written to this process's outbox file until
+  delivered, so messages still pending at a crash, or after the final
+  flush, are resent by the next process
+- close() flushes what is queued within a deadline and stops the worker
+
+Delivery is at-least-once: a send that timed out after Telegram accepted it
+is sent again.
+
+Each process owns one outbox, named after its pid, because a --monitor
+process and one-shot cycles can run side by side and a shared file would be
+rewritten by both. On start a notifier adopts the outboxes of processes that
+are no longer running (and the old shared outbox file): each is renamed to
+a claim file first, so only one process can take it.
+
+Output:
+- state/track_d_telegram_outbox.<pid>.json (created at runtime, removed when empty)
+- state/track_d_telegram_dead_letter.jsonl (created at runtime, one rejected batch per line)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable
+
+
+TELEGRAM_MAX_CHARS = 4096
+BATCH_SEPARATOR = "\n\n"
+OUTBOX_PREFIX = "track_d_telegram_outbox"
+DEAD_LETTER_NAME = "track_d_telegram_dead_letter.jsonl"
+
+
+def telegram_outbox_path(base_dir: Path, pid: int | None = None) -> Path:
+    return base_dir / "state" / f"{OUTBOX_PREFIX}.{os.getpid() if pid is None else pid}.json"
+
+
+def outbox_owner_pid(path: Path) -> int | None:
+    """Pid in an outbox or claim file name; None for the old shared outbox."""
+    parts = path.name.split(".")
+    return int(parts[1]) if len(parts) > 2 and parts[1].isdigit() else None
+
+
+def pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    if sys.platform == "win32":
+        # os.kill(pid, 0) would terminate the process on Windows.
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        try:
+            code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+            return code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def split_message(message: str, limit: int = TELEGRAM_MAX_CHARS) -> list[str]:
+    """Chunks of at most limit characters, cut at the last line break where there is one."""
+    chunks: list[str] = []
+    while len(message) > limit:
+        cut = message.rfind("\n", 0, limit)
+        if cut <= 0:
+            cut = limit
+        chunks.append(message[:cut])
+        message = message[cut:].lstrip("\n")
+    chunks.append(message)
+    return chunks
+
+
+def is_permanent_failure(outcome: dict[str, Any]) -> bool:
+    """HTTP 4xx other than 429: resending the same request cannot succeed."""
+    status = outcome.get("status")
+    return isinstance(status, int) and 400 <= status < 500 and status != 429
+
+
+def read_outbox(path: Path) -> list[str]:
+    if not path.exists():
+        return []
+    try:
+        messages = [str(message) for message in json.loads(path.read_text())]
+    except (json.JSONDecodeError, TypeError, OSError):
+        return []
+    # Outboxes written before messages were split can hold oversized ones.
+    return [chunk for message in messages for chunk in split_message(message)]
+
+
+class TelegramNotifier:
+    def __init__(
+        self,
+        outbox_path: Path,
+        send: Callable[[str], dict[str, Any]],
+        max_queue: int = 100,
+        coalesce_seconds: float = 2.0,
+        max_attempts: int = 5,
+        backoff_seconds: float = 2.0,
+        max_backoff_seconds: float = 60.0,
+    ) -> None:
+        self.outbox_path = outbox_path
+        self.send = send
+        self.max_queue = max(1, int(max_queue))
+        self.coalesce_seconds = float(coalesce_seconds)
+        self.max_attempts = max(1, int(max_attempts))
+        self.backoff_seconds = float(backoff_seconds)
+        self.max_backoff_seconds = float(max_backoff_seconds)
+
+        self._pending: deque[str] = deque()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._deadline = float("inf")
+        self._thread: threading.Thread | None = None
+        self.delivered = 0
+        self.failed_batches = 0
+        self.dead_lettered = 0
+        self.last_error: str | None = None
+
+        self.adopted = 0
+
+        # Left behind by an earlier process with the same pid.
+        self._pending.extend(read_outbox(self.outbox_path))
+        self._adopt_orphaned_outboxes()
+
+    def _adopt_orphaned_outboxes(self) -> None:
+        """Take over undelivered messages from outboxes whose process has exited."""
+        directory = self.outbox_path.parent
+        if not directory.exists():
+            return
+        orphans = []
+        for path in directory.glob(f"{OUTBOX_PREFIX}*.json"):
+            pid = outbox_owner_pid(path)
+            if path != self.outbox_path and (pid is None or not pid_alive(pid)):
+                orphans.append(path)
+
+        for index, path in enumerate(sorted(orphans, key=lambda p: p.stat().st_mtime if p.exists() else 0.0)):
+            # Rename first: if another process starting now got there first, this one skips the file.
+            claim = self.outbox_path.with_name(f"{OUTBOX_PREFIX}.{os.getpid()}.claim{index}.json")
+            try:
+                os.replace(path, claim)
+            except OSError:
+                continue
+            messages = read_outbox(claim)
+            self._pending.extend(messages)
+            self.adopted += len(messages)
+            # Persist into our own outbox before dropping the claim, so a crash here loses nothing.
+            self._write_outbox()
+            claim.unlink(missing_ok=True)
+
+    def _write_outbox(self) -> None:
+        # Caller holds the lock. Rewritten whole: the outbox only holds this process's undelivered messages.
+        if not self._pending:
+            self.outbox_path.unlink(missing_ok=True)
+            return
+        self.outbox_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.outbox_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(list(self._pending), indent=2))
+        tmp.replace(self.outbox_path)
+
+    def _write_dead_letter(self, batch: list[str], outcome: dict[str, Any]) -> None:
+        # Caller holds the lock. Appended before the batch leaves the outbox, so nothing is dropped silently.
+        record = {
+            "failed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "status": outcome.get("status"),
+            "reason": str(outcome.get("reason")),
+            "messages": batch,
+        }
+        path = self.outbox_path.with_name(DEAD_LETTER_NAME)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(record) + "\n")
+
+    def start(self) -> "TelegramNotifier":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="track-d-telegram", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, message: str) -> dict[str, Any]:
+        """Queue a message without waiting on Telegram."""
+        with self._cond:
+            if self._stopping:
+                return {"queued": False, "reason": "notifier stopped"}
+            chunks = split_message(message)
+            if len(self._pending) + len(chunks) > self.max_queue:
+                return {"queued": False, "reason": f"queue full ({self.max_queue} messages)"}
+            self._pending.extend(chunks)
+            self._write_outbox()
+            self._cond.notify()
+            return {"queued": True, "queue_depth": len(self._pending)}
+
+    def status(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "queue_depth": len(self._pending),
+                "delivered": self.delivered,
+                "failed_batches": self.failed_batches,
+                "dead_lettered": self.dead_lettered,
+                "last_error": self.last_error,
+            }
+
+    def _next_batch(self) -> list[str]:
+        # Caller holds the lock and _pending is not empty.
+        batch: list[str] = []
+        length = 0
+        for message in self._pending:
+            added = len(message) + (len(BATCH_SEPARATOR) if batch else 0)
+            if batch and length + added > TELEGRAM_MAX_CHARS:
+                break
+            batch.append(message)
+            length += added
+        return batch
+
+    def _wait(self, seconds: float, wake_on_stop: bool = True) -> None:
+        # Caller holds the lock. Never sleeps past the flush deadline; the
+        # coalescing wait also ends as soon as close() starts the flush.
+        end = time.monotonic() + seconds
+        while not (wake_on_stop and self._stopping):
+            remaining = min(end, self._deadline) - time.monotonic()
+            if remaining <= 0:
+                return
+            self._cond.wait(remaining)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                if self.coalesce_seconds > 0 and not self._stopping:
+                    self._wait(self.coalesce_seconds)
+                batch = self._next_batch()
+
+            delivered = False
+            permanent = False
+            for attempt in range(1, self.max_attempts + 1):
+                try:
+                    outcome = self.send(BATCH_SEPARATOR.join(batch))
+                except Exception as exc:
+                    outcome = {"sent": False, "reason": str(exc)}
+                if outcome.get("sent"):
+                    delivered = True
+                    break
+                permanent = is_permanent_failure(outcome)
+                with self._cond:
+                    self.last_error = str(outcome.get("reason"))
+                    if permanent or attempt == self.max_attempts or time.monotonic() >= self._deadline:
+                        break
+                    self._wait(min(self.max_backoff_seconds, self.backoff_seconds * 2 ** (attempt - 1)), wake_on_stop=False)
+                    if time.monotonic() >= self._deadline:
+                        break
+
+            with self._cond:
+                if delivered:
+                    for _ in batch:
+                        self._pending.popleft()
+                    self.delivered += len(batch)
+                    self._write_outbox()
+                    continue
+                if permanent:
+                    for _ in batch:
+                        self._pending.popleft()
+                    self.dead_lettered += len(batch)
+                    self._write_dead_letter(batch, outcome)
+                    self._write_outbox()
+                    continue
+                self.failed_batches += 1
+                if self._stopping:
+                    # Leave the rest in the outbox for the next process.
+                    return
+                # Move the batch behind newer messages so one bad batch cannot block the queue forever.
+                for _ in batch:
+                    self._pending.rotate(-1)
+                self._write_outbox()
+                self._wait(self.max_backoff_seconds)
+
+    def close(self, timeout: float = 10.0) -> dict[str, Any]:
+        """Flush queued messages for up to timeout seconds, then stop; undelivered ones stay in the outbox."""
+        with self._cond:
+            self._stopping = True
+            self._deadline = time.monotonic() + timeout
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout + 1.0)
+        return self.status()
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import bar_store  # noqa: E402
+import run_track_d_mt5 as runner  # noqa: E402
+from bar_store import BarStore  # noqa: E402
+
+
+BAR_SECONDS = 3600
+SERVER_OFFSET = 2 * 3600  # FTMO servers run at UTC+2/+3
+
+
+class FakeTerminal:
+    """MT5 stand-in whose bar times and ticks are broker server time (UTC + SERVER_OFFSET)."""
+
+    TIMEFRAME_H1 = 16385
+
+    def __init__(self, first_bar: int, utc_now: float) -> None:
+        self.first_bar = first_bar
+        self.utc_now = utc_now
+
+    @property
+    def server_now(self) -> float:
+        return self.utc_now + SERVER_OFFSET
+
+    def close_of(self, bar_time: int) -> float:
+        # Rises through the bar and ends 1.0 above its open, so a close stored
+        # while the bar was still forming is visibly wrong.
+        progress = min(1.0, (self.server_now - bar_time) / BAR_SECONDS)
+        return 100.0 + (bar_time - self.first_bar) / BAR_SECONDS + progress
+
+    def copy_rates_from_pos(self, symbol: str, timeframe: int, start: int, count: int) -> np.ndarray:
+        last_bar = self.first_bar + int((self.server_now - self.first_bar) // BAR_SECONDS) * BAR_SECONDS
+        times = [last_bar - i * BAR_SECONDS for i in range(start, start + count) if last_bar - i * BAR_SECONDS >= self.first_bar]
+        dtype = [("time", "i8"), ("open", "f8"), ("high", "f8"), ("low", "f8"), ("close", "f8"), ("tick_volume", "i8")]
+        rows = [(t, self.close_of(t), self.close_of(t), self.close_of(t), self.close_of(t), 1) for t in reversed(times)]
+        return np.array(rows, dtype=dtype)
+
+    def symbol_info_tick(self, symbol: str) -> SimpleNamespace:
+        return SimpleNamespace(time=int(self.server_now), bid=0.0, ask=0.0)
+
+    def last_error(self) -> tuple[int, str]:
+        return (0, "")
+
+
+def test_incremental_mt5_fetch_finalizes_bars_with_server_time_offset(tmp_path, monkeypatch):
+    bars_count = 50
+    start_utc = 1_767_225_600  # 2026-01-01 00:00 UTC
+    terminal = FakeTerminal(first_bar=start_utc + SERVER_OFFSET - 80 * BAR_SECONDS, utc_now=start_utc + 30)
+
+    class FakeDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.fromtimestamp(terminal.utc_now, tz=tz or timezone.utc)
+
+    monkeypatch.setattr(runner, "mt5", terminal)
+    monkeypatch.setattr(runner, "datetime", FakeDatetime)
+    monkeypatch.setattr(bar_store, "time", SimpleNamespace(time=lambda: terminal.utc_now))
+    store = BarStore(tmp_path / "bars.sqlite")
+
+    received = []
+    for cycle in range(7):
+        terminal.utc_now = start_utc + cycle * BAR_SECONDS + 30
+        frame = runner.fetch_with_store(
+            lambda since_ts: runner.fetch_rates("XAUUSD", "H1", bars_count, since_ts=since_ts),
+            "mt5",
+            "XAUUSD",
+            "H1",
+            bars_count,
+            store,
+        )
+        received.append(frame.attrs["bars_received"])
+
+    assert all(count >= 2 for count in received[1:])
+    frame = store.window("mt5", "XAUUSD", "H1", bars_count)
+    bar_times = runner.epoch_seconds(frame["timestamp"])
+    closed = list(zip(bar_times, frame["Close"]))[:-1]
+    assert closed
+    for bar_time, close in closed:
+        assert abs(close - terminal.close_of(bar_time)) < 1e-9
+    store.close()
+
+
+def test_merge_snaps_off_grid_live_row_onto_its_bar(tmp_path):
+    import pandas as pd
+
+    store = BarStore(tmp_path / "bars.sqlite")
+
+    def yahoo_rows(*rows):
+        return pd.DataFrame(
+            [{"timestamp": pd.Timestamp(ts, tz="UTC"), "Open": close, "High": close, "Low": close, "Close": close, "Volume": 1.0} for ts, close in rows]
+        )
+
+    # Live row stamped at the last trade time inside the forming 09:00 bar.
+    store.merge("yahoo", "GC=F", "H1", yahoo_rows(("2026-01-02 08:00", 1.0), ("2026-01-02 09:37", 2.0)), bar_seconds=BAR_SECONDS)
+    store.merge("yahoo", "GC=F", "H1", yahoo_rows(("2026-01-02 09:00", 3.0), ("2026-01-02 10:00", 4.0)), bar_seconds=BAR_SECONDS)
+
+    frame = store.window("yahoo", "GC=F", "H1", 10)
+    assert frame["timestamp"].dt.strftime("%H:%M").tolist() == ["08:00", "09:00", "10:00"]
+    assert frame["Close"].tolist() == [1.0, 3.0, 4.0]
+    store.close()